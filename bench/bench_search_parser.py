@@ -0,0 +1,162 @@
+"""
+欢乐汇聚 Hanime 搜索卡片解析基准
+
+对比 search_parser 的单次扫描与原逐字段多次搜索实现的结果与耗时：
+    python bench/bench_search_parser.py page1.html page2.html ...
+未指定文件时使用生成的示例页面。tests/test_search_parser.py 复用本文件的原实现做一致性校验。
+"""
+import importlib.util
+import re
+import sys
+import time
+import types
+from html import unescape
+from pathlib import Path
+from typing import Any, Dict, List
+
+PLUGIN_DIR = Path(__file__).resolve().parents[1] / "plugins.v2" / "huanlehuiju"
+
+CARD_PATTERN = re.compile(
+    r'<a[^>]*href="\s*`?(?P<href>https?://[^"`\s]*/watch\?v=(?P<id>\d+)[^"`\s]*|/watch\?v=(?P<id2>\d+)[^"`\s]*)`?\s*"'
+    r'[^>]*class="[^"]*\bvideo-link\b[^"]*"[^>]*>(?P<body>.*?)</a>',
+    re.IGNORECASE | re.DOTALL,
+)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+THUMB_PATTERN = (
+    r'<img[^>]*class="[^"]*\bmain-thumb\b[^"]*"[^>]*src="\s*`?(?P<poster>[^"`\s]+)`?\s*"[^>]*>'
+)
+TITLE_PATTERN = r'<div[^>]*class="[^"]*\btitle\b[^"]*"[^>]*>(?P<title>.*?)</div>'
+DURATION_PATTERN = r'<div[^>]*class="[^"]*\bduration\b[^"]*"[^>]*>(?P<duration>.*?)</div>'
+LIKE_PATTERN = r"<i[^>]*>\s*thumb_up\s*</i>\s*(?P<like>\d+%)"
+VIEWS_PATTERN = (
+    r'<div[^>]*class="[^"]*\bstat-item\b[^"]*"[^>]*>\s*(?P<views>\d+(?:\.\d+)?万?次)\s*</div>'
+)
+
+
+def load_search_parser() -> types.ModuleType:
+    """
+    不执行插件 __init__（依赖 MoviePilot 运行环境），单独加载 search_parser 及其依赖的 html_utils
+
+    :return ModuleType: search_parser 模块
+    """
+    package_name = "_huanlehuiju_bench"
+    if package_name not in sys.modules:
+        package = types.ModuleType(package_name)
+        package.__path__ = [str(PLUGIN_DIR)]
+        sys.modules[package_name] = package
+    name = f"{package_name}.search_parser"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, PLUGIN_DIR / "search_parser.py")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+def parse_search_cards_multipass(html: str, query: str, base_url: str) -> List[Dict[str, Any]]:
+    """
+    逐字段多次搜索的原实现
+
+    :param html (str): HTML
+    :param query (str): 搜索关键词
+    :param base_url (str): Hanime 站点地址
+
+    :return List: 条目列表
+    """
+    flags = re.IGNORECASE | re.DOTALL
+
+    def _strip(text: str) -> str:
+        return re.sub(r"\s+", " ", unescape(TAG_PATTERN.sub("", text))).strip()
+
+    title_pattern = re.compile(TITLE_PATTERN, flags)
+    thumb_pattern = re.compile(THUMB_PATTERN, flags)
+    duration_pattern = re.compile(DURATION_PATTERN, flags)
+    like_pattern = re.compile(LIKE_PATTERN, flags)
+    views_pattern = re.compile(VIEWS_PATTERN, flags)
+    items: List[Dict[str, Any]] = []
+    for match in CARD_PATTERN.finditer(html or ""):
+        body = match.group("body") or ""
+        watch_id = str(match.group("id") or match.group("id2") or "").strip()
+        if not watch_id:
+            continue
+        title_match = title_pattern.search(body)
+        thumb_match = thumb_pattern.search(body)
+        duration_match = duration_pattern.search(body)
+        like_match = like_pattern.search(body)
+        view_matches = list(views_pattern.finditer(body))
+        items.append(
+            {
+                "id": watch_id,
+                "url": f"{base_url}/watch?v={watch_id}",
+                "title": _strip(title_match.group("title")) if title_match else "",
+                "poster": thumb_match.group("poster") if thumb_match else "",
+                "duration": _strip(duration_match.group("duration")) if duration_match else "",
+                "like": like_match.group("like") if like_match else "",
+                "views": view_matches[-1].group("views") if view_matches else "",
+                "query": query,
+            }
+        )
+    return items
+
+
+def sample_page(cards: int = 60) -> str:
+    """
+    生成示例搜索页
+
+    :param cards (int): 卡片数量
+
+    :return str: HTML
+    """
+    card = (
+        '<div class="col-xs-6 search-doujin-videos">'
+        '<a style="text-decoration: none;" href="https://hanime1.me/watch?v={id}" class="video-link">'
+        '<div class="card-mobile-panel inner"><div style="position: relative;">'
+        '<img style="width: 100%" class="main-thumb" '
+        'src="https://vdownload.hembed.com/image/thumbnail/{id}l.jpg?secure=abc" alt="thumb">'
+        '<div class="card-mobile-duration">{minutes}:05</div></div>'
+        '<div class="card-mobile-title">示例标题 &amp; Episode {id}</div>'
+        '<div class="card-mobile-user">uploader</div>'
+        '<div class="stat-item"><i class="material-icons">thumb_up</i> 9{minutes}%</div>'
+        '<div class="stat-item">{views}万次</div>'
+        '<div class="stat-item">{id}次</div>'
+        "</div></a></div>\n"
+    )
+    body = "".join(
+        card.format(id=100000 + index, minutes=index % 10, views=index / 10) for index in range(cards)
+    )
+    return f"<html><head><title>search</title></head><body>{'<p>filler</p>' * 200}{body}</body></html>"
+
+
+def benchmark(pages: List[str], rounds: int = 50) -> None:
+    """
+    对比单次扫描与逐字段搜索的结果与耗时
+
+    :param pages (List): 搜索页 HTML 列表
+    :param rounds (int): 每页重复次数
+    """
+    parse_search_cards = load_search_parser().parse_search_cards
+    base_url = "https://hanime1.me"
+    for index, page in enumerate(pages):
+        expected = parse_search_cards_multipass(page, "q", base_url)
+        actual = parse_search_cards(page, "q", base_url)
+        if actual != expected:
+            raise SystemExit(f"page {index}: 解析结果不一致")
+        timings = {}
+        for name, func in (("multipass", parse_search_cards_multipass), ("single-scan", parse_search_cards)):
+            started = time.perf_counter()
+            for _ in range(rounds):
+                func(page, "q", base_url)
+            timings[name] = (time.perf_counter() - started) / rounds * 1000
+        print(
+            f"page {index}: cards={len(actual)} multipass={timings['multipass']:.3f}ms "
+            f"single-scan={timings['single-scan']:.3f}ms "
+            f"speedup={timings['multipass'] / timings['single-scan']:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    recorded = []
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as stream:
+            recorded.append(stream.read())
+    benchmark(recorded or [sample_page()])
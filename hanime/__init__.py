@@ -1,7 +1,7 @@
 import re
 from html import unescape
-from typing import Any, Dict, List, Optional, Set, Tuple
-from urllib.parse import parse_qs, urlencode, urljoin, urlparse
+from typing import Any, Dict, List, Set, Tuple
+from urllib.parse import urlencode, urljoin
 
 from app import schemas
 from app.core.cache import cached
@@ -13,6 +13,7 @@ from app.schemas import DiscoverSourceEventData
 from app.schemas.types import ChainEventType
 from app.utils.http import RequestUtils
 
+from .html_utils import extract_query_id, extract_year, strip_html
 from .ui_generator import hanime_filter_ui
 
 
@@ -39,8 +40,6 @@ IMAGE_PATTERN = re.compile(
     r'<img[^>]*class="[^"]*\bmain-thumb\b[^"]*"[^>]*src="(?P<src>[^"]+)"',
     re.IGNORECASE | re.DOTALL,
 )
-TAG_PATTERN = re.compile(r"<[^>]+>")
-YEAR_PATTERN = re.compile(r"(?P<year>(19|20)\d{2})")
 
 
 class HanimeDiscover(_PluginBase):
@@ -51,7 +50,7 @@ class HanimeDiscover(_PluginBase):
     plugin_name = "Hanime探索"
     plugin_desc = "让探索支持 Hanime 的数据浏览"
     plugin_icon = "https://hanime1.me/favicon.ico"
-    plugin_version = "1.0.0"
+    plugin_version = "1.0.2"
     plugin_author = "TRAE"
     author_url = "https://trae.ai"
     plugin_config_prefix = "hanimediscover_"
@@ -145,45 +144,9 @@ class HanimeDiscover(_PluginBase):
         """
         pass
 
-    @staticmethod
-    def _strip_html(text: str) -> str:
-        """
-        清理 HTML 文本
-
-        :param text (str): 原始 HTML 文本
-
-        :return str: 清理后的纯文本
-        """
-        return re.sub(r"\s+", " ", unescape(TAG_PATTERN.sub("", text))).strip()
-
-    @staticmethod
-    def _extract_media_id(detail_url: str) -> str:
-        """
-        从详情链接提取媒体 ID
-
-        :param detail_url (str): 详情页链接
-
-        :return str: 媒体 ID
-        """
-        media_ids = parse_qs(urlparse(detail_url).query).get("v", [])
-        return media_ids[0] if media_ids else detail_url
-
-    @staticmethod
-    def _extract_year(date_text: Optional[str]) -> Optional[str]:
-        """
-        从年份筛选值提取年份
-
-        :param date_text (str): 年份筛选值
-
-        :return str: 提取到的年份
-        """
-        if not date_text:
-            return None
-
-        match = YEAR_PATTERN.search(date_text)
-        if not match:
-            return None
-        return match.group("year")
+    _strip_html = staticmethod(strip_html)
+    _extract_media_id = staticmethod(extract_query_id)
+    _extract_year = staticmethod(extract_year)
 
     @cached(region="hanime_discover", ttl=1800, skip_none=True)
     def __request(self, genre: str = None, sort: str = None, date: str = None, page: int = 1) -> str:
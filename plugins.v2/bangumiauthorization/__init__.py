@@ -1,11 +1,11 @@
 from typing import Any, Dict, List, Tuple, Optional
  
 
-from app.core.config import settings
 from app.plugins import _PluginBase
-from app.utils.http import RequestUtils, AsyncRequestUtils
 from app.core.meta import MetaBase
 from app.core.context import MediaInfo
+
+from .bangumi_client import BangumiClient, apply_season, build_headers, get_client
  
 
 
@@ -21,13 +21,17 @@ class BangumiAuthorization(_PluginBase):
     plugin_name = "BangumiAuthorization"          # 插件名称
     plugin_desc = "为 Bangumi 搜索附加 Authorization"  # 插件描述
     plugin_order = 99                           # 插件加载顺序
-    plugin_version = "1.1.0"                    # 插件版本
+    plugin_version = "1.7.6"                    # 插件版本
     plugin_author = "踏马奔腾"                     # 插件作者
     plugin_icon = "https://raw.githubusercontent.com/jxxghp/MoviePilot-Plugins/main/icons/bangumi.png"  # 插件图标
 
     # 插件配置参数
     _enabled: bool = False        # 插件是否启用
     _authorization: str = ""     # Bangumi Authorization 令牌
+    _scrape_top_k: int = 0       # 抓取元数据时最多获取详情的搜索结果数，0 为不限制
+
+    _search_cache_ttl: int = 1800  # 搜索结果缓存时间（秒），0 为不缓存
+    _subject_cache_ttl: int = 3600  # 条目详情缓存时间（秒），0 为不缓存
 
     def _headers(self) -> Dict[str, str]:
         """
@@ -39,11 +43,7 @@ class BangumiAuthorization(_PluginBase):
         Returns:
             Dict[str, str]: 包含 Authorization 的请求头字典
         """
-        headers: Dict[str, str] = {"Accept": "application/json"}
-        if self._authorization:
-            auth = self._authorization.strip()
-            headers["Authorization"] = auth if auth.lower().startswith("bearer ") else f"Bearer {auth}"
-        return headers
+        return build_headers(self._authorization)
 
     def init_plugin(self, config: dict = None):
         """
@@ -61,25 +61,41 @@ class BangumiAuthorization(_PluginBase):
                 self._authorization = auth if auth.lower().startswith("bearer ") else f"Bearer {auth}"
             else:
                 self._authorization = ""
+            self._scrape_top_k = self._to_int(config.get("scrape_top_k"), 0)
+            self._search_cache_ttl = self._to_int(config.get("search_cache_ttl"), 1800)
+            self._subject_cache_ttl = self._to_int(config.get("subject_cache_ttl"), 3600)
+        get_client().acquire(self.__class__.__name__)
 
-    def _season_text(self, season: Optional[int]) -> Optional[str]:
-        if not season:
-            return None
-        try:
-            import cn2an
-            return cn2an.an2cn(season, "low")
-        except Exception:
-            return None
+    @staticmethod
+    def _client() -> BangumiClient:
+        """
+        获取 Bangumi 客户端
+        
+        客户端代码随本插件加载，连接池、缓存、请求去重与并发限制按主机登记在进程内，与欢乐汇聚插件共用。
+        
+        Returns:
+            BangumiClient: 客户端
+        """
+        return get_client()
 
-    def _apply_season(self, medias: List[MediaInfo], begin_season: Optional[int]):
-        if not begin_season or not medias:
-            return
-        season_str = self._season_text(begin_season)
-        for m in medias:
-            if m.type and m.type.value == "电视剧":
-                if season_str:
-                    m.title = f"{m.title} 第{season_str}季"
-                m.season = begin_season
+    @staticmethod
+    def _to_int(value: Any, default: int) -> int:
+        """
+        将配置值转换为非负整数
+        
+        Args:
+            value (Any): 配置值
+            default (int): 为空或无法转换时的默认值
+            
+        Returns:
+            int: 转换结果
+        """
+        if value is None or value == "":
+            return default
+        try:
+            return max(0, int(value))
+        except (TypeError, ValueError):
+            return default
 
     def get_state(self) -> bool:
         """
@@ -151,10 +167,66 @@ class BangumiAuthorization(_PluginBase):
                                 ],
                             },
                         ],
-                    }
+                    },
+                    {
+                        "component": "VRow",  # 行组件
+                        "content": [
+                            {
+                                "component": "VCol",  # 列组件，占用4/12的md屏幕宽度
+                                "props": {"cols": 12, "md": 4},
+                                "content": [
+                                    {
+                                        "component": "VTextField",  # 数字输入框，限制抓取详情的结果数
+                                        "props": {
+                                            "model": "scrape_top_k",  # 绑定的配置字段
+                                            "label": "抓取详情数量上限",  # 输入框标签
+                                            "type": "number",  # 数字类型
+                                            "placeholder": "0 为不限制",  # 占位提示
+                                        },
+                                    }
+                                ],
+                            },
+                            {
+                                "component": "VCol",  # 列组件，占用4/12的md屏幕宽度
+                                "props": {"cols": 12, "md": 4},
+                                "content": [
+                                    {
+                                        "component": "VTextField",  # 数字输入框，搜索结果缓存时间
+                                        "props": {
+                                            "model": "search_cache_ttl",  # 绑定的配置字段
+                                            "label": "搜索缓存时间（秒）",  # 输入框标签
+                                            "type": "number",  # 数字类型
+                                            "placeholder": "0 为不缓存",  # 占位提示
+                                        },
+                                    }
+                                ],
+                            },
+                            {
+                                "component": "VCol",  # 列组件，占用4/12的md屏幕宽度
+                                "props": {"cols": 12, "md": 4},
+                                "content": [
+                                    {
+                                        "component": "VTextField",  # 数字输入框，条目详情缓存时间
+                                        "props": {
+                                            "model": "subject_cache_ttl",  # 绑定的配置字段
+                                            "label": "条目缓存时间（秒）",  # 输入框标签
+                                            "type": "number",  # 数字类型
+                                            "placeholder": "0 为不缓存",  # 占位提示
+                                        },
+                                    }
+                                ],
+                            },
+                        ],
+                    },
                 ],
             }
-        ], {"enabled": False, "authorization": ""}  # 默认配置值
+        ], {
+            "enabled": False,
+            "authorization": "",
+            "scrape_top_k": 0,
+            "search_cache_ttl": 1800,
+            "subject_cache_ttl": 3600,
+        }  # 默认配置值
 
     def get_page(self) -> List[dict]:
         """
@@ -227,9 +299,9 @@ class BangumiAuthorization(_PluginBase):
         """
         停止插件服务
         
-        插件停止时调用的方法，本插件不需要特殊的停止逻辑。
+        插件停止时注销共享客户端，没有其他插件使用时关闭连接池。
         """
-        pass
+        get_client().release(self.__class__.__name__)
 
     def _search_medias(self, meta: MetaBase) -> Optional[List[MediaInfo]]:
         """
@@ -251,24 +323,13 @@ class BangumiAuthorization(_PluginBase):
         if not meta or not meta.name:
             return []
         
-        # 构建搜索URL并发送请求
-        url = f"https://api.bgm.tv/search/subject/{meta.name}"
-        req = RequestUtils(ua=settings.NORMAL_USER_AGENT, headers=self._headers())
-        resp = req.get_res(url)
-        
-        # 处理响应结果
-        if not resp:
-            return []
-        try:
-            data = resp.json()
-        except Exception:
-            return []
+        # 搜索相关媒体（优先读取缓存）
+        items = self._client().search(meta.name, authorization=self._authorization, ttl=self._search_cache_ttl)
         
-        # 提取媒体列表并转换为MediaInfo对象
-        items = data.get("list") or []
+        # 将媒体列表转换为MediaInfo对象
         medias = [MediaInfo(bangumi_info=info) for info in items]
         
-        self._apply_season(medias, getattr(meta, "begin_season", None))
+        apply_season(medias, getattr(meta, "begin_season", None), chinese=True)
         
         return medias
 
@@ -279,7 +340,7 @@ class BangumiAuthorization(_PluginBase):
         根据提供的元数据信息，从 Bangumi API 获取详细的媒体元数据信息。
         支持两种模式：
         1. 如果提供了 mediaid，则直接获取指定 ID 的媒体详情
-        2. 如果没有提供 mediaid，则先搜索再获取每个结果的详细信息
+        2. 如果没有提供 mediaid，则先搜索再并发获取每个结果的详细信息（可限制数量）
         
         Args:
             meta (MetaBase): 媒体元数据对象，包含搜索关键词、可能的 mediaid 和季度信息
@@ -291,8 +352,7 @@ class BangumiAuthorization(_PluginBase):
         if not self._enabled:
             return None
         
-        # 初始化请求工具和结果列表
-        req = RequestUtils(ua=settings.NORMAL_USER_AGENT, headers=self._headers())
+        # 初始化结果列表
         details: List[MediaInfo] = []
         
         # 尝试获取 mediaid
@@ -304,10 +364,9 @@ class BangumiAuthorization(_PluginBase):
                 # 提取 Bangumi 主题 ID
                 sid = str(mediaid).split(":", 1)[-1]
                 # 请求详细信息
-                dresp = req.get_res(f"https://api.bgm.tv/subject/{sid}")
-                if dresp:
-                    dinfo = dresp.json()
-                    details.append(MediaInfo(bangumi_info=dinfo))
+                info = self._to_mediainfo(self._load_subjects([sid])[0])
+                if info:
+                    details.append(info)
             except Exception:
                 return []
         else:
@@ -316,38 +375,78 @@ class BangumiAuthorization(_PluginBase):
                 return []
             
             # 搜索相关媒体
-            url = f"https://api.bgm.tv/search/subject/{meta.name}"
-            resp = req.get_res(url)
-            if not resp:
-                return []
-            
-            try:
-                data = resp.json()
-            except Exception:
-                return []
+            items = self._client().search(meta.name, authorization=self._authorization, ttl=self._search_cache_ttl)
             
-            # 为每个搜索结果获取详细信息
-            items = data.get("list") or []
-            for info in items:
-                sid = (info or {}).get("id")
-                if not sid:
-                    continue
-                
-                # 请求单个媒体的详细信息
-                dresp = req.get_res(f"https://api.bgm.tv/subject/{sid}")
-                if not dresp:
-                    continue
-                
-                try:
-                    dinfo = dresp.json()
-                    details.append(MediaInfo(bangumi_info=dinfo))
-                except Exception:
-                    continue
-        
-        self._apply_season(details, getattr(meta, "begin_season", None))
+            # 批量获取每个搜索结果的详细信息，结果保持搜索顺序
+            sids = self._subject_ids(items)
+            for data in self._load_subjects(sids):
+                info = self._to_mediainfo(data)
+                if info:
+                    details.append(info)
+        
+        apply_season(details, getattr(meta, "begin_season", None), chinese=True)
         
         return details
 
+    def _subject_ids(self, items: List[dict]) -> List[Any]:
+        """
+        提取搜索结果中需要获取详情的主题 ID
+        
+        按搜索顺序去除空 ID，并按配置的数量上限截断。
+        
+        Args:
+            items (List[dict]): 搜索结果列表
+            
+        Returns:
+            List[Any]: 主题 ID 列表
+        """
+        sids = [(info or {}).get("id") for info in items]
+        sids = [sid for sid in sids if sid]
+        if self._scrape_top_k:
+            sids = sids[:self._scrape_top_k]
+        return sids
+
+    def _load_subjects(self, sids: List[Any]) -> List[Optional[dict]]:
+        """
+        通过共享客户端批量加载 v0 条目详情
+        
+        Args:
+            sids (List[Any]): Bangumi 主题 ID 列表
+            
+        Returns:
+            List[Optional[dict]]: 与 sids 顺序一致的条目数据，失败项为 None
+        """
+        return self._client().load_subjects(sids, authorization=self._authorization, ttl=self._subject_cache_ttl)
+
+    async def _async_load_subjects(self, sids: List[Any]) -> List[Optional[dict]]:
+        """
+        通过共享客户端异步批量加载 v0 条目详情
+        
+        Args:
+            sids (List[Any]): Bangumi 主题 ID 列表
+            
+        Returns:
+            List[Optional[dict]]: 与 sids 顺序一致的条目数据，失败项为 None
+        """
+        return await self._client().async_load_subjects(
+            sids, authorization=self._authorization, ttl=self._subject_cache_ttl
+        )
+
+    @staticmethod
+    def _to_mediainfo(data: Optional[dict]) -> Optional[MediaInfo]:
+        """
+        将 v0 条目数据转换为媒体信息
+        
+        缓存中的条目被多个调用方共享，转换前先复制一份。
+        
+        Args:
+            data (Optional[dict]): v0 条目数据
+            
+        Returns:
+            Optional[MediaInfo]: 媒体信息对象，数据无效时返回 None
+        """
+        return MediaInfo(bangumi_info=dict(data)) if isinstance(data, dict) else None
+
     async def _async_search_medias(self, meta: MetaBase) -> Optional[List[MediaInfo]]:
         """
         异步搜索媒体信息
@@ -368,24 +467,15 @@ class BangumiAuthorization(_PluginBase):
         if not meta or not meta.name:
             return []
         
-        # 构建搜索URL并发送异步请求
-        url = f"https://api.bgm.tv/search/subject/{meta.name}"
-        req = AsyncRequestUtils(ua=settings.NORMAL_USER_AGENT, headers=self._headers())
-        resp = await req.get_res(url)
-        
-        # 处理响应结果
-        if not resp:
-            return []
-        try:
-            data = resp.json()
-        except Exception:
-            return []
+        # 异步搜索相关媒体（优先读取缓存）
+        items = await self._client().async_search(
+            meta.name, authorization=self._authorization, ttl=self._search_cache_ttl
+        )
         
-        # 提取媒体列表并转换为MediaInfo对象
-        items = data.get("list") or []
+        # 将媒体列表转换为MediaInfo对象
         medias = [MediaInfo(bangumi_info=info) for info in items]
         
-        self._apply_season(medias, getattr(meta, "begin_season", None))
+        apply_season(medias, getattr(meta, "begin_season", None), chinese=True)
         
         return medias
 
@@ -406,8 +496,7 @@ class BangumiAuthorization(_PluginBase):
         if not self._enabled:
             return None
         
-        # 初始化异步请求工具和结果列表
-        req = AsyncRequestUtils(ua=settings.NORMAL_USER_AGENT, headers=self._headers())
+        # 初始化结果列表
         details: List[MediaInfo] = []
         
         # 尝试获取 mediaid
@@ -419,10 +508,9 @@ class BangumiAuthorization(_PluginBase):
                 # 提取 Bangumi 主题 ID
                 sid = str(mediaid).split(":", 1)[-1]
                 # 发送异步请求获取详细信息
-                dresp = await req.get_res(f"https://api.bgm.tv/subject/{sid}")
-                if dresp:
-                    dinfo = dresp.json()
-                    details.append(MediaInfo(bangumi_info=dinfo))
+                info = self._to_mediainfo((await self._async_load_subjects([sid]))[0])
+                if info:
+                    details.append(info)
             except Exception:
                 return []
         else:
@@ -431,35 +519,18 @@ class BangumiAuthorization(_PluginBase):
                 return []
             
             # 发送异步搜索请求
-            url = f"https://api.bgm.tv/search/subject/{meta.name}"
-            resp = await req.get_res(url)
-            if not resp:
-                return []
+            items = await self._client().async_search(
+                meta.name, authorization=self._authorization, ttl=self._search_cache_ttl
+            )
             
-            try:
-                data = resp.json()
-            except Exception:
-                return []
-            
-            # 为每个搜索结果获取详细信息
-            items = data.get("list") or []
-            for info in items:
-                sid = (info or {}).get("id")
-                if not sid:
-                    continue
-                
-                # 发送异步请求获取单个媒体的详细信息
-                dresp = await req.get_res(f"https://api.bgm.tv/subject/{sid}")
-                if not dresp:
-                    continue
-                
-                try:
-                    dinfo = dresp.json()
-                    details.append(MediaInfo(bangumi_info=dinfo))
-                except Exception:
-                    continue
-        
-        self._apply_season(details, getattr(meta, "begin_season", None))
+            # 合并批量获取每个搜索结果的详细信息，结果保持搜索顺序
+            sids = self._subject_ids(items)
+            for data in await self._async_load_subjects(sids):
+                info = self._to_mediainfo(data)
+                if info:
+                    details.append(info)
+        
+        apply_season(details, getattr(meta, "begin_season", None), chinese=True)
         
         return details
 
@@ -536,21 +607,10 @@ class BangumiAuthorization(_PluginBase):
         # 验证ID参数
         if not bangumiid:
             return None
-        # 初始化请求工具
-        req = RequestUtils(ua=settings.NORMAL_USER_AGENT, headers=self._headers())
-        # 发送同步请求获取数据
-        resp = req.get_res(
-            f"https://api.bgm.tv/v0/subjects/{bangumiid}"
-        )
-        data = None
-        # 检查响应状态并解析JSON
-        if resp and resp.status_code == 200:
-            try:
-                data = resp.json()
-            except Exception:
-                data = None
+        # 通过批量加载器获取条目（与异步版本共用缓存）
+        data = self._load_subjects([bangumiid])[0]
         # 返回媒体信息对象或None
-        return MediaInfo(bangumi_info=data) if isinstance(data, dict) else None
+        return self._to_mediainfo(data)
 
     async def _async_bangumi_info(self, bangumiid: int) -> Optional[MediaInfo]:
         """
@@ -571,21 +631,10 @@ class BangumiAuthorization(_PluginBase):
         # 验证ID参数
         if not bangumiid:
             return None
-        # 初始化异步请求工具
-        req = AsyncRequestUtils(ua=settings.NORMAL_USER_AGENT, headers=self._headers())
-        # 发送异步请求获取数据
-        resp = await req.get_res(
-            f"https://api.bgm.tv/v0/subjects/{bangumiid}"
-        )
-        data = None
-        # 检查响应状态并解析JSON
-        if resp and resp.status_code == 200:
-            try:
-                data = resp.json()
-            except Exception:
-                data = None
+        # 通过批量加载器获取条目（与同步版本共用缓存）
+        data = (await self._async_load_subjects([bangumiid]))[0]
         # 返回媒体信息对象或None
-        return MediaInfo(bangumi_info=data) if isinstance(data, dict) else None
+        return self._to_mediainfo(data)
 
     def _refresh_bangumi(self, **kwargs) -> Dict[str, Any]:
         """
@@ -602,7 +651,13 @@ class BangumiAuthorization(_PluginBase):
                 - enabled (bool): 插件是否启用（仅在操作成功时返回）
         """
         # 获取最新的配置，如果不存在则使用默认配置
-        cfg = self.get_config(self.__class__.__name__) or {"enabled": False, "authorization": ""}
+        cfg = self.get_config(self.__class__.__name__) or {
+            "enabled": False,
+            "authorization": "",
+            "scrape_top_k": 0,
+            "search_cache_ttl": 1800,
+            "subject_cache_ttl": 3600,
+        }
         try:
             # 使用新配置重新初始化插件
             self.init_plugin(cfg)
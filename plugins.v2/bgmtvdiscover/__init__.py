@@ -1,10 +1,10 @@
 import re
-from html import unescape
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import quote, unquote, urlencode, urljoin
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote, unquote, urlencode
 
 from app import schemas
-from app.core.cache import cached
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.core.event import Event, eventmanager
 from app.log import logger
@@ -13,11 +13,15 @@ from app.schemas import DiscoverSourceEventData
 from app.schemas.types import ChainEventType
 from app.utils.http import RequestUtils
 
+from .cache_codec import CacheCodecStats, build_conditional_headers, decode_cache_body, encode_cache_body
+from .html_utils import extract_year, normalize_poster_url, strip_html
 from .ui_generator import bgm_filter_ui
 
 
 BASE_URL = "https://bgm.tv"
 TAG_URL = f"{BASE_URL}/anime/tag"
+PAGE_CACHE_TTL = 1800
+PAGE_VALIDATOR_TTL = 7 * 86400
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -32,14 +36,12 @@ HEADERS = {
     "Referer": f"{BASE_URL}/",
 }
 
-TAG_PATTERN = re.compile(r"<[^>]+>")
-YEAR_PATTERN = re.compile(r"(?P<year>(19|20)\\d{2})")
 ITEM_PATTERN = re.compile(
-    r'<li[^>]*id="item_(?P<id>\\d+)"[^>]*>(?P<body>.*?)</li>',
+    r'<li[^>]*id="item_(?P<id>\d+)"[^>]*>(?P<body>.*?)</li>',
     re.IGNORECASE | re.DOTALL,
 )
 TITLE_PATTERN = re.compile(
-    r'<a[^>]*href="(?P<href>/subject/\\d+[^"]*)"[^>]*>(?P<title>.*?)</a>',
+    r'<a[^>]*href="(?P<href>/subject/\d+[^"]*)"[^>]*>(?P<title>.*?)</a>',
     re.IGNORECASE | re.DOTALL,
 )
 IMAGE_PATTERN = re.compile(
@@ -60,7 +62,7 @@ class BgmTvDiscover(_PluginBase):
     plugin_name = "Bangumi标签探索"
     plugin_desc = "让探索支持 bgm.tv 标签页的数据浏览"
     plugin_icon = f"{BASE_URL}/img/favicon.ico"
-    plugin_version = "1.0.0"
+    plugin_version = "1.2.5"
     plugin_author = "TRAE"
     author_url = "https://trae.ai"
     plugin_config_prefix = "bgmtvdiscover_"
@@ -71,6 +73,9 @@ class BgmTvDiscover(_PluginBase):
     _cookie: Optional[str] = None
     _use_proxy = True
     _proxy: Optional[str] = None
+    _compress_cache = False
+    _cache_stats: Optional[CacheCodecStats] = None
+    _page_cache: Optional[TTLCache] = None
 
     def init_plugin(self, config: dict = None) -> None:
         """
@@ -83,6 +88,10 @@ class BgmTvDiscover(_PluginBase):
             self._cookie = (config.get("cookie") or "").strip() or None
             self._use_proxy = config.get("use_proxy", True)
             self._proxy = (config.get("proxy") or "").strip() or None
+            self._compress_cache = bool(config.get("compress_cache", False))
+
+        if self._cache_stats is None:
+            self._cache_stats = CacheCodecStats()
 
         for host in ("bgm.tv", "lain.bgm.tv"):
             if host not in settings.SECURITY_IMAGE_DOMAINS:
@@ -118,7 +127,14 @@ class BgmTvDiscover(_PluginBase):
                 "methods": ["GET"],
                 "summary": "Bangumi 标签探索数据源",
                 "description": "获取 bgm.tv 标签页的探索数据",
-            }
+            },
+            {
+                "path": "/cache_stats",
+                "endpoint": self.cache_stats,
+                "methods": ["GET"],
+                "summary": "页面缓存压缩统计",
+                "description": "获取页面缓存的写入与读取次数、压缩前后字节数及压缩比",
+            },
         ]
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
@@ -146,6 +162,19 @@ class BgmTvDiscover(_PluginBase):
                                         },
                                     }
                                 ],
+                            },
+                            {
+                                "component": "VCol",
+                                "props": {"cols": 12, "md": 4},
+                                "content": [
+                                    {
+                                        "component": "VSwitch",
+                                        "props": {
+                                            "model": "compress_cache",
+                                            "label": "缓存压缩",
+                                        },
+                                    }
+                                ],
                             }
                         ],
                     },
@@ -226,7 +255,7 @@ class BgmTvDiscover(_PluginBase):
                     },
                 ],
             }
-        ], {"enabled": False, "use_proxy": True, "proxy": "", "cookie": ""}
+        ], {"enabled": False, "use_proxy": True, "proxy": "", "cookie": "", "compress_cache": False}
 
     def _build_proxies(self) -> Optional[Dict[str, str]]:
         """
@@ -259,16 +288,35 @@ class BgmTvDiscover(_PluginBase):
         """
         pass
 
-    @staticmethod
-    def _strip_html(text: str) -> str:
+    _strip_html = staticmethod(strip_html)
+
+    def _encode_cache_body(self, text: Optional[str]) -> Union[str, bytes, None]:
+        """
+        按配置压缩待缓存的页面源码，小于阈值的内容保持原样
+
+        :param text (str): 页面源码
+
+        :return Union[str, bytes]: 原文或带编码标记的压缩数据
+        """
+        return encode_cache_body(text, self._compress_cache, self._cache_stats)
+
+    def _decode_cache_body(self, value: Union[str, bytes, None]) -> Optional[str]:
         """
-        清理 HTML 文本
+        还原缓存中的页面源码，兼容未压缩的历史条目
 
-        :param text (str): 原始 HTML 文本
+        :param value (Union[str, bytes]): 缓存值
 
-        :return str: 清理后的纯文本
+        :return str: 页面源码
         """
-        return re.sub(r"\\s+", " ", unescape(TAG_PATTERN.sub("", text))).strip()
+        return decode_cache_body(value, self._cache_stats)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        获取页面缓存编解码计数
+
+        :return Dict: 写入与读取次数、压缩前后字节数及压缩比
+        """
+        return self._cache_stats.snapshot() if self._cache_stats else {}
 
     @staticmethod
     def _normalize_poster_url(src: str) -> str:
@@ -279,39 +327,36 @@ class BgmTvDiscover(_PluginBase):
 
         :return str: 完整图片地址
         """
-        src = unescape(src).strip()
-        if src.startswith("//"):
-            return f"https:{src}"
-        if src.startswith("/"):
-            return urljoin(BASE_URL, src)
-        return src
+        return normalize_poster_url(src, BASE_URL)
 
-    @staticmethod
-    def _extract_year(info_text: Optional[str]) -> Optional[str]:
-        """
-        从条目信息中提取年份
+    _extract_year = staticmethod(extract_year)
 
-        :param info_text (str): 条目信息文本
+    def _page_store(self) -> TTLCache:
+        """
+        获取标签页缓存，条目同时保存响应的校验头，过期后用于条件请求
 
-        :return str: 年份
+        :return TTLCache: 标签页缓存
         """
-        if not info_text:
-            return None
-        match = YEAR_PATTERN.search(info_text)
-        if not match:
-            return None
-        return match.group("year")
+        if self._page_cache is None:
+            self._page_cache = TTLCache(
+                region="bgm_tv_discover", maxsize=256, ttl=PAGE_VALIDATOR_TTL
+            )
+        return self._page_cache
+
+    _build_conditional_headers = staticmethod(build_conditional_headers)
 
-    @cached(region="bgm_tv_discover", ttl=1800, skip_none=True)
-    def __request(self, tag: str, sort: str = "rank", page: int = 1) -> str:
+    def __request(self, tag: str, sort: str = "rank", page: int = 1) -> List[tuple]:
         """
-        请求 bgm.tv 标签列表页
+        请求并解析 bgm.tv 标签列表页
+
+        解析结果与 ETag/Last-Modified 一起缓存；缓存过期后发起条件请求，
+        命中 304 时仅刷新缓存时间，直接返回已缓存的解析结果
 
         :param tag (str): 标签名
         :param sort (str): 排序字段
         :param page (int): 页码
 
-        :return str: 页面 HTML
+        :return List: 条目行，见 _parse_rows
         """
         normalized_tag = unquote(tag or "").strip() or "里番"
         request_url = f"{TAG_URL}/{quote(normalized_tag)}"
@@ -323,34 +368,85 @@ class BgmTvDiscover(_PluginBase):
         if params:
             request_url = f"{request_url}?{urlencode(params)}"
 
+        store = self._page_store()
+        try:
+            entry = store[request_url] if request_url in store else None
+        except KeyError:
+            entry = None
+        now = time.time()
+        if entry and now - float(entry.get("checked_at") or 0) < PAGE_CACHE_TTL:
+            return self._cached_rows(store, request_url, entry)
+
+        headers = self._build_headers()
+        headers.update(self._build_conditional_headers(entry))
         res = RequestUtils(
-            headers=self._build_headers(),
+            headers=headers,
             proxies=self._build_proxies(),
         ).get_res(request_url)
         if res is None:
             raise ConnectionError("无法连接 bgm.tv，请检查网络连接")
+        if entry and res.status_code == 304:
+            entry["checked_at"] = now
+            store[request_url] = entry
+            return self._cached_rows(store, request_url, entry)
         if not res.ok:
             if res.status_code in (401, 403):
                 raise ValueError(
                     "请求 bgm.tv 失败：可能需要登录或触发风控，请尝试配置代理或 Cookie"
                 )
             raise ValueError(f"请求 bgm.tv 失败：{res.status_code}")
-        return res.text
-
-    def _parse_items(self, html: str) -> List[schemas.MediaInfo]:
-        """
-        解析标签页条目列表
+        rows = self._parse_rows(res.text)
+        entry = {
+            "rows": rows,
+            "etag": res.headers.get("ETag") or "",
+            "last_modified": res.headers.get("Last-Modified") or "",
+            "checked_at": now,
+        }
+        if not rows:
+            # 未解析出条目时保留页面源码，解析规则更新后命中 304 仍可重新解析
+            entry["body"] = self._encode_cache_body(res.text)
+        store[request_url] = entry
+        return rows
+
+    def _cached_rows(self, store: TTLCache, request_url: str, entry: Dict[str, Any]) -> List[tuple]:
+        """
+        读取缓存条目中的解析结果
+
+        条目只保存解析结果与校验信息；早期只含页面源码的条目与未解析出条目的页面按源码重新解析，
+        解析出条目后丢弃源码并补写
+
+        :param store (TTLCache): 页面缓存
+        :param request_url (str): 请求地址
+        :param entry (Dict): 缓存条目
+
+        :return List: 条目行
+        """
+        rows = entry.get("rows")
+        if rows or "body" not in entry:
+            return rows or []
+        rows = self._parse_rows(self._decode_cache_body(entry.get("body")) or "")
+        if rows or entry.get("rows") is None:
+            entry["rows"] = rows
+            if rows:
+                entry.pop("body", None)
+            store[request_url] = entry
+        return rows
+
+    def _parse_rows(self, html: str) -> List[tuple]:
+        """
+        解析标签页条目列表为紧凑的条目行
 
         :param html (str): 页面 HTML
 
-        :return List: 媒体信息列表
+        :return List: (subject_id, title, poster_path, year) 列表
         """
-        results: List[schemas.MediaInfo] = []
-        for match in ITEM_PATTERN.finditer(html or ""):
+        rows: List[tuple] = []
+        html = html or ""
+        for match in ITEM_PATTERN.finditer(html):
             subject_id = match.group("id")
-            body = match.group("body")
+            start, end = match.span("body")
 
-            title_match = TITLE_PATTERN.search(body)
+            title_match = TITLE_PATTERN.search(html, start, end)
             if not title_match:
                 continue
 
@@ -358,7 +454,7 @@ class BgmTvDiscover(_PluginBase):
             if not title:
                 continue
 
-            poster_match = IMAGE_PATTERN.search(body)
+            poster_match = IMAGE_PATTERN.search(html, start, end)
             poster_path = (
                 self._normalize_poster_url(poster_match.group("src"))
                 if poster_match
@@ -367,10 +463,22 @@ class BgmTvDiscover(_PluginBase):
             if not poster_path:
                 continue
 
-            info_match = INFO_PATTERN.search(body)
+            info_match = INFO_PATTERN.search(html, start, end)
             info_text = self._strip_html(info_match.group("info")) if info_match else None
-            year = self._extract_year(info_text)
+            rows.append((subject_id, title, poster_path, self._extract_year(info_text)))
+        return rows
+
+    @staticmethod
+    def _build_items(rows: List[tuple]) -> List[schemas.MediaInfo]:
+        """
+        将条目行转换为媒体信息
+
+        :param rows (List): 条目行
 
+        :return List: 媒体信息列表
+        """
+        results: List[schemas.MediaInfo] = []
+        for subject_id, title, poster_path, year in rows:
             media_info = schemas.MediaInfo(
                 type="动漫",
                 title=title,
@@ -402,9 +510,8 @@ class BgmTvDiscover(_PluginBase):
         :return List: 媒体信息列表
         """
         try:
-            html = self.__request(tag=tag, sort=sort, page=page)
-            results = self._parse_items(html=html)
-            return results[:count]
+            rows = self.__request(tag=tag, sort=sort, page=page)
+            return self._build_items(rows[:count])
         except Exception as err:
             logger.error("获取 bgm.tv 数据失败: %s", err, exc_info=True)
             return []
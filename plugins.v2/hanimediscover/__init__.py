@@ -1,7 +1,6 @@
 import re
-from html import unescape
-from typing import Any, Dict, List, Optional, Set, Tuple
-from urllib.parse import parse_qs, urlencode, urljoin, urlparse
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import urlencode, urljoin
 
 from app import schemas
 from app.core.cache import cached
@@ -13,6 +12,8 @@ from app.schemas import DiscoverSourceEventData
 from app.schemas.types import ChainEventType
 from app.utils.http import RequestUtils
 
+from .cache_codec import CacheCodecStats, decode_cache_body, encode_cache_body
+from .html_utils import clean_attr_value, extract_query_id, extract_year, strip_html
 from .ui_generator import hanime_filter_ui
 
 
@@ -59,8 +60,6 @@ HORIZONTAL_IMAGE_PATTERN = re.compile(
     r'<img[^>]*class="[^"]*\bmain-thumb\b[^"]*"[^>]*src="\s*`?(?P<src>[^"`]+)`?\s*"[^>]*>',
     re.IGNORECASE | re.DOTALL,
 )
-TAG_PATTERN = re.compile(r"<[^>]+>")
-YEAR_PATTERN = re.compile(r"(?P<year>(19|20)\d{2})")
 
 
 class HanimeDiscover(_PluginBase):
@@ -73,7 +72,7 @@ class HanimeDiscover(_PluginBase):
     plugin_icon = (
         "https://raw.githubusercontent.com/ankhmirror/MoviePilot-Plugins/main/icons/hanime.svg"
     )
-    plugin_version = "1.0.4"
+    plugin_version = "1.2.4"
     plugin_author = "TRAE"
     author_url = "https://trae.ai"
     plugin_config_prefix = "hanimediscover_"
@@ -84,6 +83,8 @@ class HanimeDiscover(_PluginBase):
     _cookie: Optional[str] = None
     _use_proxy = True
     _proxy: Optional[str] = None
+    _compress_cache = False
+    _cache_stats: Optional[CacheCodecStats] = None
 
     def init_plugin(self, config: dict = None) -> None:
         """
@@ -96,6 +97,10 @@ class HanimeDiscover(_PluginBase):
             self._cookie = (config.get("cookie") or "").strip() or None
             self._use_proxy = config.get("use_proxy", True)
             self._proxy = (config.get("proxy") or "").strip() or None
+            self._compress_cache = bool(config.get("compress_cache", False))
+
+        if self._cache_stats is None:
+            self._cache_stats = CacheCodecStats()
 
         if "vdownload.hembed.com" not in settings.SECURITY_IMAGE_DOMAINS:
             settings.SECURITY_IMAGE_DOMAINS.append("vdownload.hembed.com")
@@ -130,7 +135,14 @@ class HanimeDiscover(_PluginBase):
                 "methods": ["GET"],
                 "summary": "Hanime 探索数据源",
                 "description": "获取 Hanime 探索数据",
-            }
+            },
+            {
+                "path": "/cache_stats",
+                "endpoint": self.cache_stats,
+                "methods": ["GET"],
+                "summary": "页面缓存压缩统计",
+                "description": "获取页面缓存的写入与读取次数、压缩前后字节数及压缩比",
+            },
         ]
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
@@ -158,6 +170,19 @@ class HanimeDiscover(_PluginBase):
                                         },
                                     }
                                 ],
+                            },
+                            {
+                                "component": "VCol",
+                                "props": {"cols": 12, "md": 4},
+                                "content": [
+                                    {
+                                        "component": "VSwitch",
+                                        "props": {
+                                            "model": "compress_cache",
+                                            "label": "缓存压缩",
+                                        },
+                                    }
+                                ],
                             }
                         ],
                     },
@@ -238,7 +263,7 @@ class HanimeDiscover(_PluginBase):
                     }
                 ],
             }
-        ], {"enabled": False, "use_proxy": True, "proxy": "", "cookie": ""}
+        ], {"enabled": False, "use_proxy": True, "proxy": "", "cookie": "", "compress_cache": False}
 
     def _build_proxies(self) -> Optional[Dict[str, str]]:
         """
@@ -271,56 +296,39 @@ class HanimeDiscover(_PluginBase):
         """
         pass
 
-    @staticmethod
-    def _strip_html(text: str) -> str:
-        """
-        清理 HTML 文本
-
-        :param text (str): 原始 HTML 文本
+    _strip_html = staticmethod(strip_html)
 
-        :return str: 清理后的纯文本
+    def _encode_cache_body(self, text: Optional[str]) -> Union[str, bytes, None]:
         """
-        return re.sub(r"\s+", " ", unescape(TAG_PATTERN.sub("", text))).strip()
+        按配置压缩待缓存的页面源码，小于阈值的内容保持原样
 
-    @staticmethod
-    def _extract_media_id(detail_url: str) -> str:
-        """
-        从详情链接提取媒体 ID
+        :param text (str): 页面源码
 
-        :param detail_url (str): 详情页链接
-
-        :return str: 媒体 ID
+        :return Union[str, bytes]: 原文或带编码标记的压缩数据
         """
-        media_ids = parse_qs(urlparse(detail_url).query).get("v", [])
-        return media_ids[0] if media_ids else detail_url
+        return encode_cache_body(text, self._compress_cache, self._cache_stats)
 
-    @staticmethod
-    def _extract_year(date_text: Optional[str]) -> Optional[str]:
+    def _decode_cache_body(self, value: Union[str, bytes, None]) -> Optional[str]:
         """
-        从年份筛选值提取年份
+        还原缓存中的页面源码，兼容未压缩的历史条目
 
-        :param date_text (str): 年份筛选值
+        :param value (Union[str, bytes]): 缓存值
 
-        :return str: 提取到的年份
+        :return str: 页面源码
         """
-        if not date_text:
-            return None
-
-        match = YEAR_PATTERN.search(date_text)
-        if not match:
-            return None
-        return match.group("year")
+        return decode_cache_body(value, self._cache_stats)
 
-    @staticmethod
-    def _clean_attr_value(value: str) -> str:
+    def cache_stats(self) -> Dict[str, Any]:
         """
-        清理 HTML 属性值中的包裹符号
+        获取页面缓存编解码计数
 
-        :param value (str): 原始属性值
-
-        :return str: 清理后的属性值
+        :return Dict: 写入与读取次数、压缩前后字节数及压缩比
         """
-        return unescape(value).strip().strip("`").strip()
+        return self._cache_stats.snapshot() if self._cache_stats else {}
+
+    _extract_media_id = staticmethod(extract_query_id)
+    _extract_year = staticmethod(extract_year)
+    _clean_attr_value = staticmethod(clean_attr_value)
 
     def _append_media_info(
         self,
@@ -385,10 +393,11 @@ class HanimeDiscover(_PluginBase):
         :param seen_ids (Set): 已解析媒体 ID 集合
         :param results (List): 媒体信息列表
         """
+        html = html or ""
         for match in link_pattern.finditer(html):
-            body = match.group("body")
-            title_match = title_pattern.search(body)
-            image_match = image_pattern.search(body)
+            start, end = match.span("body")
+            title_match = title_pattern.search(html, start, end)
+            image_match = image_pattern.search(html, start, end)
             if not title_match or not image_match:
                 continue
 
@@ -458,7 +467,7 @@ class HanimeDiscover(_PluginBase):
         sort: str = None,
         date: str = None,
         page: int = 1,
-    ) -> str:
+    ) -> Union[str, bytes]:
         """
         请求 Hanime 搜索页
 
@@ -467,7 +476,7 @@ class HanimeDiscover(_PluginBase):
         :param date (str): 年份
         :param page (int): 页码
 
-        :return str: 搜索页 HTML
+        :return Union[str, bytes]: 搜索页 HTML，开启缓存压缩时为压缩数据
         """
         params = {}
         if genre:
@@ -495,7 +504,7 @@ class HanimeDiscover(_PluginBase):
                     "请求 Hanime 失败：403，可能触发安全验证，请尝试配置代理或 Cookie"
                 )
             raise ValueError(f"请求 Hanime 失败：{res.status_code}")
-        return res.text
+        return self._encode_cache_body(res.text)
 
     def _parse_videos(self, html: str, date: str = None) -> List[schemas.MediaInfo]:
         """
@@ -543,7 +552,9 @@ class HanimeDiscover(_PluginBase):
         :return List: 媒体信息列表
         """
         try:
-            html = self.__request(genre=genre, sort=sort, date=date, page=page)
+            html = self._decode_cache_body(
+                self.__request(genre=genre, sort=sort, date=date, page=page)
+            )
             results = self._parse_videos(html=html, date=date)
             return results[:count]
         except Exception as err:
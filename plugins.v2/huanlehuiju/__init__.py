@@ -1,11 +1,20 @@
 from datetime import datetime
+import asyncio
+import hashlib
+import json
 import re
-from html import unescape
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from urllib.parse import parse_qs, urlparse
 from urllib.parse import quote
 
-from app.core.cache import cached
+from fastapi import Body
+from fastapi.responses import StreamingResponse
+
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.core.context import MediaInfo
 from app.core.meta import MetaBase
@@ -13,6 +22,36 @@ from app.log import logger
 from app.plugins import _PluginBase
 from app.utils.http import AsyncRequestUtils, RequestUtils
 
+from .bangumi_client import BangumiClient, apply_season, get_client, strip_season_text
+from .cache_codec import CacheCodecStats, build_conditional_headers, decode_cache_body, encode_cache_body
+from .html_utils import strip_html
+from .search_parser import parse_search_cards
+from .subject_store import SubjectArchive, SubjectStore
+from .title_index import TitleIndex, similarity
+
+
+class _SourceTask:
+    """
+    后台数据源查询任务，记录任务开始执行的时间
+    """
+
+    def __init__(self, func: Callable, args: tuple):
+        self.func = func
+        self.args = args
+        self.started = threading.Event()
+        self.started_at = 0.0
+        self.future: Optional[Future] = None
+
+    def run(self) -> Any:
+        """
+        在线程池中执行查询
+
+        :return Any: 查询结果
+        """
+        self.started_at = time.monotonic()
+        self.started.set()
+        return self.func(*self.args)
+
 
 class HuanLeHuiju(_PluginBase):
     """
@@ -26,14 +65,31 @@ class HuanLeHuiju(_PluginBase):
     plugin_name = "欢乐汇聚"
     plugin_desc = "MoviePilot 全局识别与 metadata 融合插件，第一版接入 Bangumi"
     plugin_order = 99
-    plugin_version = "1.3.0"
+    plugin_version = "1.17.18"
     plugin_author = "踏马奔腾"
     author_url = "https://trae.ai"
     plugin_icon = (
         "https://raw.githubusercontent.com/jxxghp/MoviePilot-Plugins/main/icons/bangumi.png"
     )
 
+    BANGUMI_CACHE_TTL = 1800
+    # 各数据源查询的超时预算（秒）
+    SOURCE_TIMEOUTS = {"bangumi": 15, "hanime": 15}
+    # 并行搜索合并排序时各数据源的优先级加分
+    SEARCH_SOURCE_PRIORITY = {"bangumi": 0.1, "hanime": 0.0}
+    # 批量查询同时处理的查询数与单次请求的查询数上限
+    BATCH_CONCURRENCY = 4
+    BATCH_MAX_QUERIES = 500
+    # 条目镜像每轮同步的最大条目数、同步间隔（小时）与刷新失败后的重试间隔（秒）
+    MIRROR_SYNC_BATCH = 200
+    MIRROR_SYNC_HOURS = 6
+    MIRROR_RETRY_DELAY = 3600
     HANIME_BASE_URL = "https://hanime1.me"
+    HANIME_WATCH_TTL = 86400
+    HANIME_SEARCH_TTL = 1800
+    HANIME_VALIDATOR_TTL = 7 * 86400
+    # watch 解析结果的紧凑存储字段顺序
+    HANIME_WATCH_FIELDS = ("id", "url", "title", "series", "description", "date", "views", "poster", "tags")
     _hanime_headers = {
         "User-Agent": settings.NORMAL_USER_AGENT,
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -65,32 +121,6 @@ class HuanLeHuiju(_PluginBase):
         r'<div[^>]*class="[^"]*\bsingle-video-tag\b[^"]*"[^>]*>.*?<a[^>]*>(?P<tag>.*?)</a>.*?</div>',
         re.IGNORECASE | re.DOTALL,
     )
-    _hanime_search_item_pattern = re.compile(
-        r'<a[^>]*href="\s*`?(?P<href>https?://[^"`\s]*/watch\?v=(?P<id>\d+)[^"`\s]*|/watch\?v=(?P<id2>\d+)[^"`\s]*)`?\s*"'
-        r'[^>]*class="[^"]*\bvideo-link\b[^"]*"[^>]*>(?P<body>.*?)</a>',
-        re.IGNORECASE | re.DOTALL,
-    )
-    _hanime_search_thumb_pattern = re.compile(
-        r'<img[^>]*class="[^"]*\bmain-thumb\b[^"]*"[^>]*src="\s*`?(?P<src>[^"`\s]+)`?\s*"[^>]*>',
-        re.IGNORECASE | re.DOTALL,
-    )
-    _hanime_search_title_pattern = re.compile(
-        r'<div[^>]*class="[^"]*\btitle\b[^"]*"[^>]*>(?P<title>.*?)</div>',
-        re.IGNORECASE | re.DOTALL,
-    )
-    _hanime_search_duration_pattern = re.compile(
-        r'<div[^>]*class="[^"]*\bduration\b[^"]*"[^>]*>(?P<duration>.*?)</div>',
-        re.IGNORECASE | re.DOTALL,
-    )
-    _hanime_search_like_pattern = re.compile(
-        r"<i[^>]*>\s*thumb_up\s*</i>\s*(?P<like>\d+%)",
-        re.IGNORECASE | re.DOTALL,
-    )
-    _hanime_search_views_pattern = re.compile(
-        r'<div[^>]*class="[^"]*\bstat-item\b[^"]*"[^>]*>\s*(?P<views>\d+(?:\.\d+)?万?次)\s*</div>',
-        re.IGNORECASE | re.DOTALL,
-    )
-    _hanime_strip_tag_pattern = re.compile(r"<[^>]+>")
 
     _enabled: bool = False
     _authorization: str = ""
@@ -99,9 +129,26 @@ class HuanLeHuiju(_PluginBase):
     _preview_hanime_id: str = ""
     _use_cache: bool = True
     _prefer_exact_match: bool = True
+    _parallel_search: bool = False
+    _scrape_top_k: int = 5
+    _subject_mirror: bool = False
+    _archive_path: str = ""
+    _prefer_archive: bool = False
     _hanime_cookie: str = ""
     _hanime_use_proxy: bool = True
     _hanime_proxy: str = ""
+    _compress_cache: bool = False
+    _cache_stats: Optional[CacheCodecStats] = None
+    _hanime_watch_cache: Optional[TTLCache] = None
+    _hanime_search_cache: Optional[TTLCache] = None
+    _hanime_parsed_cache: Optional[TTLCache] = None
+    _metadata_query_cache: Optional[TTLCache] = None
+    _page_tree: Optional[Tuple[str, str, List[dict]]] = None
+    _subject_store: Optional[SubjectStore] = None
+    _subject_archive: Optional[SubjectArchive] = None
+    _title_index: Optional[TitleIndex] = None
+    _source_executor: Optional[ThreadPoolExecutor] = None
+    _source_executor_lock = threading.Lock()
 
     def init_plugin(self, config: dict = None) -> None:
         """
@@ -116,9 +163,19 @@ class HuanLeHuiju(_PluginBase):
         self._preview_hanime_id = ""
         self._use_cache = True
         self._prefer_exact_match = True
+        self._parallel_search = False
+        self._scrape_top_k = 5
+        self._subject_mirror = False
+        self._archive_path = ""
+        self._prefer_archive = False
         self._hanime_cookie = ""
         self._hanime_use_proxy = True
         self._hanime_proxy = ""
+        self._compress_cache = False
+        self._close_subject_store()
+        self._close_subject_archive()
+        if self._cache_stats is None:
+            self._cache_stats = CacheCodecStats()
 
         if not config:
             return
@@ -135,13 +192,54 @@ class HuanLeHuiju(_PluginBase):
         self._preview_hanime_id = str(config.get("preview_hanime_id", "") or "").strip()
         self._use_cache = bool(config.get("use_cache", True))
         self._prefer_exact_match = bool(config.get("prefer_exact_match", True))
+        self._parallel_search = bool(config.get("parallel_search", False))
+        self._scrape_top_k = self._to_int(config.get("scrape_top_k"), 5)
+        self._subject_mirror = bool(config.get("subject_mirror", False))
+        self._archive_path = str(config.get("archive_path", "") or "").strip()
+        self._prefer_archive = bool(config.get("prefer_archive", False))
         self._hanime_cookie = str(config.get("hanime_cookie", "") or "").strip()
         self._hanime_use_proxy = bool(config.get("hanime_use_proxy", True))
         self._hanime_proxy = str(config.get("hanime_proxy", "") or "").strip()
+        self._compress_cache = bool(config.get("compress_cache", False))
+        get_client().acquire(self.__class__.__name__)
+        if self._title_index is not None:
+            self._title_index.save(force=True)
+        self._title_index = (
+            TitleIndex(self.get_data_path() / "bangumi_title_index.json", self._normalize_text)
+            if self._use_cache
+            else None
+        )
+        if self._use_cache and self._subject_mirror:
+            try:
+                self._subject_store = SubjectStore(self.get_data_path() / "bangumi_subjects.db")
+            except Exception as err:
+                logger.error("欢乐汇聚条目镜像打开失败: %s", err, exc_info=True)
+        if self._archive_db_path().exists():
+            try:
+                self._subject_archive = SubjectArchive(self._archive_db_path())
+            except Exception as err:
+                logger.error("欢乐汇聚离线归档打开失败: %s", err, exc_info=True)
 
         if "vdownload.hembed.com" not in settings.SECURITY_IMAGE_DOMAINS:
             settings.SECURITY_IMAGE_DOMAINS.append("vdownload.hembed.com")
 
+    @staticmethod
+    def _to_int(value: Any, default: int) -> int:
+        """
+        将配置值转换为非负整数
+
+        :param value (Any): 配置值
+        :param default (int): 为空或无法转换时的默认值
+
+        :return int: 转换结果
+        """
+        if value is None or value == "":
+            return default
+        try:
+            return max(0, int(value))
+        except (TypeError, ValueError):
+            return default
+
     def get_state(self) -> bool:
         """
         获取插件状态
@@ -197,6 +295,21 @@ class HuanLeHuiju(_PluginBase):
                 "summary": "查询融合 metadata",
                 "description": "按标题或 Bangumi ID 查询 metadata，并可选保存为详情页预览",
             },
+            {
+                "path": "/query_metadata_batch",
+                "endpoint": self.query_metadata_batch,
+                "methods": ["POST"],
+                "summary": "批量查询融合 metadata",
+                "description": "去重后并发查询多个标题、Bangumi ID 或 Hanime ID，按完成顺序以 NDJSON 流式返回",
+            },
+            {
+                "path": "/import_archive",
+                "endpoint": self.import_archive,
+                "methods": ["POST"],
+                "summary": "导入 Bangumi 离线归档",
+                "description": "从插件数据目录中的 Bangumi Archive 压缩包或 subject.jsonlines 导入动画条目，"
+                "在线查询失败时作为兜底",
+            },
             {
                 "path": "/query_hanime",
                 "endpoint": self.query_hanime,
@@ -204,6 +317,31 @@ class HuanLeHuiju(_PluginBase):
                 "summary": "查询 Hanime 条目",
                 "description": "按 Hanime watch ID 或链接解析标题、简介、标签等信息",
             },
+            {
+                "path": "/cache_stats",
+                "endpoint": self.cache_stats,
+                "methods": ["GET"],
+                "summary": "页面缓存压缩统计",
+                "description": "获取页面缓存的写入与读取次数、压缩前后字节数及压缩比",
+            },
+        ]
+
+    def get_service(self) -> List[Dict[str, Any]]:
+        """
+        注册插件公共服务
+
+        :return List: 服务列表
+        """
+        if not self._enabled or self._subject_store is None:
+            return []
+        return [
+            {
+                "id": "HuanLeHuiju.SubjectMirror",
+                "name": "欢乐汇聚 Bangumi 条目镜像同步",
+                "trigger": "interval",
+                "func": self.sync_subject_mirror,
+                "kwargs": {"hours": self.MIRROR_SYNC_HOURS},
+            }
         ]
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
@@ -221,7 +359,7 @@ class HuanLeHuiju(_PluginBase):
                         "content": [
                             {
                                 "component": "VCol",
-                                "props": {"cols": 12, "md": 4},
+                                "props": {"cols": 12, "md": 3},
                                 "content": [
                                     {
                                         "component": "VSwitch",
@@ -234,7 +372,7 @@ class HuanLeHuiju(_PluginBase):
                             },
                             {
                                 "component": "VCol",
-                                "props": {"cols": 12, "md": 4},
+                                "props": {"cols": 12, "md": 3},
                                 "content": [
                                     {
                                         "component": "VSwitch",
@@ -247,7 +385,7 @@ class HuanLeHuiju(_PluginBase):
                             },
                             {
                                 "component": "VCol",
-                                "props": {"cols": 12, "md": 4},
+                                "props": {"cols": 12, "md": 3},
                                 "content": [
                                     {
                                         "component": "VSwitch",
@@ -258,6 +396,19 @@ class HuanLeHuiju(_PluginBase):
                                     }
                                 ],
                             },
+                            {
+                                "component": "VCol",
+                                "props": {"cols": 12, "md": 3},
+                                "content": [
+                                    {
+                                        "component": "VSwitch",
+                                        "props": {
+                                            "model": "parallel_search",
+                                            "label": "并行搜索 Bangumi 与 Hanime",
+                                        },
+                                    }
+                                ],
+                            },
                         ],
                     },
                     {
@@ -265,7 +416,7 @@ class HuanLeHuiju(_PluginBase):
                         "content": [
                             {
                                 "component": "VCol",
-                                "props": {"cols": 12},
+                                "props": {"cols": 12, "md": 6},
                                 "content": [
                                     {
                                         "component": "VTextField",
@@ -278,7 +429,75 @@ class HuanLeHuiju(_PluginBase):
                                         },
                                     }
                                 ],
-                            }
+                            },
+                            {
+                                "component": "VCol",
+                                "props": {"cols": 12, "md": 3},
+                                "content": [
+                                    {
+                                        "component": "VTextField",
+                                        "props": {
+                                            "model": "scrape_top_k",
+                                            "label": "刮削详情数量上限",
+                                            "type": "number",
+                                            "hint": "无 ID 刮削时最多获取详情的搜索结果数，0 为不限制",
+                                            "persistent-hint": True,
+                                        },
+                                    }
+                                ],
+                            },
+                            {
+                                "component": "VCol",
+                                "props": {"cols": 12, "md": 3},
+                                "content": [
+                                    {
+                                        "component": "VSwitch",
+                                        "props": {
+                                            "model": "subject_mirror",
+                                            "label": "本地条目镜像",
+                                            "hint": "需开启缓存，已识别条目保存在本地并定时增量刷新",
+                                            "persistent-hint": True,
+                                        },
+                                    }
+                                ],
+                            },
+                        ],
+                    },
+                    {
+                        "component": "VRow",
+                        "content": [
+                            {
+                                "component": "VCol",
+                                "props": {"cols": 12, "md": 8},
+                                "content": [
+                                    {
+                                        "component": "VTextField",
+                                        "props": {
+                                            "model": "archive_path",
+                                            "label": "Bangumi 离线归档路径",
+                                            "hint": "可选，放入插件数据目录的 Bangumi Archive 压缩包或 subject.jsonlines 文件名，"
+                                            "通过 import_archive 接口导入后，在线查询失败时使用本地数据（归档不含图片）",
+                                            "persistent-hint": True,
+                                            "clearable": True,
+                                        },
+                                    }
+                                ],
+                            },
+                            {
+                                "component": "VCol",
+                                "props": {"cols": 12, "md": 4},
+                                "content": [
+                                    {
+                                        "component": "VSwitch",
+                                        "props": {
+                                            "model": "prefer_archive",
+                                            "label": "优先离线归档",
+                                            "hint": "已导入归档时先查归档，未命中再请求 Bangumi API，适合离线或受限流的环境",
+                                            "persistent-hint": True,
+                                        },
+                                    }
+                                ],
+                            },
                         ],
                     },
                     {
@@ -373,7 +592,20 @@ class HuanLeHuiju(_PluginBase):
                             },
                             {
                                 "component": "VCol",
-                                "props": {"cols": 12, "md": 8},
+                                "props": {"cols": 12, "md": 4},
+                                "content": [
+                                    {
+                                        "component": "VSwitch",
+                                        "props": {
+                                            "model": "compress_cache",
+                                            "label": "缓存压缩",
+                                        },
+                                    }
+                                ],
+                            },
+                            {
+                                "component": "VCol",
+                                "props": {"cols": 12, "md": 4},
                                 "content": [
                                     {
                                         "component": "VTextField",
@@ -409,16 +641,100 @@ class HuanLeHuiju(_PluginBase):
             "hanime_cookie": "",
             "hanime_use_proxy": True,
             "hanime_proxy": "",
+            "compress_cache": False,
+            "parallel_search": False,
+            "scrape_top_k": 5,
+            "subject_mirror": False,
+            "archive_path": "",
+            "prefer_archive": False,
         }
 
     def get_page(self) -> List[dict]:
         """
-        获取插件详情页
+        获取插件详情页，优先返回保存预览时渲染好的页面，配置变更后重新渲染
+
+        :return List: 详情页组件配置
+        """
+        fingerprint = self._page_fingerprint()
+        api_token = str(settings.API_TOKEN)
+        if self._page_tree and self._page_tree[:2] == (fingerprint, api_token):
+            return self._page_tree[2]
+        stored = self.get_data("last_page")
+        if isinstance(stored, dict) and stored.get("fingerprint") == fingerprint:
+            page = self._with_api_token(stored.get("page") or [])
+            self._page_tree = (fingerprint, api_token, page)
+            return page
+        return self._store_page(self.get_data("last_preview"), self.get_data("last_error"))
+
+    def _page_fingerprint(self) -> str:
+        """
+        计算详情页依赖的配置指纹
+
+        :return str: 配置指纹
+        """
+        parts = [
+            str(self._enabled),
+            self._preview_title,
+            self._preview_bangumi_id,
+            self._preview_hanime_id,
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    def _store_page(self, preview: Optional[Dict[str, Any]], last_error: Optional[str]) -> List[dict]:
+        """
+        渲染详情页并与配置指纹一起保存，保存的页面不含 apikey，返回时再补充
+
+        :param preview (Dict): 预览结果
+        :param last_error (str): 最近一次刷新错误
+
+        :return List: 详情页组件配置
+        """
+        fingerprint = self._page_fingerprint()
+        page = self._render_page(preview, last_error)
+        self.save_data("last_page", {"fingerprint": fingerprint, "page": page})
+        served = self._with_api_token(page)
+        self._page_tree = (fingerprint, str(settings.API_TOKEN), served)
+        return served
+
+    @classmethod
+    def _with_api_token(cls, node: Any) -> Any:
+        """
+        复制详情页组件配置，为本插件接口请求补充 apikey
+
+        :param node (Any): 组件配置
+
+        :return Any: 带 apikey 的组件配置
+        """
+        if isinstance(node, list):
+            return [cls._with_api_token(item) for item in node]
+        if not isinstance(node, dict):
+            return node
+        result = {key: cls._with_api_token(value) for key, value in node.items()}
+        api = result.get("api")
+        if isinstance(api, str) and api.startswith("plugin/HuanLeHuiju/") and "apikey=" not in api:
+            result["api"] = f"{api}{'&' if '?' in api else '?'}apikey={settings.API_TOKEN}"
+        return result
+
+    def _save_preview(self, payload: Dict[str, Any]) -> None:
+        """
+        保存预览结果，清除错误并重新渲染详情页
+
+        :param payload (Dict): 预览结果
+        """
+        self.save_data("last_preview", payload)
+        self.del_data("last_error")
+        self._store_page(payload, None)
+
+    def _render_page(self, preview: Optional[Dict[str, Any]], last_error: Optional[str]) -> List[dict]:
+        """
+        渲染详情页组件
+
+        :param preview (Dict): 预览结果
+        :param last_error (str): 最近一次刷新错误
 
         :return List: 详情页组件配置
         """
-        preview = self.get_data("last_preview") or {}
-        last_error = self.get_data("last_error")
+        preview = preview or {}
         query = (preview.get("query") or {}) if isinstance(preview, dict) else {}
         metadata = (preview.get("metadata") or {}) if isinstance(preview, dict) else {}
         ids = metadata.get("ids") or {}
@@ -489,7 +805,7 @@ class HuanLeHuiju(_PluginBase):
                                 "text": "刷新预览",
                                 "events": {
                                     "click": {
-                                        "api": f"plugin/HuanLeHuiju/refresh_preview?apikey={settings.API_TOKEN}",
+                                        "api": "plugin/HuanLeHuiju/refresh_preview",
                                         "method": "get",
                                     }
                                 },
@@ -560,6 +876,10 @@ class HuanLeHuiju(_PluginBase):
                         "component": "div",
                         "text": f"来源数量：{preview.get('source_count') or 0}",
                     },
+                    {
+                        "component": "div",
+                        "text": f"超时来源：{', '.join(preview.get('timeouts') or []) or '无'}",
+                    },
                     {
                         "component": "div",
                         "text": f"首播日期：{metadata.get('date') or '未知'}",
@@ -617,23 +937,17 @@ class HuanLeHuiju(_PluginBase):
 
     def stop_service(self) -> None:
         """
-        停止插件
-        """
-        return
-
-    def _headers(self) -> Dict[str, str]:
-        """
-        生成请求头
-
-        :return Dict: 请求头
+        停止插件，保存标题索引、关闭条目镜像并注销共享 Bangumi 客户端
         """
-        headers = {
-            "Accept": "application/json",
-            "User-Agent": settings.NORMAL_USER_AGENT,
-        }
-        if self._authorization:
-            headers["Authorization"] = self._authorization
-        return headers
+        if self._title_index is not None:
+            self._title_index.save(force=True)
+        with self._source_executor_lock:
+            executor, self._source_executor = self._source_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self._close_subject_store()
+        self._close_subject_archive()
+        get_client().release(self.__class__.__name__)
 
     def _build_hanime_headers(self) -> Dict[str, str]:
         """
@@ -658,16 +972,7 @@ class HuanLeHuiju(_PluginBase):
             return None
         return settings.PROXY if getattr(settings, "PROXY", None) else None
 
-    @classmethod
-    def _strip_hanime_html(cls, text: str) -> str:
-        """
-        清理 Hanime HTML 文本
-
-        :param text (str): 原始 HTML 文本
-
-        :return str: 清理后的纯文本
-        """
-        return re.sub(r"\s+", " ", unescape(cls._hanime_strip_tag_pattern.sub("", text))).strip()
+    _strip_hanime_html = staticmethod(strip_html)
 
     @staticmethod
     def _extract_hanime_watch_id(value: Optional[str]) -> str:
@@ -745,139 +1050,394 @@ class HuanLeHuiju(_PluginBase):
                     return watch_id
         return ""
 
-    @cached(region="huanlehuiju_hanime_watch", ttl=86400, skip_none=True)
-    def _request_hanime_watch(self, watch_id: str) -> Optional[str]:
+    def _hanime_watch_store(self) -> TTLCache:
         """
-        请求 Hanime watch 详情页
+        获取 Hanime watch 页缓存，条目同时保存响应的校验头
 
-        :param watch_id (str): watch ID
+        :return TTLCache: watch 页缓存
+        """
+        if self._hanime_watch_cache is None:
+            self._hanime_watch_cache = TTLCache(
+                region="huanlehuiju_hanime_watch",
+                maxsize=512,
+                ttl=self.HANIME_VALIDATOR_TTL,
+            )
+        return self._hanime_watch_cache
 
-        :return str: HTML
+    def _hanime_parsed_store(self) -> TTLCache:
         """
-        request_url = f"{self.HANIME_BASE_URL}/watch?v={watch_id}"
-        response = RequestUtils(
-            headers=self._build_hanime_headers(),
-            proxies=self._build_hanime_proxies(),
-        ).get_res(request_url)
-        status_code = getattr(response, "status_code", None) if response is not None else None
-        ok = getattr(response, "ok", None)
-        if response is None or (ok is False) or (ok is None and status_code not in {200, 201}):
-            return None
-        return response.text
+        获取 Hanime watch 解析结果缓存，页面内容更新时失效
 
-    @cached(region="huanlehuiju_hanime_search", ttl=1800, skip_none=True)
-    def _request_hanime_search(self, query: str) -> Optional[str]:
+        :return TTLCache: 解析结果缓存
         """
-        请求 Hanime 搜索页
+        if self._hanime_parsed_cache is None:
+            self._hanime_parsed_cache = TTLCache(
+                region="huanlehuiju_hanime_watch_parsed",
+                maxsize=1024,
+                ttl=self.HANIME_WATCH_TTL,
+            )
+        return self._hanime_parsed_cache
 
-        :param query (str): 搜索关键词
+    def _encode_cache_body(self, text: Optional[str]) -> Union[str, bytes, None]:
+        """
+        按配置压缩待缓存的页面源码，小于阈值的内容保持原样
 
-        :return str: 搜索页 HTML
+        :param text (str): 页面源码
+
+        :return Union[str, bytes]: 原文或带编码标记的压缩数据
         """
-        clean_query = str(query or "").strip()
-        if not clean_query:
-            return None
-        request_url = f"{self.HANIME_BASE_URL}/search?query={quote(clean_query)}"
-        response = RequestUtils(
-            headers=self._build_hanime_headers(),
-            proxies=self._build_hanime_proxies(),
-        ).get_res(request_url)
-        status_code = getattr(response, "status_code", None) if response is not None else None
-        ok = getattr(response, "ok", None)
-        if response is None or (ok is False) or (ok is None and status_code not in {200, 201}):
-            return None
-        return response.text
+        return encode_cache_body(text, self._compress_cache, self._cache_stats)
 
-    def _parse_hanime_search(self, query: str, html: str) -> List[Dict[str, Any]]:
+    def _decode_cache_body(self, value: Union[str, bytes, None]) -> Optional[str]:
         """
-        解析 Hanime 搜索结果
+        还原缓存中的页面源码，兼容未压缩的历史条目
 
-        :param query (str): 搜索关键词
-        :param html (str): HTML
+        :param value (Union[str, bytes]): 缓存值
 
-        :return List: 条目列表
+        :return str: 页面源码
         """
-        if not html:
-            return []
-        items: List[Dict[str, Any]] = []
-        for match in self._hanime_search_item_pattern.finditer(html):
-            body = match.group("body") or ""
-            watch_id = match.group("id") or match.group("id2") or ""
-            watch_id = str(watch_id).strip()
-            if not watch_id:
-                continue
+        return decode_cache_body(value, self._cache_stats)
 
-            title_match = self._hanime_search_title_pattern.search(body)
-            title = (
-                self._strip_hanime_html(title_match.group("title"))
-                if title_match
-                else ""
-            )
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        获取页面缓存编解码计数
 
-            thumb_match = self._hanime_search_thumb_pattern.search(body)
-            poster = thumb_match.group("src") if thumb_match else ""
+        :return Dict: 写入与读取次数、压缩前后字节数及压缩比
+        """
+        return self._cache_stats.snapshot() if self._cache_stats else {}
+
+    _build_conditional_headers = staticmethod(build_conditional_headers)
+
+    def _hanime_search_store(self) -> TTLCache:
+        """
+        获取 Hanime 搜索页缓存，同步与异步请求共用
 
-            duration_match = self._hanime_search_duration_pattern.search(body)
-            duration = (
-                self._strip_hanime_html(duration_match.group("duration"))
-                if duration_match
-                else ""
+        :return TTLCache: 搜索页缓存
+        """
+        if self._hanime_search_cache is None:
+            self._hanime_search_cache = TTLCache(
+                region="huanlehuiju_hanime_search",
+                maxsize=256,
+                ttl=self.HANIME_SEARCH_TTL,
             )
+        return self._hanime_search_cache
 
-            like_match = self._hanime_search_like_pattern.search(body)
-            like = like_match.group("like") if like_match else ""
+    @staticmethod
+    def _response_ok(response: Any) -> bool:
+        """
+        判断响应是否成功
 
-            views = ""
-            view_matches = list(self._hanime_search_views_pattern.finditer(body))
-            if view_matches:
-                views = view_matches[-1].group("views")
+        :param response: 响应对象
 
-            items.append(
-                {
-                    "id": watch_id,
-                    "url": f"{self.HANIME_BASE_URL}/watch?v={watch_id}",
-                    "title": title,
-                    "poster": poster,
-                    "duration": duration,
-                    "like": like,
-                    "views": views,
-                    "query": query,
-                }
-            )
-        return items
+        :return bool: 是否成功
+        """
+        if response is None:
+            return False
+        status_code = getattr(response, "status_code", None)
+        ok = getattr(response, "ok", None)
+        return not (ok is False or (ok is None and status_code not in {200, 201}))
 
-    def _hanime_search_to_mediainfo(self, item: Dict[str, Any]) -> Optional[MediaInfo]:
+    def _cached_hanime_watch(self, watch_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """
-        将 Hanime 搜索条目转换为 MediaInfo
+        读取 Hanime watch 页缓存，未过期时同时恢复条目中保存的解析结果
 
-        :param item (Dict): 搜索条目
+        :param watch_id (str): watch ID
 
-        :return MediaInfo: 媒体信息
+        :return Tuple: 缓存条目与未过期时的页面源码
         """
+        store = self._hanime_watch_store()
         try:
-            info = MediaInfo(bangumi_info={})
-        except Exception:
-            return None
-        media_id = str(item.get("id") or "").strip()
-        title = str(item.get("title") or "").strip()
-        poster = str(item.get("poster") or "").strip()
-        like = str(item.get("like") or "").strip()
-        views = str(item.get("views") or "").strip()
-        duration = str(item.get("duration") or "").strip()
+            entry = store[watch_id] if watch_id in store else None
+        except KeyError:
+            entry = None
+        if entry and time.time() - float(entry.get("checked_at") or 0) < self.HANIME_WATCH_TTL:
+            self._restore_hanime_parsed(watch_id, entry)
+            return entry, self._decode_cache_body(entry["body"])
+        return entry, None
 
-        overview_parts: List[str] = []
-        if like:
-            overview_parts.append(f"好评 {like}")
-        if views:
-            overview_parts.append(f"播放 {views}")
-        if duration:
-            overview_parts.append(f"时长 {duration}")
-        overview = " / ".join(overview_parts)
+    def _restore_hanime_parsed(self, watch_id: str, entry: Dict[str, Any]) -> None:
+        """
+        将 watch 页缓存条目中保存的解析结果写回解析缓存
 
-        if media_id:
-            setattr(info, "mediaid_prefix", "hanime")
-            setattr(info, "media_id", media_id)
-        if title:
+        :param watch_id (str): watch ID
+        :param entry (Dict): watch 页缓存条目
+        """
+        if entry.get("parsed"):
+            self._hanime_parsed_store()[watch_id] = entry["parsed"]
+
+    def _store_hanime_watch(
+        self, watch_id: str, entry: Optional[Dict[str, Any]], response: Any
+    ) -> Optional[str]:
+        """
+        处理 Hanime watch 页响应并写入缓存，命中 304 时仅刷新缓存时间并恢复解析结果
+
+        :param watch_id (str): watch ID
+        :param entry (Dict): 原缓存条目
+        :param response: 响应对象
+
+        :return str: HTML
+        """
+        store = self._hanime_watch_store()
+        now = time.time()
+        status_code = getattr(response, "status_code", None) if response is not None else None
+        if entry and status_code == 304:
+            entry["checked_at"] = now
+            store[watch_id] = entry
+            self._restore_hanime_parsed(watch_id, entry)
+            return self._decode_cache_body(entry["body"])
+        if not self._response_ok(response):
+            return None
+        response_headers = getattr(response, "headers", None) or {}
+        try:
+            del self._hanime_parsed_store()[watch_id]
+        except KeyError:
+            pass
+        store[watch_id] = {
+            "body": self._encode_cache_body(response.text),
+            "etag": response_headers.get("ETag") or "",
+            "last_modified": response_headers.get("Last-Modified") or "",
+            "checked_at": now,
+        }
+        return response.text
+
+    def _hanime_watch_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        生成 Hanime watch 页请求头，缓存过期时附带条件请求头
+
+        :param entry (Dict): 缓存条目
+
+        :return Dict: 请求头
+        """
+        headers = self._build_hanime_headers()
+        headers.update(self._build_conditional_headers(entry))
+        return headers
+
+    def _request_hanime_watch(self, watch_id: str) -> Optional[str]:
+        """
+        请求 Hanime watch 详情页
+
+        缓存过期后携带 ETag/Last-Modified 发起条件请求，命中 304 时仅刷新缓存时间
+
+        :param watch_id (str): watch ID
+
+        :return str: HTML
+        """
+        entry, html = self._cached_hanime_watch(watch_id)
+        if html is not None:
+            return html
+        response = RequestUtils(
+            headers=self._hanime_watch_headers(entry),
+            proxies=self._build_hanime_proxies(),
+        ).get_res(f"{self.HANIME_BASE_URL}/watch?v={watch_id}")
+        return self._store_hanime_watch(watch_id, entry, response)
+
+    async def _async_request_hanime_watch(self, watch_id: str) -> Optional[str]:
+        """
+        异步请求 Hanime watch 详情页，与同步版本共用缓存
+
+        :param watch_id (str): watch ID
+
+        :return str: HTML
+        """
+        entry, html = self._cached_hanime_watch(watch_id)
+        if html is not None:
+            return html
+        response = await AsyncRequestUtils(
+            headers=self._hanime_watch_headers(entry),
+            proxies=self._build_hanime_proxies(),
+        ).get_res(f"{self.HANIME_BASE_URL}/watch?v={watch_id}")
+        return self._store_hanime_watch(watch_id, entry, response)
+
+    def _cached_hanime_parsed(self, watch_id: str) -> Optional[Dict[str, Any]]:
+        """
+        读取 Hanime watch 解析结果缓存
+
+        :param watch_id (str): watch ID
+
+        :return Dict: 解析结果
+        """
+        store = self._hanime_parsed_store()
+        try:
+            values = store[watch_id] if watch_id in store else None
+        except KeyError:
+            values = None
+        if not values or len(values) != len(self.HANIME_WATCH_FIELDS):
+            return None
+        watch = dict(zip(self.HANIME_WATCH_FIELDS, values))
+        watch["tags"] = list(watch["tags"] or [])
+        return watch
+
+    def _store_hanime_parsed(self, watch_id: str, html: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        解析 Hanime watch 页并按字段顺序紧凑写入解析缓存与 watch 页缓存条目，
+        请求时命中 304 或未过期缓存已恢复解析结果的，直接返回不再解析
+
+        :param watch_id (str): watch ID
+        :param html (str): HTML 内容
+
+        :return Dict: 解析结果
+        """
+        watch = self._cached_hanime_parsed(watch_id) if html else None
+        if watch is not None:
+            return watch
+        watch = self._parse_hanime_watch(watch_id, html) if html else None
+        if watch:
+            compact = tuple(
+                tuple(watch[field]) if field == "tags" else watch[field]
+                for field in self.HANIME_WATCH_FIELDS
+            )
+            self._hanime_parsed_store()[watch_id] = compact
+            store = self._hanime_watch_store()
+            try:
+                entry = store[watch_id] if watch_id in store else None
+            except KeyError:
+                entry = None
+            if entry:
+                entry["parsed"] = compact
+                store[watch_id] = entry
+        return watch
+
+    def _hanime_watch(self, watch_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取 Hanime watch 解析结果，命中解析缓存时不再请求与解析页面
+
+        :param watch_id (str): watch ID
+
+        :return Dict: 解析结果
+        """
+        if not watch_id:
+            return None
+        watch = self._cached_hanime_parsed(watch_id)
+        if watch is not None:
+            return watch
+        return self._store_hanime_parsed(watch_id, self._request_hanime_watch(watch_id))
+
+    async def _async_hanime_watch(self, watch_id: str) -> Optional[Dict[str, Any]]:
+        """
+        异步获取 Hanime watch 解析结果，与同步版本共用缓存
+
+        :param watch_id (str): watch ID
+
+        :return Dict: 解析结果
+        """
+        if not watch_id:
+            return None
+        watch = self._cached_hanime_parsed(watch_id)
+        if watch is not None:
+            return watch
+        return self._store_hanime_parsed(watch_id, await self._async_request_hanime_watch(watch_id))
+
+    def _cached_hanime_search(self, query: str) -> Optional[str]:
+        """
+        读取 Hanime 搜索页缓存
+
+        :param query (str): 搜索关键词
+
+        :return str: 搜索页 HTML
+        """
+        store = self._hanime_search_store()
+        try:
+            return self._decode_cache_body(store[query]) if query in store else None
+        except KeyError:
+            return None
+
+    def _store_hanime_search(self, query: str, response: Any) -> Optional[str]:
+        """
+        处理 Hanime 搜索页响应并写入缓存
+
+        :param query (str): 搜索关键词
+        :param response: 响应对象
+
+        :return str: 搜索页 HTML
+        """
+        if not self._response_ok(response):
+            return None
+        self._hanime_search_store()[query] = self._encode_cache_body(response.text)
+        return response.text
+
+    def _request_hanime_search(self, query: str) -> Optional[str]:
+        """
+        请求 Hanime 搜索页
+
+        :param query (str): 搜索关键词
+
+        :return str: 搜索页 HTML
+        """
+        clean_query = str(query or "").strip()
+        if not clean_query:
+            return None
+        html = self._cached_hanime_search(clean_query)
+        if html is not None:
+            return html
+        response = RequestUtils(
+            headers=self._build_hanime_headers(),
+            proxies=self._build_hanime_proxies(),
+        ).get_res(f"{self.HANIME_BASE_URL}/search?query={quote(clean_query)}")
+        return self._store_hanime_search(clean_query, response)
+
+    async def _async_request_hanime_search(self, query: str) -> Optional[str]:
+        """
+        异步请求 Hanime 搜索页，与同步版本共用缓存
+
+        :param query (str): 搜索关键词
+
+        :return str: 搜索页 HTML
+        """
+        clean_query = str(query or "").strip()
+        if not clean_query:
+            return None
+        html = self._cached_hanime_search(clean_query)
+        if html is not None:
+            return html
+        response = await AsyncRequestUtils(
+            headers=self._build_hanime_headers(),
+            proxies=self._build_hanime_proxies(),
+        ).get_res(f"{self.HANIME_BASE_URL}/search?query={quote(clean_query)}")
+        return self._store_hanime_search(clean_query, response)
+
+    def _parse_hanime_search(self, query: str, html: str) -> List[Dict[str, Any]]:
+        """
+        解析 Hanime 搜索结果
+
+        :param query (str): 搜索关键词
+        :param html (str): HTML
+
+        :return List: 条目列表
+        """
+        return parse_search_cards(html, query, self.HANIME_BASE_URL)
+
+    def _hanime_search_to_mediainfo(self, item: Dict[str, Any]) -> Optional[MediaInfo]:
+        """
+        将 Hanime 搜索条目转换为 MediaInfo
+
+        :param item (Dict): 搜索条目
+
+        :return MediaInfo: 媒体信息
+        """
+        try:
+            info = MediaInfo(bangumi_info={})
+        except Exception:
+            return None
+        media_id = str(item.get("id") or "").strip()
+        title = str(item.get("title") or "").strip()
+        poster = str(item.get("poster") or "").strip()
+        like = str(item.get("like") or "").strip()
+        views = str(item.get("views") or "").strip()
+        duration = str(item.get("duration") or "").strip()
+
+        overview_parts: List[str] = []
+        if like:
+            overview_parts.append(f"好评 {like}")
+        if views:
+            overview_parts.append(f"播放 {views}")
+        if duration:
+            overview_parts.append(f"时长 {duration}")
+        overview = " / ".join(overview_parts)
+
+        if media_id:
+            setattr(info, "mediaid_prefix", "hanime")
+            setattr(info, "media_id", media_id)
+        if title:
             setattr(info, "title", title)
             setattr(info, "original_title", title)
         if poster:
@@ -1029,206 +1589,470 @@ class HuanLeHuiju(_PluginBase):
         }
 
     @staticmethod
-    def _season_text(season: Optional[int]) -> Optional[str]:
+    def _normalize_text(text: Optional[str]) -> str:
         """
-        获取季文本
+        规范化文本
 
-        :param season (int): 季号
+        :param text (str): 原始文本
 
-        :return str: 季文本
+        :return str: 规范化后的文本
         """
-        if not season:
-            return None
-        try:
-            season_int = int(season)
-        except Exception:
+        if not text:
+            return ""
+        lowered = str(text).strip().lower()
+        return "".join(char for char in lowered if char.isalnum())
+
+    @staticmethod
+    def _bangumi_client() -> BangumiClient:
+        """
+        获取 Bangumi 客户端，连接池、缓存、请求去重与并发限制按主机登记在进程内，与 BangumiAuthorization 共用
+
+        :return BangumiClient: 客户端
+        """
+        return get_client()
+
+    def _bangumi_cache_ttl(self) -> int:
+        """
+        获取 Bangumi 缓存时间，关闭缓存时不读取已有缓存
+
+        :return int: 缓存时间（秒）
+        """
+        return self.BANGUMI_CACHE_TTL if self._use_cache else 0
+
+    def _search_subjects(self, title: str) -> List[dict]:
+        """
+        搜索 Bangumi 条目，在线搜索无结果时回退到离线归档；开启优先离线归档时先查归档，命中后不再在线搜索
+
+        :param title (str): 标题
+
+        :return List: 搜索结果
+        """
+        items = self._archive_search(title) if self._prefer_archive else []
+        if not items:
+            items = self._bangumi_client().search(
+                title, authorization=self._authorization, ttl=self._bangumi_cache_ttl()
+            )
+        if not items and not self._prefer_archive:
+            items = self._archive_search(title)
+        self._remember_subjects(items)
+        return items
+
+    async def _async_search_subjects(self, title: str) -> List[dict]:
+        """
+        异步搜索 Bangumi 条目，在线搜索无结果时回退到离线归档；开启优先离线归档时先查归档，命中后不再在线搜索
+
+        :param title (str): 标题
+
+        :return List: 搜索结果
+        """
+        items = await asyncio.to_thread(self._archive_search, title) if self._prefer_archive else []
+        if not items:
+            items = await self._bangumi_client().async_search(
+                title, authorization=self._authorization, ttl=self._bangumi_cache_ttl()
+            )
+        if not items and not self._prefer_archive:
+            items = await asyncio.to_thread(self._archive_search, title)
+        await asyncio.to_thread(self._remember_subjects, items)
+        return items
+
+    def _fetch_subject_detail(self, bangumi_id: str) -> Optional[dict]:
+        """
+        获取 Bangumi 条目详情
+
+        :param bangumi_id (str): Bangumi ID
+
+        :return dict: 条目详情
+        """
+        local = self._local_subjects([bangumi_id]).get(str(bangumi_id))
+        if local:
+            return local
+        subject = self._bangumi_client().subject(
+            bangumi_id, authorization=self._authorization, ttl=self._bangumi_cache_ttl()
+        )
+        if subject:
+            self._remember_subjects([subject])
+            self._mirror_subjects([subject])
+            return subject
+        if self._prefer_archive:
             return None
-        if season_int <= 0:
+        return self._archive_subjects([bangumi_id]).get(str(bangumi_id))
+
+    async def _async_fetch_subject_detail(self, bangumi_id: str) -> Optional[dict]:
+        """
+        异步获取 Bangumi 条目详情
+
+        :param bangumi_id (str): Bangumi ID
+
+        :return dict: 条目详情
+        """
+        local = (await asyncio.to_thread(self._local_subjects, [bangumi_id])).get(str(bangumi_id))
+        if local:
+            return local
+        subject = await self._bangumi_client().async_subject(
+            bangumi_id, authorization=self._authorization, ttl=self._bangumi_cache_ttl()
+        )
+        if subject:
+            await asyncio.to_thread(self._remember_subjects, [subject])
+            await asyncio.to_thread(self._mirror_subjects, [subject])
+            return subject
+        if self._prefer_archive:
             return None
-        return f"第{season_int}季"
+        return (await asyncio.to_thread(self._archive_subjects, [bangumi_id])).get(str(bangumi_id))
 
-    def _apply_season(
-        self, medias: Optional[List[MediaInfo]], begin_season: Optional[int]
-    ) -> None:
+    def _fetch_subject_details(self, bangumi_ids: List[str]) -> List[Optional[dict]]:
         """
-        为结果补充季信息
+        批量获取 Bangumi 条目详情
 
-        :param medias (List): 媒体列表
-        :param begin_season (int): 开始季号
+        :param bangumi_ids (List): Bangumi ID 列表
+
+        :return List: 与 bangumi_ids 顺序一致的条目详情
         """
-        if not medias or not begin_season:
-            return
-        season_text = self._season_text(begin_season)
-        for media in medias:
-            try:
-                media.season = begin_season
-                media_type = getattr(getattr(media, "type", None), "value", None)
-                if media_type == "电视剧" and season_text and getattr(media, "title", None):
-                    if season_text not in media.title:
-                        media.title = f"{media.title} {season_text}"
-            except Exception:
-                continue
+        mirrored = self._local_subjects(bangumi_ids)
+        missing = [bangumi_id for bangumi_id in bangumi_ids if str(bangumi_id) not in mirrored]
+        subjects = self._bangumi_client().load_subjects(
+            missing, authorization=self._authorization, ttl=self._bangumi_cache_ttl()
+        ) if missing else []
+        self._remember_subjects(subjects)
+        self._mirror_subjects(subjects)
+        results = self._merge_mirrored(bangumi_ids, mirrored, missing, subjects)
+        unresolved = [bangumi_id for bangumi_id, subject in zip(bangumi_ids, results) if not subject]
+        if not unresolved or self._prefer_archive:
+            return results
+        return self._merge_archived(bangumi_ids, results, self._archive_subjects(unresolved))
+
+    async def _async_fetch_subject_details(self, bangumi_ids: List[str]) -> List[Optional[dict]]:
+        """
+        异步批量获取 Bangumi 条目详情
+
+        :param bangumi_ids (List): Bangumi ID 列表
+
+        :return List: 与 bangumi_ids 顺序一致的条目详情
+        """
+        mirrored = await asyncio.to_thread(self._local_subjects, bangumi_ids)
+        missing = [bangumi_id for bangumi_id in bangumi_ids if str(bangumi_id) not in mirrored]
+        subjects = await self._bangumi_client().async_load_subjects(
+            missing, authorization=self._authorization, ttl=self._bangumi_cache_ttl()
+        ) if missing else []
+        await asyncio.to_thread(self._remember_subjects, subjects)
+        await asyncio.to_thread(self._mirror_subjects, subjects)
+        results = self._merge_mirrored(bangumi_ids, mirrored, missing, subjects)
+        unresolved = [bangumi_id for bangumi_id, subject in zip(bangumi_ids, results) if not subject]
+        if not unresolved or self._prefer_archive:
+            return results
+        archived = await asyncio.to_thread(self._archive_subjects, unresolved)
+        return self._merge_archived(bangumi_ids, results, archived)
 
     @staticmethod
-    def _normalize_text(text: Optional[str]) -> str:
+    def _merge_mirrored(
+        bangumi_ids: List[str],
+        mirrored: Dict[str, dict],
+        missing: List[str],
+        subjects: List[Optional[dict]],
+    ) -> List[Optional[dict]]:
         """
-        规范化文本
+        按请求顺序合并本地命中与在线获取的条目详情
 
-        :param text (str): 原始文本
+        :param bangumi_ids (List): 请求的 Bangumi ID
+        :param mirrored (Dict): 本地命中的条目
+        :param missing (List): 在线获取的 Bangumi ID
+        :param subjects (List): 与 missing 顺序一致的在线结果
 
-        :return str: 规范化后的文本
+        :return List: 与 bangumi_ids 顺序一致的条目详情
         """
-        if not text:
-            return ""
-        lowered = str(text).strip().lower()
-        return "".join(char for char in lowered if char.isalnum())
+        fetched = dict(zip(missing, subjects))
+        return [mirrored.get(str(bangumi_id)) or fetched.get(bangumi_id) for bangumi_id in bangumi_ids]
 
-    def _request_json(self, url: str) -> Optional[dict]:
+    @staticmethod
+    def _merge_archived(
+        bangumi_ids: List[str], results: List[Optional[dict]], archived: Dict[str, dict]
+    ) -> List[Optional[dict]]:
         """
-        请求 JSON 数据
+        用离线归档补全在线未取到的条目详情
 
-        :param url (str): 请求地址
+        :param bangumi_ids (List): 请求的 Bangumi ID
+        :param results (List): 与 bangumi_ids 顺序一致的镜像与在线结果
+        :param archived (Dict): 离线归档命中的条目
 
-        :return dict: JSON 数据
+        :return List: 与 bangumi_ids 顺序一致的条目详情
         """
-        response = RequestUtils(
-            ua=settings.NORMAL_USER_AGENT,
-            headers=self._headers(),
-        ).get_res(url)
-        status_code = getattr(response, "status_code", None) if response is not None else None
-        ok = getattr(response, "ok", None)
-        if response is None or (ok is False) or (ok is None and status_code not in {200, 201}):
-            return None
-        try:
-            payload = response.json()
-        except Exception:
-            return None
-        if not isinstance(payload, dict):
-            return None
-        return payload
+        return [subject or archived.get(str(bangumi_id)) for bangumi_id, subject in zip(bangumi_ids, results)]
 
-    async def _async_request_json(self, url: str) -> Optional[dict]:
+    def _local_subjects(self, bangumi_ids: List[str]) -> Dict[str, dict]:
         """
-        异步请求 JSON 数据
+        读取本地条目详情：先读条目镜像，开启优先离线归档时再从归档补全
 
-        :param url (str): 请求地址
+        :param bangumi_ids (List): Bangumi ID 列表
 
-        :return dict: JSON 数据
+        :return Dict: Bangumi ID 到条目详情的映射，仅包含命中的条目
         """
-        response = await AsyncRequestUtils(
-            ua=settings.NORMAL_USER_AGENT,
-            headers=self._headers(),
-        ).get_res(url)
-        status_code = getattr(response, "status_code", None) if response is not None else None
-        ok = getattr(response, "ok", None)
-        if response is None or (ok is False) or (ok is None and status_code not in {200, 201}):
-            return None
-        try:
-            payload = response.json()
-        except Exception:
-            return None
-        if not isinstance(payload, dict):
-            return None
-        return payload
+        found = self._mirrored_subjects(bangumi_ids)
+        if self._prefer_archive:
+            rest = [bangumi_id for bangumi_id in bangumi_ids if str(bangumi_id) not in found]
+            if rest:
+                found.update(self._archive_subjects(rest))
+        return found
 
-    @cached(region="huanlehuiju_bangumi_search", ttl=1800, skip_none=True)
-    def _cached_search(self, title: str) -> List[dict]:
+    def _mirrored_subjects(self, bangumi_ids: List[str]) -> Dict[str, dict]:
         """
-        使用缓存搜索 Bangumi
+        从本地条目镜像读取条目详情
 
-        :param title (str): 搜索标题
+        :param bangumi_ids (List): Bangumi ID 列表
 
-        :return List: 搜索结果
+        :return Dict: Bangumi ID 到条目详情的映射，仅包含命中的条目
         """
-        return self._search_subjects(title)
+        if self._subject_store is None:
+            return {}
+        try:
+            return self._subject_store.get_many(bangumi_ids)
+        except Exception as err:
+            logger.warning("欢乐汇聚读取本地条目镜像失败: %s", err)
+            return {}
 
-    @cached(region="huanlehuiju_bangumi_subject", ttl=1800, skip_none=True)
-    def _cached_subject(self, bangumi_id: str) -> Optional[dict]:
+    def _archive_subjects(self, bangumi_ids: List[str]) -> Dict[str, dict]:
         """
-        使用缓存获取 Bangumi 条目
+        从离线归档读取条目详情，默认在镜像与在线查询均未命中时使用，开启优先离线归档时先于在线查询，关闭缓存时不读取
 
-        :param bangumi_id (str): Bangumi ID
+        :param bangumi_ids (List): Bangumi ID 列表
 
-        :return dict: 条目详情
+        :return Dict: Bangumi ID 到条目详情的映射，仅包含命中的条目
         """
-        return self._fetch_subject_detail(bangumi_id)
+        if self._subject_archive is None or not self._use_cache:
+            return {}
+        found: Dict[str, dict] = {}
+        try:
+            for bangumi_id in bangumi_ids:
+                subject = self._subject_archive.get(bangumi_id)
+                if subject:
+                    found[str(bangumi_id)] = subject
+        except Exception as err:
+            logger.warning("欢乐汇聚读取离线归档失败: %s", err)
+        return found
 
-    def _search_subjects(self, title: str) -> List[dict]:
+    def _archive_search(self, title: str) -> List[dict]:
         """
-        搜索 Bangumi 条目
+        在离线归档中搜索条目，默认在在线搜索无结果时使用，开启优先离线归档时先于在线搜索，关闭缓存时不读取
 
         :param title (str): 标题
 
-        :return List: 搜索结果
+        :return List: 搜索结果，未导入归档或未命中时为空
         """
-        encoded_title = quote(title)
-        data = self._request_json(f"https://api.bgm.tv/search/subject/{encoded_title}")
-        items = (data or {}).get("list") or []
-        if not isinstance(items, list):
+        if self._subject_archive is None or not self._use_cache:
+            return []
+        try:
+            return self._subject_archive.search(title)
+        except Exception as err:
+            logger.warning("欢乐汇聚离线归档搜索失败: %s", err)
             return []
-        return [item for item in items if isinstance(item, dict)]
 
-    async def _async_search_subjects(self, title: str) -> List[dict]:
+    def _archive_db_path(self) -> Path:
         """
-        异步搜索 Bangumi 条目
+        获取离线归档数据库路径
 
-        :param title (str): 标题
+        :return Path: 数据库路径
+        """
+        return self.get_data_path() / "bangumi_archive.db"
 
-        :return List: 搜索结果
+    def _close_subject_archive(self) -> None:
         """
-        encoded_title = quote(title)
-        data = await self._async_request_json(
-            f"https://api.bgm.tv/search/subject/{encoded_title}"
-        )
-        items = (data or {}).get("list") or []
-        if not isinstance(items, list):
-            return []
-        return [item for item in items if isinstance(item, dict)]
+        关闭离线归档
+        """
+        if self._subject_archive is not None:
+            self._subject_archive.close()
+            self._subject_archive = None
 
-    def _fetch_subject_detail(self, bangumi_id: str) -> Optional[dict]:
+    def _archive_dump_path(self, path: Optional[str]) -> Optional[Path]:
         """
-        获取 Bangumi 条目详情
+        解析离线归档文件路径，只允许插件数据目录内的文件
 
-        :param bangumi_id (str): Bangumi ID
+        :param path (str): 文件名或路径，相对路径按插件数据目录解析
 
-        :return dict: 条目详情
+        :return Path: 归档文件路径，不存在或位于数据目录之外时返回 None
         """
-        return self._request_json(f"https://api.bgm.tv/v0/subjects/{bangumi_id}")
+        value = str(path or "").strip()
+        if not value:
+            return None
+        base = self.get_data_path().resolve()
+        target = Path(value)
+        target = (target if target.is_absolute() else base / target).resolve()
+        if base not in target.parents or not target.is_file():
+            return None
+        if target in {self._archive_db_path().resolve(), (self.get_data_path() / "bangumi_subjects.db").resolve()}:
+            return None
+        return target
 
-    async def _async_fetch_subject_detail(self, bangumi_id: str) -> Optional[dict]:
+    def import_archive(self, path: str = Body("", embed=True)) -> Dict[str, Any]:
         """
-        异步获取 Bangumi 条目详情
+        导入 Bangumi 离线归档，替换已导入的数据
 
-        :param bangumi_id (str): Bangumi ID
+        :param path (str): 插件数据目录中的归档文件名，为空时使用配置中的路径
 
-        :return dict: 条目详情
+        :return Dict: 导入结果
+        """
+        if not self._enabled:
+            return {"ok": False, "message": "插件未启用"}
+        dump_path = self._archive_dump_path(path or self._archive_path)
+        if dump_path is None:
+            return {"ok": False, "message": "离线归档文件不存在或不在插件数据目录内"}
+        try:
+            if self._subject_archive is None:
+                self._subject_archive = SubjectArchive(self._archive_db_path())
+            imported = self._subject_archive.import_dump(dump_path)
+        except Exception as err:
+            logger.error("欢乐汇聚导入离线归档失败: %s", err, exc_info=True)
+            return {"ok": False, "message": f"导入失败：{err}"}
+        logger.info("欢乐汇聚离线归档导入完成: %s 个条目", imported)
+        return {"ok": True, "message": "导入成功", "data": {"count": imported}}
+
+    def _mirror_subjects(self, subjects: List[Optional[dict]]) -> None:
+        """
+        将在线获取的条目详情写入本地镜像
+
+        :param subjects (List): 条目详情
         """
-        return await self._async_request_json(
-            f"https://api.bgm.tv/v0/subjects/{bangumi_id}"
+        if self._subject_store is None:
+            return
+        try:
+            self._subject_store.put_many(subjects)
+        except Exception as err:
+            logger.warning("欢乐汇聚条目镜像写入失败: %s", err)
+
+    def _close_subject_store(self) -> None:
+        """
+        关闭本地条目镜像
+        """
+        if self._subject_store is not None:
+            self._subject_store.close()
+            self._subject_store = None
+
+    def sync_subject_mirror(self) -> None:
+        """
+        增量刷新本地条目镜像中已到期的条目，内容未变化时仅顺延下次刷新时间
+        """
+        store = self._subject_store
+        if store is None:
+            return
+        try:
+            bangumi_ids = store.due(self.MIRROR_SYNC_BATCH)
+            if not bangumi_ids:
+                return
+            subjects = self._bangumi_client().load_subjects(
+                bangumi_ids, authorization=self._authorization, ttl=0
+            )
+            failed = [bangumi_id for bangumi_id, subject in zip(bangumi_ids, subjects) if not subject]
+            changed = store.put_many(subjects)
+            if failed:
+                store.postpone(failed, self.MIRROR_RETRY_DELAY)
+            total = store.count()
+        except Exception as err:
+            logger.error("欢乐汇聚条目镜像同步失败: %s", err, exc_info=True)
+            return
+        self._remember_subjects(subjects)
+        logger.info(
+            "欢乐汇聚条目镜像同步完成: 检查 %s 个，更新 %s 个，失败 %s 个，共 %s 个",
+            len(bangumi_ids),
+            changed,
+            len(failed),
+            total,
         )
 
-    def _pick_best_subject(self, title: str, items: List[dict]) -> Optional[dict]:
+    def _scrape_candidate_ids(self, meta: MetaBase, medias: List[MediaInfo]) -> List[str]:
+        """
+        选出刮削时需要获取详情的 Bangumi ID
+
+        优先精确匹配时，标题规范化后与查询完全一致的结果直接作为唯一候选，
+        否则按搜索顺序取前 scrape_top_k 个。搜索结果的标题已由 apply_season 追加季文本，
+        比较时使用条目原始的 name/name_cn，并去掉标题末尾的季文本
+
+        :param meta (MetaBase): 媒体元数据
+        :param medias (List): 搜索结果
+
+        :return List: Bangumi ID 列表
+        """
+        candidates = [media for media in medias if getattr(media, "bangumi_id", None)]
+        if self._prefer_exact_match:
+            normalized_query = self._normalize_text(getattr(meta, "name", None))
+            begin_season = getattr(meta, "begin_season", None)
+            for media in candidates:
+                info = getattr(media, "bangumi_info", None)
+                info = info if isinstance(info, dict) else {}
+                names = [
+                    info.get("name"),
+                    info.get("name_cn"),
+                    strip_season_text(getattr(media, "title", None), begin_season),
+                    strip_season_text(getattr(media, "original_title", None), begin_season),
+                ]
+                if normalized_query and any(
+                    self._normalize_text(name) == normalized_query for name in names
+                ):
+                    return [str(media.bangumi_id)]
+        if self._scrape_top_k:
+            candidates = candidates[:self._scrape_top_k]
+        return [str(media.bangumi_id) for media in candidates]
+
+    def _remember_subjects(self, subjects: List[Optional[dict]]) -> None:
+        """
+        将条目名称、中文名与别名记入本地标题索引，可能写盘，异步流程需在线程中调用
+
+        :param subjects (List): 搜索结果或条目详情
+        """
+        if self._title_index is None:
+            return
+        for subject in subjects or []:
+            if isinstance(subject, dict) and subject.get("id"):
+                self._title_index.add(subject.get("id"), self._collect_aliases(subject))
+        self._title_index.save()
+
+    def _lookup_title(self, title: Optional[str]) -> Tuple[Optional[int], bool]:
+        """
+        在本地标题索引中匹配标题
+
+        :param title (str): 查询标题
+
+        :return Tuple: 命中的 Bangumi ID 与是否为规范化后完全一致的命中，
+            模糊命中只能作为搜索结果的参考，不能直接采用
+        """
+        if self._title_index is None or not title:
+            return None, False
+        subject_id = self._title_index.exact(title)
+        exact = bool(subject_id)
+        if not exact:
+            matched = self._title_index.lookup(title)
+            if not matched:
+                return None, False
+            subject_id, score = matched
+            logger.debug("欢乐汇聚标题索引模糊命中: %s -> %s (%.2f)", title, subject_id, score)
+        try:
+            return int(subject_id), exact
+        except (TypeError, ValueError):
+            return None, False
+
+    def _pick_best_subject(
+        self, title: str, items: List[dict], indexed_id: Optional[int] = None
+    ) -> Optional[dict]:
         """
         选择最佳 Bangumi 搜索结果
 
         :param title (str): 查询标题
         :param items (List): 搜索结果
+        :param indexed_id (int): 标题索引模糊命中的 Bangumi ID，仅在出现于搜索结果中时采用
 
         :return dict: 命中的最佳结果
         """
         if not items:
             return None
-        if not self._prefer_exact_match:
-            return items[0]
-
-        normalized_query = self._normalize_text(title)
-        for item in items:
-            names = [
-                item.get("name"),
-                item.get("name_cn"),
-            ]
-            for name in names:
-                if self._normalize_text(name) == normalized_query:
+        if self._prefer_exact_match:
+            normalized_query = self._normalize_text(title)
+            for item in items:
+                names = [
+                    item.get("name"),
+                    item.get("name_cn"),
+                ]
+                for name in names:
+                    if self._normalize_text(name) == normalized_query:
+                        return item
+        if indexed_id:
+            for item in items:
+                if str(item.get("id")) == str(indexed_id):
                     return item
         return items[0]
 
@@ -1436,11 +2260,7 @@ class HuanLeHuiju(_PluginBase):
         clean_bangumi_id = str(bangumi_id or "").strip()
         clean_title = str(title or "").strip()
         if clean_bangumi_id:
-            subject = (
-                self._cached_subject(clean_bangumi_id)
-                if self._use_cache
-                else self._fetch_subject_detail(clean_bangumi_id)
-            )
+            subject = self._fetch_subject_detail(clean_bangumi_id)
             if not subject:
                 return None, f"未找到 Bangumi 条目 {clean_bangumi_id}"
             return subject, None
@@ -1448,11 +2268,7 @@ class HuanLeHuiju(_PluginBase):
         if not clean_title:
             return None, "请先配置预览标题或 Bangumi ID"
 
-        items = (
-            self._cached_search(clean_title)
-            if self._use_cache
-            else self._search_subjects(clean_title)
-        )
+        items = self._search_subjects(clean_title)
         subject_brief = self._pick_best_subject(clean_title, items)
         if not subject_brief:
             return None, f"Bangumi 未搜索到 {clean_title}"
@@ -1461,11 +2277,7 @@ class HuanLeHuiju(_PluginBase):
         if not subject_id:
             return None, "命中条目缺少 Bangumi ID"
 
-        subject = (
-            self._cached_subject(str(subject_id))
-            if self._use_cache
-            else self._fetch_subject_detail(str(subject_id))
-        )
+        subject = self._fetch_subject_detail(str(subject_id))
         if not subject:
             return None, f"无法获取 Bangumi 条目详情 {subject_id}"
         return subject, None
@@ -1486,11 +2298,7 @@ class HuanLeHuiju(_PluginBase):
         clean_bangumi_id = str(bangumi_id or "").strip()
         clean_title = str(title or "").strip()
         if clean_bangumi_id:
-            subject = (
-                self._cached_subject(clean_bangumi_id)
-                if self._use_cache
-                else await self._async_fetch_subject_detail(clean_bangumi_id)
-            )
+            subject = await self._async_fetch_subject_detail(clean_bangumi_id)
             if not subject:
                 return None, f"未找到 Bangumi 条目 {clean_bangumi_id}"
             return subject, None
@@ -1498,11 +2306,7 @@ class HuanLeHuiju(_PluginBase):
         if not clean_title:
             return None, "请先配置预览标题或 Bangumi ID"
 
-        items = (
-            self._cached_search(clean_title)
-            if self._use_cache
-            else await self._async_search_subjects(clean_title)
-        )
+        items = await self._async_search_subjects(clean_title)
         subject_brief = self._pick_best_subject(clean_title, items)
         if not subject_brief:
             return None, f"Bangumi 未搜索到 {clean_title}"
@@ -1511,15 +2315,77 @@ class HuanLeHuiju(_PluginBase):
         if not subject_id:
             return None, "命中条目缺少 Bangumi ID"
 
-        subject = (
-            self._cached_subject(str(subject_id))
-            if self._use_cache
-            else await self._async_fetch_subject_detail(str(subject_id))
-        )
+        subject = await self._async_fetch_subject_detail(str(subject_id))
         if not subject:
             return None, f"无法获取 Bangumi 条目详情 {subject_id}"
         return subject, None
 
+    def _submit_source(self, func: Callable, *args) -> _SourceTask:
+        """
+        在后台线程中查询数据源，线程池在首次查询时创建
+
+        :param func (Callable): 查询函数
+        :param args: 查询参数
+
+        :return _SourceTask: 查询任务
+        """
+        with self._source_executor_lock:
+            if self._source_executor is None:
+                # 批量查询时每个查询同时占用两个数据源线程
+                self._source_executor = ThreadPoolExecutor(
+                    max_workers=2 * self.BATCH_CONCURRENCY, thread_name_prefix="huanlehuiju-source"
+                )
+            task = _SourceTask(func, args)
+            task.future = self._source_executor.submit(task.run)
+        return task
+
+    def _wait_source(self, source: str, task: _SourceTask, timeouts: List[str]) -> Any:
+        """
+        在数据源的超时预算内等待查询结果
+
+        超时预算从任务开始执行时计算；排队超过预算仍未开始的任务直接取消，不再占用线程
+
+        :param source (str): 数据源名称
+        :param task (_SourceTask): _submit_source 返回的查询任务
+        :param timeouts (List): 超时数据源列表，超时时追加 source
+
+        :return Any: 查询结果，超时或失败时返回 None
+        """
+        budget = self.SOURCE_TIMEOUTS[source]
+        future = task.future
+        try:
+            if not task.started.wait(budget) and future.cancel():
+                raise FutureTimeoutError()
+            task.started.wait()
+            remaining = budget - (time.monotonic() - task.started_at)
+            return future.result(timeout=max(remaining, 0))
+        except FutureTimeoutError:
+            future.cancel()
+            timeouts.append(source)
+            logger.warning("欢乐汇聚查询 %s 超时，将返回部分结果", source)
+        except Exception as err:
+            logger.error("欢乐汇聚查询 %s 失败: %s", source, err, exc_info=True)
+        return None
+
+    async def _async_wait_source(self, source: str, coro, timeouts: List[str]) -> Any:
+        """
+        在数据源的超时预算内等待异步查询结果
+
+        :param source (str): 数据源名称
+        :param coro (Coroutine): 查询协程
+        :param timeouts (List): 超时数据源列表，超时时追加 source
+
+        :return Any: 查询结果，超时或失败时返回 None
+        """
+        try:
+            return await asyncio.wait_for(coro, timeout=self.SOURCE_TIMEOUTS[source])
+        except asyncio.TimeoutError:
+            timeouts.append(source)
+            logger.warning("欢乐汇聚查询 %s 超时，将返回部分结果", source)
+        except Exception as err:
+            logger.error("欢乐汇聚查询 %s 失败: %s", source, err, exc_info=True)
+        return None
+
     def _build_preview_payload(
         self,
         title: Optional[str] = None,
@@ -1529,6 +2395,9 @@ class HuanLeHuiju(_PluginBase):
         """
         构造预览结果
 
+        Bangumi 与 Hanime 并发查询，各自受 SOURCE_TIMEOUTS 限制；
+        超时的数据源不参与融合，并记录在结果的 timeouts 中
+
         :param title (str): 查询标题
         :param bangumi_id (str): Bangumi ID
 
@@ -1536,21 +2405,30 @@ class HuanLeHuiju(_PluginBase):
         """
         subject: Optional[dict] = None
         hanime: Optional[Dict[str, Any]] = None
+        error: Optional[str] = None
+        timeouts: List[str] = []
 
         source_count = 0
         bangumi_meta: Optional[Dict[str, Any]] = None
         hanime_meta: Optional[Dict[str, Any]] = None
 
         clean_hanime_id = self._extract_hanime_watch_id(hanime_id)
-        if clean_hanime_id:
-            html = self._request_hanime_watch(clean_hanime_id)
-            if html:
-                hanime = self._parse_hanime_watch(clean_hanime_id, html)
-                if hanime:
-                    source_count += 1
-                    hanime_meta = self._build_hanime_metadata(hanime)
-
-        subject, error = self._resolve_subject(title=title, bangumi_id=bangumi_id)
+        hanime_task = (
+            self._submit_source(self._hanime_watch, clean_hanime_id) if clean_hanime_id else None
+        )
+        bangumi_task = self._submit_source(self._resolve_subject, title, bangumi_id)
+
+        if hanime_task is not None:
+            hanime = self._wait_source("hanime", hanime_task, timeouts)
+            if hanime:
+                source_count += 1
+                hanime_meta = self._build_hanime_metadata(hanime)
+
+        resolved = self._wait_source("bangumi", bangumi_task, timeouts)
+        if resolved:
+            subject, error = resolved
+        elif "bangumi" in timeouts:
+            error = "Bangumi 查询超时"
         if subject:
             source_count += 1
             bangumi_meta = self._build_metadata(subject)
@@ -1572,6 +2450,7 @@ class HuanLeHuiju(_PluginBase):
                 "bangumi": bangumi_meta,
                 "hanime": hanime_meta,
             },
+            "timeouts": timeouts,
         }
         return payload, None
 
@@ -1591,10 +2470,10 @@ class HuanLeHuiju(_PluginBase):
         )
         if error or not payload:
             self.save_data("last_error", error or "未知错误")
+            self._store_page(self.get_data("last_preview"), error or "未知错误")
             return {"ok": False, "message": error or "刷新失败"}
 
-        self.save_data("last_preview", payload)
-        self.del_data("last_error")
+        self._save_preview(payload)
         return {"ok": True, "message": "刷新成功", "data": payload}
 
     def query_metadata(
@@ -1625,8 +2504,7 @@ class HuanLeHuiju(_PluginBase):
             return {"ok": False, "message": error or "查询失败"}
 
         if save_preview:
-            self.save_data("last_preview", payload)
-            self.del_data("last_error")
+            self._save_preview(payload)
         return {"ok": True, "message": "查询成功", "data": payload}
 
     def query_hanime(self, id: str = "", url: str = "") -> Dict[str, Any]:
@@ -1645,12 +2523,14 @@ class HuanLeHuiju(_PluginBase):
         if not watch_id:
             return {"ok": False, "message": "缺少有效的 Hanime ID 或链接"}
 
-        html = self._request_hanime_watch(watch_id)
-        if not html:
+        parsed = self._cached_hanime_parsed(watch_id)
+        html = self._request_hanime_watch(watch_id) if parsed is None else None
+        if parsed is None and not html:
             return {"ok": False, "message": "获取 Hanime 页面失败，可能触发安全验证或网络不可达"}
 
         try:
-            parsed = self._parse_hanime_watch(watch_id, html)
+            if parsed is None:
+                parsed = self._store_hanime_parsed(watch_id, html)
             if not parsed:
                 return {"ok": False, "message": "解析 Hanime 页面失败"}
             meta = self._build_hanime_metadata(parsed)
@@ -1660,6 +2540,218 @@ class HuanLeHuiju(_PluginBase):
 
         return {"ok": True, "message": "ok", "data": {"watch": parsed, "metadata": meta}}
 
+    def _metadata_query_store(self) -> TTLCache:
+        """
+        获取融合 metadata 查询结果缓存
+
+        :return TTLCache: 查询结果缓存
+        """
+        if self._metadata_query_cache is None:
+            self._metadata_query_cache = TTLCache(
+                region="huanlehuiju_metadata_query",
+                maxsize=1024,
+                ttl=self.BANGUMI_CACHE_TTL,
+            )
+        return self._metadata_query_cache
+
+    def _batch_query_key(self, query: Union[str, Dict[str, Any], None]) -> Tuple[str, str, str]:
+        """
+        规范化批量查询项，纯字符串视为标题
+
+        :param query (Union[str, Dict]): 查询项
+
+        :return Tuple: 标题、Bangumi ID 与 Hanime watch ID
+        """
+        if isinstance(query, dict):
+            return (
+                str(query.get("title") or "").strip(),
+                str(query.get("bangumi_id") or "").strip(),
+                self._extract_hanime_watch_id(str(query.get("hanime_id") or "")),
+            )
+        return str(query or "").strip(), "", ""
+
+    def _query_metadata_item(self, key: Tuple[str, str, str]) -> Dict[str, Any]:
+        """
+        查询单个批量查询项，开启缓存时读取并写入查询缓存
+
+        :param key (Tuple): 标题、Bangumi ID 与 Hanime watch ID
+
+        :return Dict: 查询结果
+        """
+        cache_key = "\x1f".join(key)
+        store = self._metadata_query_store() if self._use_cache else None
+        if store is not None:
+            try:
+                cached_payload = store[cache_key] if cache_key in store else None
+            except KeyError:
+                cached_payload = None
+            if cached_payload:
+                return {"ok": True, "message": "查询成功", "cached": True, "data": cached_payload}
+
+        title, bangumi_id, hanime_id = key
+        try:
+            payload, error = self._build_preview_payload(
+                title=title, bangumi_id=bangumi_id, hanime_id=hanime_id
+            )
+        except Exception as err:
+            logger.error("欢乐汇聚批量查询失败: %s", err, exc_info=True)
+            payload, error = None, "查询失败"
+        if error or not payload:
+            return {"ok": False, "message": error or "查询失败"}
+        if store is not None and not payload.get("timeouts"):
+            store[cache_key] = payload
+        return {"ok": True, "message": "查询成功", "cached": False, "data": payload}
+
+    def _iter_metadata_batch(self, keys: List[Tuple[str, str, str]]) -> Iterator[str]:
+        """
+        并发查询批量查询项，按完成顺序逐行输出 NDJSON
+
+        :param keys (List): 去重后的查询项
+
+        :return Iterator: NDJSON 行
+        """
+        executor = ThreadPoolExecutor(
+            max_workers=self.BATCH_CONCURRENCY, thread_name_prefix="huanlehuiju-batch"
+        )
+        try:
+            futures = {executor.submit(self._query_metadata_item, key): key for key in keys}
+            for future in as_completed(futures):
+                title, bangumi_id, hanime_id = futures[future]
+                try:
+                    result = future.result()
+                except Exception as err:
+                    logger.error("欢乐汇聚批量查询失败: %s", err, exc_info=True)
+                    result = {"ok": False, "message": "查询失败"}
+                result["query"] = {"title": title, "bangumi_id": bangumi_id, "hanime_id": hanime_id}
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def query_metadata_batch(
+        self, queries: List[Union[str, Dict[str, Any]]] = Body(..., embed=True)
+    ) -> Union[StreamingResponse, Dict[str, Any]]:
+        """
+        批量查询 metadata
+
+        查询项可为标题字符串，或包含 title / bangumi_id / hanime_id 的对象；
+        相同查询只处理一次，结果按完成顺序以 NDJSON 流式返回，每行附带规范化后的 query
+
+        :param queries (List): 查询项列表
+
+        :return StreamingResponse: NDJSON 响应
+        """
+        if not self._enabled:
+            return {"ok": False, "message": "插件未启用"}
+
+        keys: List[Tuple[str, str, str]] = []
+        seen = set()
+        for query in queries or []:
+            key = self._batch_query_key(query)
+            if any(key) and key not in seen:
+                seen.add(key)
+                keys.append(key)
+        if not keys:
+            return {"ok": False, "message": "缺少有效的查询项"}
+        if len(keys) > self.BATCH_MAX_QUERIES:
+            return {"ok": False, "message": f"单次最多查询 {self.BATCH_MAX_QUERIES} 项"}
+
+        return StreamingResponse(self._iter_metadata_batch(keys), media_type="application/x-ndjson")
+
+    def _search_hanime_items(self, query: str) -> List[Dict[str, Any]]:
+        """
+        请求并解析 Hanime 搜索页
+
+        :param query (str): 搜索关键词
+
+        :return List: 搜索结果
+        """
+        html = self._request_hanime_search(query)
+        return self._parse_hanime_search(query, html or "")
+
+    async def _async_search_hanime_items(self, query: str) -> List[Dict[str, Any]]:
+        """
+        异步请求并解析 Hanime 搜索页
+
+        :param query (str): 搜索关键词
+
+        :return List: 搜索结果
+        """
+        html = await self._async_request_hanime_search(query)
+        return self._parse_hanime_search(query, html or "")
+
+    def _rank_search_results(
+        self,
+        query: str,
+        bangumi_items: Optional[List[dict]],
+        hanime_items: Optional[List[Dict[str, Any]]],
+        begin_season: Optional[int] = None,
+    ) -> List[MediaInfo]:
+        """
+        按标题相似度与数据源优先级合并排序搜索结果
+
+        相同得分时 Bangumi 在前，同一数据源内保持原有顺序
+
+        :param query (str): 搜索关键词
+        :param bangumi_items (List): Bangumi 搜索结果
+        :param hanime_items (List): Hanime 搜索结果
+        :param begin_season (int): 开始季号，仅作用于 Bangumi 结果
+
+        :return List: 排序后的媒体结果
+        """
+        normalized_query = self._normalize_text(query)
+        ranked: List[Tuple[float, int, int, MediaInfo]] = []
+        bangumi_items = bangumi_items or []
+        bangumi_medias = [MediaInfo(bangumi_info=item) for item in bangumi_items]
+        apply_season(bangumi_medias, begin_season, all_types=True)
+        for order, (item, media) in enumerate(zip(bangumi_items, bangumi_medias)):
+            score = max(
+                similarity(normalized_query, self._normalize_text(item.get("name"))),
+                similarity(normalized_query, self._normalize_text(item.get("name_cn"))),
+            )
+            ranked.append((score + self.SEARCH_SOURCE_PRIORITY["bangumi"], 0, order, media))
+        for order, item in enumerate((hanime_items or [])[:20]):
+            media = self._hanime_search_to_mediainfo(item)
+            if not media:
+                continue
+            score = similarity(normalized_query, self._normalize_text(item.get("title")))
+            ranked.append((score + self.SEARCH_SOURCE_PRIORITY["hanime"], 1, order, media))
+        ranked.sort(key=lambda entry: (-entry[0], entry[1], entry[2]))
+        return [entry[3] for entry in ranked]
+
+    def _parallel_search_medias(self, query: str, begin_season: Optional[int]) -> List[MediaInfo]:
+        """
+        并发搜索 Bangumi 与 Hanime 并合并排序，超时的数据源不参与合并
+
+        :param query (str): 搜索关键词
+        :param begin_season (int): 开始季号
+
+        :return List: 媒体结果
+        """
+        timeouts: List[str] = []
+        bangumi_task = self._submit_source(self._search_subjects, query)
+        hanime_task = self._submit_source(self._search_hanime_items, query)
+        bangumi_items = self._wait_source("bangumi", bangumi_task, timeouts)
+        hanime_items = self._wait_source("hanime", hanime_task, timeouts)
+        return self._rank_search_results(query, bangumi_items, hanime_items, begin_season)
+
+    async def _async_parallel_search_medias(
+        self, query: str, begin_season: Optional[int]
+    ) -> List[MediaInfo]:
+        """
+        异步并发搜索 Bangumi 与 Hanime 并合并排序，超时的数据源不参与合并
+
+        :param query (str): 搜索关键词
+        :param begin_season (int): 开始季号
+
+        :return List: 媒体结果
+        """
+        timeouts: List[str] = []
+        bangumi_items, hanime_items = await asyncio.gather(
+            self._async_wait_source("bangumi", self._async_search_subjects(query), timeouts),
+            self._async_wait_source("hanime", self._async_search_hanime_items(query), timeouts),
+        )
+        return self._rank_search_results(query, bangumi_items, hanime_items, begin_season)
+
     def _search_medias(self, meta: MetaBase) -> Optional[List[MediaInfo]]:
         """
         全局搜索媒体
@@ -1677,22 +2769,22 @@ class HuanLeHuiju(_PluginBase):
             query = str(meta.name).strip()
             watch_id = self._extract_hanime_watch_id(query)
             if watch_id:
-                html = self._request_hanime_watch(watch_id)
-                if html:
-                    watch = self._parse_hanime_watch(watch_id, html)
-                    if watch:
-                        media = self._hanime_watch_to_mediainfo(watch)
-                        return [media] if media else []
+                watch = self._hanime_watch(watch_id)
+                if watch:
+                    media = self._hanime_watch_to_mediainfo(watch)
+                    return [media] if media else []
                 return []
 
+            if self._parallel_search:
+                return self._parallel_search_medias(query, getattr(meta, "begin_season", None))
+
             items = self._search_subjects(query)
             medias = [MediaInfo(bangumi_info=item) for item in items]
             if medias:
-                self._apply_season(medias, getattr(meta, "begin_season", None))
+                apply_season(medias, getattr(meta, "begin_season", None), all_types=True)
                 return medias
 
-            html = self._request_hanime_search(query)
-            hanime_items = self._parse_hanime_search(query, html or "")
+            hanime_items = self._search_hanime_items(query)
             hanime_medias: List[MediaInfo] = []
             for item in hanime_items[:20]:
                 media = self._hanime_search_to_mediainfo(item)
@@ -1720,22 +2812,24 @@ class HuanLeHuiju(_PluginBase):
             query = str(meta.name).strip()
             watch_id = self._extract_hanime_watch_id(query)
             if watch_id:
-                html = self._request_hanime_watch(watch_id)
-                if html:
-                    watch = self._parse_hanime_watch(watch_id, html)
-                    if watch:
-                        media = self._hanime_watch_to_mediainfo(watch)
-                        return [media] if media else []
+                watch = await self._async_hanime_watch(watch_id)
+                if watch:
+                    media = self._hanime_watch_to_mediainfo(watch)
+                    return [media] if media else []
                 return []
 
+            if self._parallel_search:
+                return await self._async_parallel_search_medias(
+                    query, getattr(meta, "begin_season", None)
+                )
+
             items = await self._async_search_subjects(query)
             medias = [MediaInfo(bangumi_info=item) for item in items]
             if medias:
-                self._apply_season(medias, getattr(meta, "begin_season", None))
+                apply_season(medias, getattr(meta, "begin_season", None), all_types=True)
                 return medias
 
-            html = self._request_hanime_search(query)
-            hanime_items = self._parse_hanime_search(query, html or "")
+            hanime_items = await self._async_search_hanime_items(query)
             hanime_medias: List[MediaInfo] = []
             for item in hanime_items[:20]:
                 media = self._hanime_search_to_mediainfo(item)
@@ -1768,36 +2862,23 @@ class HuanLeHuiju(_PluginBase):
                 )
                 if prefix.lower() == "hanime":
                     watch_id = self._extract_hanime_watch_id(value)
-                    html = self._request_hanime_watch(watch_id) if watch_id else None
-                    if html:
-                        watch = self._parse_hanime_watch(watch_id, html)
-                        if watch:
-                            media = self._hanime_watch_to_mediainfo(watch)
-                            if media:
-                                details.append(media)
+                    watch = self._hanime_watch(watch_id)
+                    if watch:
+                        media = self._hanime_watch_to_mediainfo(watch)
+                        if media:
+                            details.append(media)
                 else:
                     bangumi_id = value
-                    detail = (
-                        self._cached_subject(bangumi_id)
-                        if self._use_cache
-                        else self._fetch_subject_detail(bangumi_id)
-                    )
+                    detail = self._fetch_subject_detail(bangumi_id)
                     if detail:
                         details.append(MediaInfo(bangumi_info=detail))
             else:
                 medias = self._search_medias(meta) or []
-                for media in medias:
-                    bangumi_id = getattr(media, "bangumi_id", None)
-                    if not bangumi_id:
-                        continue
-                    detail = (
-                        self._cached_subject(str(bangumi_id))
-                        if self._use_cache
-                        else self._fetch_subject_detail(str(bangumi_id))
-                    )
+                bangumi_ids = self._scrape_candidate_ids(meta, medias)
+                for detail in self._fetch_subject_details(bangumi_ids):
                     if detail:
                         details.append(MediaInfo(bangumi_info=detail))
-            self._apply_season(details, begin_season)
+            apply_season(details, begin_season, all_types=True)
             return details
         except Exception as err:
             logger.error("欢乐汇聚刮削 Bangumi 元数据失败: %s", err, exc_info=True)
@@ -1825,36 +2906,23 @@ class HuanLeHuiju(_PluginBase):
                 )
                 if prefix.lower() == "hanime":
                     watch_id = self._extract_hanime_watch_id(value)
-                    html = self._request_hanime_watch(watch_id) if watch_id else None
-                    if html:
-                        watch = self._parse_hanime_watch(watch_id, html)
-                        if watch:
-                            media = self._hanime_watch_to_mediainfo(watch)
-                            if media:
-                                details.append(media)
+                    watch = await self._async_hanime_watch(watch_id)
+                    if watch:
+                        media = self._hanime_watch_to_mediainfo(watch)
+                        if media:
+                            details.append(media)
                 else:
                     bangumi_id = value
-                    detail = (
-                        self._cached_subject(bangumi_id)
-                        if self._use_cache
-                        else await self._async_fetch_subject_detail(bangumi_id)
-                    )
+                    detail = await self._async_fetch_subject_detail(bangumi_id)
                     if detail:
                         details.append(MediaInfo(bangumi_info=detail))
             else:
                 medias = await self._async_search_medias(meta) or []
-                for media in medias:
-                    bangumi_id = getattr(media, "bangumi_id", None)
-                    if not bangumi_id:
-                        continue
-                    detail = (
-                        self._cached_subject(str(bangumi_id))
-                        if self._use_cache
-                        else await self._async_fetch_subject_detail(str(bangumi_id))
-                    )
+                bangumi_ids = self._scrape_candidate_ids(meta, medias)
+                for detail in await self._async_fetch_subject_details(bangumi_ids):
                     if detail:
                         details.append(MediaInfo(bangumi_info=detail))
-            self._apply_season(details, begin_season)
+            apply_season(details, begin_season, all_types=True)
             return details
         except Exception as err:
             logger.error("欢乐汇聚异步刮削 Bangumi 元数据失败: %s", err, exc_info=True)
@@ -1871,11 +2939,7 @@ class HuanLeHuiju(_PluginBase):
         if not self._enabled or not bangumiid:
             return None
         try:
-            detail = (
-                self._cached_subject(str(bangumiid))
-                if self._use_cache
-                else self._fetch_subject_detail(str(bangumiid))
-            )
+            detail = self._fetch_subject_detail(str(bangumiid))
             return MediaInfo(bangumi_info=detail) if isinstance(detail, dict) else None
         except Exception as err:
             logger.error("欢乐汇聚获取 Bangumi 详情失败: %s", err, exc_info=True)
@@ -1892,11 +2956,7 @@ class HuanLeHuiju(_PluginBase):
         if not self._enabled or not bangumiid:
             return None
         try:
-            detail = (
-                self._cached_subject(str(bangumiid))
-                if self._use_cache
-                else await self._async_fetch_subject_detail(str(bangumiid))
-            )
+            detail = await self._async_fetch_subject_detail(str(bangumiid))
             return MediaInfo(bangumi_info=detail) if isinstance(detail, dict) else None
         except Exception as err:
             logger.error("欢乐汇聚异步获取 Bangumi 详情失败: %s", err, exc_info=True)
@@ -1917,26 +2977,28 @@ class HuanLeHuiju(_PluginBase):
 
         watch_id = self._extract_hanime_watch_id_from_kwargs(kwargs)
         if watch_id:
-            html = self._request_hanime_watch(watch_id)
-            if html:
-                parsed = self._parse_hanime_watch(watch_id, html)
-                if parsed:
-                    query_title = str(parsed.get("series") or parsed.get("title") or "").strip()
-                    if query_title:
-                        items = (
-                            self._cached_search(query_title)
-                            if self._use_cache
-                            else self._search_subjects(query_title)
-                        )
-                        best = self._pick_best_subject(query_title, items)
-                        if best and best.get("id"):
-                            return self._bangumi_info(int(best.get("id")))
+            parsed = self._hanime_watch(watch_id)
+            if parsed:
+                query_title = str(parsed.get("series") or parsed.get("title") or "").strip()
+                indexed_id, exact = self._lookup_title(query_title)
+                indexed = self._bangumi_info(indexed_id) if indexed_id and exact else None
+                if indexed:
+                    return indexed
+                if query_title:
+                    items = self._search_subjects(query_title)
+                    best = self._pick_best_subject(query_title, items, indexed_id)
+                    if best and best.get("id"):
+                        return self._bangumi_info(int(best.get("id")))
 
         title = self._extract_title_from_kwargs(kwargs)
         if not title:
             return None
-        items = self._cached_search(title) if self._use_cache else self._search_subjects(title)
-        best = self._pick_best_subject(title, items)
+        indexed_id, exact = self._lookup_title(title)
+        indexed = self._bangumi_info(indexed_id) if indexed_id and exact else None
+        if indexed:
+            return indexed
+        items = self._search_subjects(title)
+        best = self._pick_best_subject(title, items, indexed_id)
         if not best or not best.get("id"):
             logger.info("欢乐汇聚未识别到 Bangumi: %s", title)
             return None
@@ -1959,30 +3021,28 @@ class HuanLeHuiju(_PluginBase):
 
         watch_id = self._extract_hanime_watch_id_from_kwargs(kwargs)
         if watch_id:
-            html = self._request_hanime_watch(watch_id)
-            if html:
-                parsed = self._parse_hanime_watch(watch_id, html)
-                if parsed:
-                    query_title = str(parsed.get("series") or parsed.get("title") or "").strip()
-                    if query_title:
-                        items = (
-                            self._cached_search(query_title)
-                            if self._use_cache
-                            else await self._async_search_subjects(query_title)
-                        )
-                        best = self._pick_best_subject(query_title, items)
-                        if best and best.get("id"):
-                            return await self._async_bangumi_info(int(best.get("id")))
+            parsed = await self._async_hanime_watch(watch_id)
+            if parsed:
+                query_title = str(parsed.get("series") or parsed.get("title") or "").strip()
+                indexed_id, exact = self._lookup_title(query_title)
+                indexed = await self._async_bangumi_info(indexed_id) if indexed_id and exact else None
+                if indexed:
+                    return indexed
+                if query_title:
+                    items = await self._async_search_subjects(query_title)
+                    best = self._pick_best_subject(query_title, items, indexed_id)
+                    if best and best.get("id"):
+                        return await self._async_bangumi_info(int(best.get("id")))
 
         title = self._extract_title_from_kwargs(kwargs)
         if not title:
             return None
-        items = (
-            self._cached_search(title)
-            if self._use_cache
-            else await self._async_search_subjects(title)
-        )
-        best = self._pick_best_subject(title, items)
+        indexed_id, exact = self._lookup_title(title)
+        indexed = await self._async_bangumi_info(indexed_id) if indexed_id and exact else None
+        if indexed:
+            return indexed
+        items = await self._async_search_subjects(title)
+        best = self._pick_best_subject(title, items, indexed_id)
         if not best or not best.get("id"):
             logger.info("欢乐汇聚未识别到 Bangumi: %s", title)
             return None
@@ -0,0 +1,870 @@
+"""
+Bangumi API 共享客户端
+
+插件目录各自独立安装，bangumiauthorization 与 huanlehuiju 中各有一份相同的本文件。
+以 bangumiauthorization 中的副本为准，修改后执行 python scripts/sync_shared.py 同步。
+代码由各副本分别加载，升级其中一个插件不会替换另一个插件正在使用的代码；
+连接池、请求去重表、缓存与并发限制器等状态按主机登记在进程内共享的登记表中，两个副本共用。
+"""
+import asyncio
+import hashlib
+import sys
+import threading
+import time
+import types
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.utils.http import AsyncRequestUtils, RequestUtils
+
+API_BASE = "https://api.bgm.tv"
+# 缓存条目的最长保留时间（秒），调用方传入的 ttl 不会超过该值
+CACHE_MAX_TTL = 86400
+# 进程内共享登记表在 sys.modules 中的名称，各副本按该名称取得同一份状态
+SHARED_REGISTRY = "_bangumi_client_shared"
+
+
+def _shared_registry() -> Dict[str, Any]:
+    """
+    获取进程内共享的登记表，首次调用时创建
+
+    :return Dict: 登记表，包含 lock、limiters（主机到限制器）与 hosts（主机到客户端状态）
+    """
+    module = sys.modules.get(SHARED_REGISTRY)
+    if module is None:
+        module = sys.modules.setdefault(SHARED_REGISTRY, types.ModuleType(SHARED_REGISTRY))
+    registry = vars(module)
+    registry.setdefault("lock", threading.Lock())
+    registry.setdefault("limiters", {})
+    registry.setdefault("hosts", {})
+    return registry
+
+
+def build_headers(authorization: Optional[str] = None) -> Dict[str, str]:
+    """
+    生成 Bangumi API 请求头
+
+    :param authorization (str): Authorization 令牌，缺少 Bearer 前缀时自动补全
+
+    :return Dict: 请求头
+    """
+    headers = {
+        "Accept": "application/json",
+        "User-Agent": settings.NORMAL_USER_AGENT,
+    }
+    auth = str(authorization or "").strip()
+    if auth:
+        headers["Authorization"] = auth if auth.lower().startswith("bearer ") else f"Bearer {auth}"
+    return headers
+
+
+def season_text(season: Optional[int], chinese: bool = False) -> Optional[str]:
+    """
+    获取季文本
+
+    :param season (int): 季号
+    :param chinese (bool): 是否使用中文数字（需要 cn2an），否则使用阿拉伯数字
+
+    :return str: 季文本，如 第2季 / 第二季
+    """
+    try:
+        season_int = int(season or 0)
+    except (TypeError, ValueError):
+        return None
+    if season_int <= 0:
+        return None
+    if chinese:
+        try:
+            import cn2an
+            return f"第{cn2an.an2cn(season_int, 'low')}季"
+        except Exception:
+            return None
+    return f"第{season_int}季"
+
+
+def strip_season_text(title: Optional[str], season: Optional[int]) -> Optional[str]:
+    """
+    去掉 apply_season 追加在标题末尾的季文本
+
+    :param title (str): 标题
+    :param season (int): 季号
+
+    :return str: 去掉季文本后的标题
+    """
+    if not title:
+        return title
+    for chinese in (False, True):
+        text = season_text(season, chinese=chinese)
+        if text and title.endswith(f" {text}"):
+            return title[:-len(text) - 1]
+    return title
+
+
+def apply_season(
+    medias: Optional[List[Any]], begin_season: Optional[int], chinese: bool = False, all_types: bool = False
+) -> None:
+    """
+    为电视剧结果补充季号与标题中的季文本
+
+    :param medias (List): 媒体列表
+    :param begin_season (int): 开始季号
+    :param chinese (bool): 季文本是否使用中文数字
+    :param all_types (bool): 是否为所有类型的结果设置季号，标题中的季文本仍只加在电视剧上
+    """
+    if not medias or not begin_season:
+        return
+    text = season_text(begin_season, chinese=chinese)
+    for media in medias:
+        try:
+            if all_types:
+                media.season = begin_season
+            media_type = getattr(getattr(media, "type", None), "value", None)
+            if media_type != "电视剧":
+                continue
+            media.season = begin_season
+            if text and getattr(media, "title", None) and text not in media.title:
+                media.title = f"{media.title} {text}"
+        except Exception:
+            continue
+
+
+class AdaptiveLimiter:
+    """
+    AIMD 并发限制器
+
+    延迟正常时每个成功响应使并发上限加 1/上限（约每轮加 1），
+    收到 429/503 时上限减半并按 Retry-After 暂停发出新请求，
+    延迟突增时上限乘以 0.7。同步与异步请求共用同一组计数。
+    """
+
+    MIN_LIMIT = 1.0
+    MAX_LIMIT = 16.0
+    INITIAL_LIMIT = 4.0
+    # 延迟超过基线的倍数视为突增
+    LATENCY_SPIKE_FACTOR = 3.0
+    # 低于该延迟（秒）时不判定为突增
+    LATENCY_FLOOR = 1.0
+    # 未提供 Retry-After 时的暂停时间（秒）
+    DEFAULT_BACKOFF = 2.0
+    # Retry-After 的最长暂停时间（秒）
+    MAX_BACKOFF = 60.0
+    # 异步等待时的轮询间隔（秒）
+    ASYNC_POLL_INTERVAL = 0.05
+    # 等待并发名额的最长时间（秒），超时后放弃本次请求
+    ACQUIRE_TIMEOUT = 30.0
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self.limit = self.INITIAL_LIMIT
+        self.inflight = 0
+        self.blocked_until = 0.0
+        self.latency = 0.0
+
+    def _wait_time(self) -> float:
+        """
+        计算当前还需等待的时间，可以发出请求时占用一个并发名额
+
+        :return float: 需等待的秒数，0 表示已占用名额
+        """
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.inflight >= int(self.limit):
+            return -1.0
+        self.inflight += 1
+        return 0.0
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        同步等待并占用一个并发名额
+
+        :param timeout (float): 最长等待时间（秒），默认 ACQUIRE_TIMEOUT
+
+        :return bool: 是否占用成功，等待超时返回 False
+        """
+        deadline = time.monotonic() + (self.ACQUIRE_TIMEOUT if timeout is None else timeout)
+        with self._cond:
+            while True:
+                wait = self._wait_time()
+                if wait == 0:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(timeout=min(wait, remaining) if wait > 0 else remaining)
+
+    async def async_acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        异步等待并占用一个并发名额
+
+        :param timeout (float): 最长等待时间（秒），默认 ACQUIRE_TIMEOUT
+
+        :return bool: 是否占用成功，等待超时返回 False
+        """
+        deadline = time.monotonic() + (self.ACQUIRE_TIMEOUT if timeout is None else timeout)
+        while True:
+            with self._cond:
+                wait = self._wait_time()
+            if wait == 0:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(wait if wait > 0 else self.ASYNC_POLL_INTERVAL, remaining))
+
+    def release(self, latency: float, status_code: Optional[int], retry_after: Optional[float] = None) -> None:
+        """
+        释放并发名额并根据响应调整并发上限
+
+        :param latency (float): 请求耗时（秒）
+        :param status_code (int): 响应状态码，请求失败时为 None
+        :param retry_after (float): 服务端要求的等待时间（秒）
+        """
+        with self._cond:
+            self.inflight = max(0, self.inflight - 1)
+            if status_code in (429, 503):
+                self.limit = max(self.MIN_LIMIT, self.limit / 2)
+                backoff = min(self.MAX_BACKOFF, retry_after if retry_after else self.DEFAULT_BACKOFF)
+                self.blocked_until = max(self.blocked_until, time.monotonic() + backoff)
+            elif status_code is not None:
+                baseline = self.latency or latency
+                if latency > max(self.LATENCY_FLOOR, baseline * self.LATENCY_SPIKE_FACTOR):
+                    self.limit = max(self.MIN_LIMIT, self.limit * 0.7)
+                else:
+                    self.limit = min(self.MAX_LIMIT, self.limit + 1 / self.limit)
+                    self.latency = latency if not self.latency else self.latency * 0.8 + latency * 0.2
+            self._cond.notify_all()
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        解析 Retry-After 响应头，支持秒数与 HTTP 日期两种格式
+
+        :param value (str): 响应头的值
+
+        :return float: 等待秒数，无法解析时返回 None
+        """
+        if not value:
+            return None
+        value = str(value).strip()
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except Exception:
+            return None
+
+
+def get_limiter(url: str) -> AdaptiveLimiter:
+    """
+    获取请求地址所属主机的并发限制器，各插件副本共用同一个
+
+    :param url (str): 请求地址
+
+    :return AdaptiveLimiter: 限制器
+    """
+    host = urlparse(url).netloc.lower()
+    registry = _shared_registry()
+    with registry["lock"]:
+        limiter = registry["limiters"].get(host)
+        if limiter is None:
+            limiter = registry["limiters"][host] = AdaptiveLimiter()
+        return limiter
+
+
+def _host_state(host: str) -> Dict[str, Any]:
+    """
+    获取主机的共享客户端状态，各插件副本共用同一份
+
+    :param host (str): 主机名
+
+    :return Dict: 锁、同步连接池、各事件循环的异步状态、请求去重表、使用方与缓存
+    """
+    registry = _shared_registry()
+    with registry["lock"]:
+        state = registry["hosts"].get(host)
+        if state is None:
+            state = registry["hosts"][host] = {
+                "lock": threading.Lock(),
+                "session": None,
+                "loop_states": weakref.WeakKeyDictionary(),
+                "inflight": {},
+                "owners": set(),
+                "search_cache": TTLCache(region="bangumi_client_search", maxsize=512, ttl=CACHE_MAX_TTL),
+                "subject_cache": TTLCache(region="bangumi_client_subject", maxsize=2048, ttl=CACHE_MAX_TTL),
+            }
+        return state
+
+
+class _LoopState:
+    """
+    单个事件循环内的异步状态：连接池与条目请求合并队列，不能跨事件循环使用
+    """
+
+    def __init__(self):
+        self.client: Any = None
+        self.pending: Dict[str, Tuple[Any, Optional[str]]] = {}
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.dispatch: Optional[asyncio.TimerHandle] = None
+
+
+class BangumiClient:
+    """
+    Bangumi API 客户端
+
+    同步与异步接口共用连接池与缓存，这些状态保存在按主机共享的登记表中，
+    各插件副本创建的客户端访问同一份。缓存键带上授权令牌摘要，
+    已授权请求可见的条目不会被匿名请求读取。条目详情统一使用 v0 接口。
+    """
+
+    # 批量请求条目的最大并发数，实际并发由各主机的 AdaptiveLimiter 控制
+    CONCURRENCY = int(AdaptiveLimiter.MAX_LIMIT)
+    # 异步条目请求的合并窗口（秒）
+    BATCH_WINDOW = 0.01
+    # 等待其他线程同一条目请求的超时时间（秒）
+    WAIT_TIMEOUT = 30
+    # 收到 429/503 后的最大重试次数
+    MAX_RETRIES = 2
+
+    def __init__(self):
+        self._state = _host_state(urlparse(API_BASE).netloc.lower())
+        self._lock: threading.Lock = self._state["lock"]
+        self._inflight: Dict[str, Future] = self._state["inflight"]
+        self._owners: set = self._state["owners"]
+        self._search_cache: TTLCache = self._state["search_cache"]
+        self._subject_cache: TTLCache = self._state["subject_cache"]
+
+    def acquire(self, owner: str) -> None:
+        """
+        登记使用方，连接池在首次请求时创建
+
+        :param owner (str): 使用方名称
+        """
+        with self._lock:
+            self._owners.add(owner)
+
+    def release(self, owner: str) -> None:
+        """
+        注销使用方，没有使用方时关闭连接池
+
+        :param owner (str): 使用方名称
+        """
+        with self._lock:
+            self._owners.discard(owner)
+            if self._owners:
+                return
+        self.close()
+
+    def close(self) -> None:
+        """
+        关闭连接池，各异步客户端交由其所属的事件循环关闭
+        """
+        with self._lock:
+            session = self._state["session"]
+            self._state["session"] = None
+            clients = [
+                (loop, state.client) for loop, state in self._state["loop_states"].items() if state.client is not None
+            ]
+            self._state["loop_states"] = weakref.WeakKeyDictionary()
+        if session is not None:
+            try:
+                session.close()
+            except Exception:
+                pass
+        for loop, client in clients:
+            self._close_async_client(loop, client)
+
+    @staticmethod
+    def _close_async_client(loop: asyncio.AbstractEventLoop, client: Any) -> None:
+        """
+        在异步客户端所属的事件循环中关闭它
+
+        :param loop (AbstractEventLoop): 客户端所属的事件循环
+        :param client (httpx.AsyncClient): 异步客户端
+        """
+        if loop.is_closed():
+            return
+        try:
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is loop:
+                loop.create_task(client.aclose())
+            elif running is None and not loop.is_running():
+                loop.run_until_complete(client.aclose())
+            else:
+                # 其他线程中运行或暂未运行的循环，关闭任务在该循环下次运行时执行
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        except Exception:
+            pass
+
+    def _get_session(self) -> requests.Session:
+        """
+        获取同步连接池，不保存响应 Cookie，避免状态跨授权身份复用
+
+        :return Session: requests 会话
+        """
+        with self._lock:
+            if self._state["session"] is None:
+                session = requests.Session()
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.CONCURRENCY)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._state["session"] = session
+            return self._state["session"]
+
+    def _loop_state(self) -> _LoopState:
+        """
+        获取当前事件循环的异步状态，事件循环被回收后状态随之释放
+
+        :return _LoopState: 异步状态
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._state["loop_states"].get(loop)
+            if state is None:
+                state = self._state["loop_states"][loop] = _LoopState()
+            return state
+
+    def _get_async_client(self) -> Any:
+        """
+        获取当前事件循环的异步连接池，安装了 h2 时启用 HTTP/2 多路复用
+
+        httpx.AsyncClient 的连接绑定创建它的事件循环，因此每个事件循环各建一个
+
+        :return httpx.AsyncClient: 异步客户端，httpx 不可用时返回 None
+        """
+        state = self._loop_state()
+        if state.client is None:
+            try:
+                import httpx
+                try:
+                    import h2  # noqa: F401
+                    http2 = True
+                except ImportError:
+                    http2 = False
+                pool_size = self.CONCURRENCY
+                state.client = httpx.AsyncClient(
+                    http2=http2,
+                    limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                    timeout=20,
+                )
+            except Exception:
+                state.client = None
+        return state.client
+
+    @staticmethod
+    def _throttle_info(response: Any) -> Tuple[Optional[int], Optional[float]]:
+        """
+        提取限流相关的响应信息
+
+        :param response: 响应对象
+
+        :return Tuple: 状态码与 Retry-After 秒数
+        """
+        if response is None:
+            return None, None
+        status_code = getattr(response, "status_code", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            retry_after = AdaptiveLimiter.parse_retry_after(headers.get("Retry-After"))
+        except Exception:
+            retry_after = None
+        return status_code, retry_after
+
+    @staticmethod
+    def _parse_json(response: Any) -> Optional[dict]:
+        """
+        解析 JSON 响应
+
+        :param response: 响应对象
+
+        :return dict: JSON 数据，状态异常或解析失败时返回 None
+        """
+        if response is None:
+            return None
+        status_code = getattr(response, "status_code", None)
+        ok = getattr(response, "ok", None)
+        if ok is False or (ok is None and status_code not in {200, 201}):
+            return None
+        try:
+            payload = response.json()
+        except Exception:
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def request_json(self, path: str, authorization: Optional[str] = None) -> Optional[dict]:
+        """
+        同步请求 JSON 数据
+
+        :param path (str): 接口路径
+        :param authorization (str): Authorization 令牌
+
+        :return dict: JSON 数据
+        """
+        url = f"{API_BASE}{path}"
+        limiter = get_limiter(url)
+        response = None
+        for _ in range(self.MAX_RETRIES + 1):
+            if not limiter.acquire():
+                break
+            started = time.monotonic()
+            status_code, retry_after = None, None
+            try:
+                try:
+                    response = RequestUtils(
+                        ua=settings.NORMAL_USER_AGENT,
+                        headers=build_headers(authorization),
+                        session=self._get_session(),
+                    ).get_res(url)
+                except Exception:
+                    response = None
+                status_code, retry_after = self._throttle_info(response)
+            finally:
+                limiter.release(time.monotonic() - started, status_code, retry_after)
+            if status_code not in (429, 503):
+                break
+        return self._parse_json(response)
+
+    async def async_request_json(self, path: str, authorization: Optional[str] = None) -> Optional[dict]:
+        """
+        异步请求 JSON 数据
+
+        :param path (str): 接口路径
+        :param authorization (str): Authorization 令牌
+
+        :return dict: JSON 数据
+        """
+        url = f"{API_BASE}{path}"
+        limiter = get_limiter(url)
+        response = None
+        for _ in range(self.MAX_RETRIES + 1):
+            if not await limiter.async_acquire():
+                break
+            started = time.monotonic()
+            status_code, retry_after = None, None
+            # 请求被 wait_for 等取消时 CancelledError 不属于 Exception，名额必须在 finally 中归还
+            try:
+                try:
+                    response = await AsyncRequestUtils(
+                        ua=settings.NORMAL_USER_AGENT,
+                        headers=build_headers(authorization),
+                        client=self._get_async_client(),
+                    ).get_res(url)
+                except Exception:
+                    response = None
+                status_code, retry_after = self._throttle_info(response)
+            finally:
+                limiter.release(time.monotonic() - started, status_code, retry_after)
+            if status_code not in (429, 503):
+                break
+        return self._parse_json(response)
+
+    @staticmethod
+    def _identity(authorization: Optional[str]) -> str:
+        """
+        生成授权身份标识，令牌只以摘要形式出现在缓存键中
+
+        :param authorization (str): Authorization 令牌
+
+        :return str: 令牌摘要，未授权时为 anonymous
+        """
+        auth = str(authorization or "").strip()
+        if not auth:
+            return "anonymous"
+        if not auth.lower().startswith("bearer "):
+            auth = f"Bearer {auth}"
+        return hashlib.sha256(auth.encode("utf-8")).hexdigest()[:16]
+
+    def _cache_key(self, kind: str, value: Any, authorization: Optional[str]) -> str:
+        """
+        生成缓存键
+
+        :param kind (str): 缓存内容类型
+        :param value (Any): 查询参数
+        :param authorization (str): Authorization 令牌
+
+        :return str: 缓存键
+        """
+        return f"{self._identity(authorization)}:{kind}:{value}"
+
+    @staticmethod
+    def _cache_get(store: TTLCache, key: str, ttl: int) -> Any:
+        """
+        读取缓存，条目存在时间超过调用方 ttl 时视为未命中
+
+        :param store (TTLCache): 缓存实例
+        :param key (str): 缓存键
+        :param ttl (int): 调用方可接受的缓存时间（秒），0 为不读取缓存
+
+        :return Any: 缓存的数据，未命中时返回 None
+        """
+        if not ttl:
+            return None
+        try:
+            entry = store[key] if key in store else None
+        except Exception:
+            return None
+        if not isinstance(entry, dict) or time.time() - entry.get("cached_at", 0) > ttl:
+            return None
+        return entry.get("data")
+
+    @staticmethod
+    def _cache_set(store: TTLCache, key: str, value: Any) -> None:
+        """
+        写入缓存
+
+        :param store (TTLCache): 缓存实例
+        :param key (str): 缓存键
+        :param value (Any): 待缓存的数据，为 None 时不写入
+        """
+        if value is None:
+            return
+        try:
+            store[key] = {"data": value, "cached_at": time.time()}
+        except Exception:
+            pass
+
+    @staticmethod
+    def _search_items(data: Optional[dict]) -> List[dict]:
+        """
+        提取搜索结果列表
+
+        :param data (dict): 搜索接口响应
+
+        :return List: 搜索结果
+        """
+        items = (data or {}).get("list") or []
+        if not isinstance(items, list):
+            return []
+        return [item for item in items if isinstance(item, dict)]
+
+    def search(self, keyword: str, authorization: Optional[str] = None, ttl: int = 1800) -> List[dict]:
+        """
+        同步搜索 Bangumi 条目
+
+        :param keyword (str): 搜索关键词
+        :param authorization (str): Authorization 令牌
+        :param ttl (int): 缓存时间（秒），0 为不读取缓存
+
+        :return List: 搜索结果
+        """
+        key = self._cache_key("search", keyword, authorization)
+        items = self._cache_get(self._search_cache, key, ttl)
+        if items is not None:
+            return list(items)
+        data = self.request_json(f"/search/subject/{quote(keyword)}", authorization)
+        if data is None:
+            return []
+        items = self._search_items(data)
+        self._cache_set(self._search_cache, key, items)
+        return list(items)
+
+    async def async_search(self, keyword: str, authorization: Optional[str] = None, ttl: int = 1800) -> List[dict]:
+        """
+        异步搜索 Bangumi 条目，与同步版本共用缓存
+
+        :param keyword (str): 搜索关键词
+        :param authorization (str): Authorization 令牌
+        :param ttl (int): 缓存时间（秒），0 为不读取缓存
+
+        :return List: 搜索结果
+        """
+        key = self._cache_key("search", keyword, authorization)
+        items = self._cache_get(self._search_cache, key, ttl)
+        if items is not None:
+            return list(items)
+        data = await self.async_request_json(f"/search/subject/{quote(keyword)}", authorization)
+        if data is None:
+            return []
+        items = self._search_items(data)
+        self._cache_set(self._search_cache, key, items)
+        return list(items)
+
+    def subject(self, subject_id: Any, authorization: Optional[str] = None, ttl: int = 3600) -> Optional[dict]:
+        """
+        同步获取单个条目详情
+
+        :param subject_id (Any): Bangumi 主题 ID
+        :param authorization (str): Authorization 令牌
+        :param ttl (int): 缓存时间（秒），0 为不读取缓存
+
+        :return dict: v0 条目数据
+        """
+        return self.load_subjects([subject_id], authorization=authorization, ttl=ttl)[0]
+
+    async def async_subject(
+        self, subject_id: Any, authorization: Optional[str] = None, ttl: int = 3600
+    ) -> Optional[dict]:
+        """
+        异步获取单个条目详情
+
+        :param subject_id (Any): Bangumi 主题 ID
+        :param authorization (str): Authorization 令牌
+        :param ttl (int): 缓存时间（秒），0 为不读取缓存
+
+        :return dict: v0 条目数据
+        """
+        return (await self.async_load_subjects([subject_id], authorization=authorization, ttl=ttl))[0]
+
+    def load_subjects(
+        self, subject_ids: List[Any], authorization: Optional[str] = None, ttl: int = 3600
+    ) -> List[Optional[dict]]:
+        """
+        同步批量加载条目详情
+
+        重复 ID 只请求一次，其他线程正在请求的条目直接等待其结果，其余条目并发请求。
+
+        :param subject_ids (List): Bangumi 主题 ID 列表
+        :param authorization (str): Authorization 令牌
+        :param ttl (int): 缓存时间（秒），0 为不读取缓存
+
+        :return List: 与 subject_ids 顺序一致的条目数据，失败项为 None
+        """
+        keys = [self._cache_key("v0_subject", sid, authorization) for sid in subject_ids]
+        results: Dict[str, Optional[dict]] = {}
+        owned: Dict[str, Tuple[Any, Future]] = {}
+        waiting: Dict[str, Future] = {}
+        for sid, key in zip(subject_ids, keys):
+            if key in results or key in owned or key in waiting:
+                continue
+            data = self._cache_get(self._subject_cache, key, ttl)
+            if data is not None:
+                results[key] = data
+                continue
+            with self._lock:
+                future = self._inflight.get(key)
+                if future is None:
+                    future = Future()
+                    self._inflight[key] = future
+                    owned[key] = (sid, future)
+                else:
+                    waiting[key] = future
+
+        def _load(item: Tuple[str, Tuple[Any, Future]]):
+            key, (sid, future) = item
+            data = None
+            try:
+                data = self.request_json(f"/v0/subjects/{sid}", authorization)
+                self._cache_set(self._subject_cache, key, data)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                future.set_result(data)
+
+        if len(owned) == 1:
+            _load(next(iter(owned.items())))
+        elif owned:
+            with ThreadPoolExecutor(max_workers=min(self.CONCURRENCY, len(owned))) as executor:
+                list(executor.map(_load, owned.items()))
+        for key, (_, future) in owned.items():
+            results[key] = future.result()
+        for key, future in waiting.items():
+            try:
+                results[key] = future.result(timeout=self.WAIT_TIMEOUT)
+            except Exception:
+                results[key] = None
+        return [results.get(key) for key in keys]
+
+    async def async_load_subjects(
+        self, subject_ids: List[Any], authorization: Optional[str] = None, ttl: int = 3600
+    ) -> List[Optional[dict]]:
+        """
+        异步批量加载条目详情
+
+        合并窗口内各调用方请求的条目会去重后一起发出，与同步版本共用缓存。
+
+        :param subject_ids (List): Bangumi 主题 ID 列表
+        :param authorization (str): Authorization 令牌
+        :param ttl (int): 缓存时间（秒），0 为不读取缓存
+
+        :return List: 与 subject_ids 顺序一致的条目数据，失败项为 None
+        """
+        loop = asyncio.get_running_loop()
+        state = self._loop_state()
+        keys = [self._cache_key("v0_subject", sid, authorization) for sid in subject_ids]
+        results: Dict[str, Optional[dict]] = {}
+        futures: Dict[str, asyncio.Future] = {}
+        for sid, key in zip(subject_ids, keys):
+            if key in results or key in futures:
+                continue
+            data = self._cache_get(self._subject_cache, key, ttl)
+            if data is not None:
+                results[key] = data
+                continue
+            future = state.inflight.get(key)
+            if future is None:
+                future = loop.create_future()
+                state.inflight[key] = future
+                state.pending[key] = (sid, authorization)
+            futures[key] = future
+        if state.pending and state.dispatch is None:
+            state.dispatch = loop.call_later(self.BATCH_WINDOW, self._dispatch_subjects, state)
+        if futures:
+            loaded = await asyncio.gather(*futures.values(), return_exceptions=True)
+            for key, data in zip(futures, loaded):
+                results[key] = data if isinstance(data, dict) else None
+        return [results.get(key) for key in keys]
+
+    def _dispatch_subjects(self, state: _LoopState) -> None:
+        """
+        发出合并窗口内积累的条目请求
+
+        :param state (_LoopState): 当前事件循环的异步状态
+        """
+        state.dispatch = None
+        batch, state.pending = state.pending, {}
+        if batch:
+            asyncio.ensure_future(self._run_subject_batch(batch, state))
+
+    async def _run_subject_batch(self, batch: Dict[str, Tuple[Any, Optional[str]]], state: _LoopState) -> None:
+        """
+        执行一批条目请求并唤醒等待中的调用方，并发由主机限制器控制
+
+        :param batch (Dict): 缓存键到主题 ID 与授权令牌的映射
+        :param state (_LoopState): 当前事件循环的异步状态
+        """
+        async def _load(key: str, sid: Any, authorization: Optional[str]):
+            data = None
+            try:
+                data = await self.async_request_json(f"/v0/subjects/{sid}", authorization)
+                self._cache_set(self._subject_cache, key, data)
+            finally:
+                future = state.inflight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_result(data)
+
+        await asyncio.gather(
+            *(_load(key, sid, auth) for key, (sid, auth) in batch.items()),
+            return_exceptions=True,
+        )
+
+
+_client: Optional[BangumiClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> BangumiClient:
+    """
+    获取本插件的 Bangumi 客户端，连接池、缓存与请求去重与其他插件副本共用
+
+    :return BangumiClient: 客户端
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = BangumiClient()
+        return _client
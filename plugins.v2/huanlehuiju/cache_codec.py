@@ -0,0 +1,150 @@
+"""
+页面源码缓存编解码与条件请求
+
+各发现插件与欢乐汇聚共用的缓存压缩层：超过阈值的页面源码按 zstd（不可用时 zlib）压缩后写入缓存，
+读取时按编码标记透明还原，并累计写入、读取与压缩前后字节数；缓存条目过期后按其中保存的
+ETag/Last-Modified 构造条件请求头。插件目录各自独立安装，本文件以
+plugins.v2/javbusdiscover/cache_codec.py 为源文件，其余插件目录中的副本由 scripts/sync_shared.py 生成，
+只修改源文件后执行该脚本同步。
+"""
+import threading
+import zlib
+from typing import Any, Dict, Optional, Union
+
+from app.log import logger
+
+CACHE_COMPRESS_THRESHOLD = 4096
+CACHE_CODEC_ZLIB = b"\x00zl"
+CACHE_CODEC_ZSTD = b"\x00zs"
+
+
+class CacheCodecStats:
+    """
+    缓存编解码计数
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        清零计数
+        """
+        with self._lock:
+            self._counters = {
+                "stores": 0,
+                "compressed_stores": 0,
+                "raw_bytes": 0,
+                "stored_bytes": 0,
+                "reads": 0,
+                "compressed_reads": 0,
+                "decode_errors": 0,
+            }
+
+    def incr(self, **counts: int) -> None:
+        """
+        累加计数
+
+        :param counts (int): 计数名与增量
+        """
+        with self._lock:
+            for key, value in counts.items():
+                self._counters[key] += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取当前计数与压缩比
+
+        :return Dict: 计数快照，ratio 为已压缩条目的原始字节数与存储字节数之比
+        """
+        with self._lock:
+            result: Dict[str, Any] = dict(self._counters)
+        result["ratio"] = round(result["raw_bytes"] / result["stored_bytes"], 2) if result["stored_bytes"] else None
+        return result
+
+
+def encode_cache_body(
+    text: Optional[str], compress: bool, stats: Optional[CacheCodecStats] = None
+) -> Union[str, bytes, None]:
+    """
+    按配置压缩待缓存的页面源码，小于阈值的内容保持原样
+
+    :param text (str): 页面源码
+    :param compress (bool): 是否启用压缩
+    :param stats (CacheCodecStats): 计数器
+
+    :return Union[str, bytes]: 原文或带编码标记的压缩数据
+    """
+    if not text:
+        return text
+    if not compress:
+        if stats:
+            stats.incr(stores=1)
+        return text
+    raw = text.encode("utf-8")
+    if len(raw) < CACHE_COMPRESS_THRESHOLD:
+        if stats:
+            stats.incr(stores=1)
+        return text
+    try:
+        import zstandard
+        payload = CACHE_CODEC_ZSTD + zstandard.ZstdCompressor(level=3).compress(raw)
+    except Exception:
+        payload = CACHE_CODEC_ZLIB + zlib.compress(raw, 6)
+    if stats:
+        stats.incr(stores=1, compressed_stores=1, raw_bytes=len(raw), stored_bytes=len(payload))
+    return payload
+
+
+def decode_cache_body(
+    value: Union[str, bytes, None], stats: Optional[CacheCodecStats] = None
+) -> Optional[str]:
+    """
+    还原缓存中的页面源码，兼容未压缩的历史条目
+
+    :param value (Union[str, bytes]): 缓存值
+    :param stats (CacheCodecStats): 计数器
+
+    :return str: 页面源码
+    """
+    if not isinstance(value, bytes):
+        if stats and value is not None:
+            stats.incr(reads=1)
+        return value
+    codec, payload = value[:3], value[3:]
+    try:
+        if codec == CACHE_CODEC_ZSTD:
+            import zstandard
+            text = zstandard.ZstdDecompressor().decompress(payload).decode("utf-8")
+        elif codec == CACHE_CODEC_ZLIB:
+            text = zlib.decompress(payload).decode("utf-8")
+        else:
+            text = value.decode("utf-8", "replace")
+    except Exception as err:
+        logger.warning("缓存解压失败，按空页面处理: %s", err)
+        if stats:
+            stats.incr(decode_errors=1)
+        return ""
+    if stats:
+        stats.incr(reads=1, compressed_reads=1)
+    return text
+
+
+def build_conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    根据缓存条目构造条件请求头
+
+    :param entry (Dict): 缓存条目
+
+    :return Dict: If-None-Match / If-Modified-Since 请求头
+    """
+    headers: Dict[str, str] = {}
+    if not entry:
+        return headers
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
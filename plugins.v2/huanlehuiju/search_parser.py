@@ -0,0 +1,94 @@
+"""
+Hanime 搜索结果卡片解析
+
+每张卡片只用一个组合正则扫描一次，不再对卡片分别执行标题、缩略图、时长、好评率与播放量五次搜索。
+取值规则与逐字段搜索一致：播放量取最后一个匹配，其余字段取第一个匹配；
+同一个 div 的 class 同时包含 title 与 duration 时只按先出现的一个计入。
+与逐字段搜索的一致性校验与耗时对比见 bench/bench_search_parser.py。
+"""
+import re
+from typing import Any, Dict, List
+
+from .html_utils import strip_html
+
+CARD_PATTERN = re.compile(
+    r'<a[^>]*href="\s*`?(?P<href>https?://[^"`\s]*/watch\?v=(?P<id>\d+)[^"`\s]*|/watch\?v=(?P<id2>\d+)[^"`\s]*)`?\s*"'
+    r'[^>]*class="[^"]*\bvideo-link\b[^"]*"[^>]*>(?P<body>.*?)</a>',
+    re.IGNORECASE | re.DOTALL,
+)
+# 一次扫描同时匹配标题/时长 div、播放量 div、缩略图与好评率；标题与时长内容放在零宽断言中，
+# 不消耗 div 内容，与逐字段搜索的结果保持一致
+FIELD_PATTERN = re.compile(
+    r'<(?:div[^>]*?class="[^"]*?\b(?:(?P<kind>title|duration)\b[^"]*"[^>]*>(?=(?P<content>.*?)</div>)'
+    r'|stat-item\b[^"]*"[^>]*>\s*(?P<views>\d+(?:\.\d+)?万?次)\s*</div>)'
+    r'|img[^>]*?class="[^"]*?\bmain-thumb\b[^"]*"[^>]*?src="\s*`?(?P<src>[^"`\s]+)`?\s*"[^>]*>'
+    r'|i[^>]*>\s*thumb_up\s*</i>\s*(?P<like>\d+%))',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def parse_card(body: str) -> Dict[str, str]:
+    """
+    单次扫描解析卡片字段
+
+    :param body (str): 卡片 HTML
+
+    :return Dict: title / poster / duration / like / views
+    """
+    title = poster = duration = like = views = None
+    for match in FIELD_PATTERN.finditer(body):
+        group = match.lastgroup
+        if group == "content":
+            if match.group("kind").lower() == "title":
+                if title is None:
+                    title = match.group("content")
+            elif duration is None:
+                duration = match.group("content")
+        elif group == "views":
+            views = match.group("views")
+        elif group == "src":
+            if poster is None:
+                poster = match.group("src")
+        elif like is None:
+            like = match.group("like")
+    return {
+        "title": strip_html(title) if title else "",
+        "poster": poster or "",
+        "duration": strip_html(duration) if duration else "",
+        "like": like or "",
+        "views": views or "",
+    }
+
+
+def parse_search_cards(html: str, query: str, base_url: str) -> List[Dict[str, Any]]:
+    """
+    解析 Hanime 搜索结果页
+
+    :param html (str): HTML
+    :param query (str): 搜索关键词
+    :param base_url (str): Hanime 站点地址
+
+    :return List: 条目列表
+    """
+    if not html:
+        return []
+    items: List[Dict[str, Any]] = []
+    for match in CARD_PATTERN.finditer(html):
+        watch_id = str(match.group("id") or match.group("id2") or "").strip()
+        if not watch_id:
+            continue
+        fields = parse_card(match.group("body") or "")
+        items.append(
+            {
+                "id": watch_id,
+                "url": f"{base_url}/watch?v={watch_id}",
+                "title": fields["title"],
+                "poster": fields["poster"],
+                "duration": fields["duration"],
+                "like": fields["like"],
+                "views": fields["views"],
+                "query": query,
+            }
+        )
+    return items
+
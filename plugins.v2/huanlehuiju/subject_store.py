@@ -0,0 +1,505 @@
+"""
+Bangumi 条目本地存储
+
+SubjectStore 以 SQLite 保存已识别、刮削过的条目详情，识别与刮削已知条目时直接读取本地数据；
+后台服务按到期时间增量刷新，内容未变化时仅更新检查时间。
+SubjectArchive 导入 Bangumi 离线归档，无网络时也可搜索与查询条目
+"""
+import hashlib
+import io
+import json
+import sqlite3
+import threading
+import time
+import zipfile
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.log import logger
+
+SCHEMA_VERSION = 1
+
+
+class SubjectStore:
+    """
+    Bangumi 条目镜像
+    """
+
+    # 近一年内开播或未定档的条目刷新间隔（秒）
+    ACTIVE_REFRESH_AGE = 86400
+    # 其余条目的刷新间隔（秒）
+    SETTLED_REFRESH_AGE = 7 * 86400
+    # 超过该时间未检查的条目不再直接使用，等待重新获取
+    MAX_AGE = 30 * 86400
+
+    def __init__(self, path: Path):
+        """
+        :param path (Path): 数据库文件路径
+        """
+        self._path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS subjects ("
+            "id INTEGER PRIMARY KEY, "
+            "data TEXT NOT NULL, "
+            "digest TEXT NOT NULL, "
+            "updated_at REAL NOT NULL, "
+            "checked_at REAL NOT NULL, "
+            "due_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS subjects_due_at ON subjects (due_at)")
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.commit()
+
+    @classmethod
+    def _refresh_age(cls, subject: Dict[str, Any]) -> int:
+        """
+        根据开播日期计算刷新间隔
+
+        :param subject (Dict): 条目详情
+
+        :return int: 刷新间隔（秒）
+        """
+        try:
+            aired = datetime.strptime(str(subject.get("date") or ""), "%Y-%m-%d").date()
+        except ValueError:
+            return cls.ACTIVE_REFRESH_AGE
+        if (date.today() - aired).days <= 365:
+            return cls.ACTIVE_REFRESH_AGE
+        return cls.SETTLED_REFRESH_AGE
+
+    def get(self, subject_id) -> Optional[Dict[str, Any]]:
+        """
+        读取条目详情
+
+        :param subject_id: 条目 ID
+
+        :return Dict: 条目详情，不存在或过旧时返回 None
+        """
+        return self.get_many([subject_id]).get(str(subject_id))
+
+    def get_many(self, subject_ids: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量读取条目详情
+
+        :param subject_ids (Iterable): 条目 ID 列表
+
+        :return Dict: 条目 ID 到详情的映射，仅包含命中的条目
+        """
+        ids = [int(subject_id) for subject_id in subject_ids if str(subject_id).isdigit()]
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, data FROM subjects WHERE id IN ({placeholders}) AND checked_at >= ?",
+                [*ids, time.time() - self.MAX_AGE],
+            ).fetchall()
+        found: Dict[str, Dict[str, Any]] = {}
+        for subject_id, data in rows:
+            try:
+                found[str(subject_id)] = json.loads(data)
+            except ValueError:
+                continue
+        return found
+
+    def put_many(self, subjects: Iterable[Optional[Dict[str, Any]]]) -> int:
+        """
+        写入条目详情，内容未变化时仅刷新检查时间
+
+        :param subjects (Iterable): 条目详情列表
+
+        :return int: 内容有变化的条目数
+        """
+        now = time.time()
+        changed = 0
+        with self._lock:
+            for subject in subjects:
+                if not isinstance(subject, dict) or not str(subject.get("id") or "").isdigit():
+                    continue
+                data = json.dumps(subject, ensure_ascii=False, sort_keys=True)
+                digest = hashlib.sha1(data.encode("utf-8")).hexdigest()
+                subject_id = int(subject["id"])
+                due_at = now + self._refresh_age(subject)
+                row = self._conn.execute(
+                    "SELECT digest FROM subjects WHERE id = ?", (subject_id,)
+                ).fetchone()
+                if row and row[0] == digest:
+                    self._conn.execute(
+                        "UPDATE subjects SET checked_at = ?, due_at = ? WHERE id = ?",
+                        (now, due_at, subject_id),
+                    )
+                    continue
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO subjects (id, data, digest, updated_at, checked_at, due_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (subject_id, data, digest, now, now, due_at),
+                )
+                changed += 1
+            self._conn.commit()
+        return changed
+
+    def due(self, limit: int) -> List[str]:
+        """
+        获取已到刷新时间的条目，最早到期的在前
+
+        :param limit (int): 最大数量
+
+        :return List: 条目 ID 列表
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM subjects WHERE due_at <= ? ORDER BY due_at LIMIT ?",
+                (time.time(), limit),
+            ).fetchall()
+        return [str(row[0]) for row in rows]
+
+    def postpone(self, subject_ids: Iterable[str], delay: int) -> None:
+        """
+        推迟刷新失败条目的到期时间，避免每轮重复请求
+
+        :param subject_ids (Iterable): 条目 ID 列表
+        :param delay (int): 推迟时间（秒）
+        """
+        due_at = time.time() + delay
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE subjects SET due_at = ? WHERE id = ?",
+                [(due_at, int(subject_id)) for subject_id in subject_ids],
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        """
+        获取镜像条目数
+
+        :return int: 条目数
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM subjects").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        关闭数据库连接
+        """
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception as err:
+                logger.warning("欢乐汇聚条目镜像关闭失败: %s", err)
+
+
+def parse_infobox(wiki: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    将归档中的 Wiki 格式 infobox 转换为 v0 API 的 key/value 列表
+
+    :param wiki (str): Wiki 文本
+
+    :return List: infobox 列表
+    """
+    infobox: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    for raw_line in str(wiki or "").splitlines():
+        line = raw_line.strip()
+        if current is not None:
+            if line == "}":
+                current = None
+            elif line.startswith("[") and line.endswith("]"):
+                key, sep, value = line[1:-1].partition("|")
+                item = {"k": key.strip(), "v": value.strip()} if sep else {"v": key.strip()}
+                current["value"].append(item)
+            continue
+        if not line.startswith("|") or "=" not in line:
+            continue
+        key, _, value = line[1:].partition("=")
+        value = value.strip()
+        if value == "{":
+            current = {"key": key.strip(), "value": []}
+            infobox.append(current)
+        else:
+            infobox.append({"key": key.strip(), "value": value})
+    return infobox
+
+
+class SubjectArchive:
+    """
+    Bangumi 离线归档
+
+    导入 Bangumi Archive 的 subject.jsonlines，名称、中文名与别名建立 FTS5 三元组索引，
+    无网络时也可完成搜索与条目查询
+    """
+
+    # 默认只导入动画条目
+    DEFAULT_TYPES = (2,)
+    # 每批写入的条目数
+    IMPORT_BATCH = 1000
+    # 归档文件在压缩包中的名称
+    DUMP_MEMBER = "subject.jsonlines"
+
+    def __init__(self, path: Path):
+        """
+        :param path (Path): 数据库文件路径
+        """
+        self._path = path
+        self._lock = threading.RLock()
+        self._fts = False
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        打开数据库并建表
+
+        :return Connection: 数据库连接
+        """
+        conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS subjects ("
+            "id INTEGER PRIMARY KEY, names TEXT NOT NULL, data TEXT NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS subject_names "
+                "USING fts5(names, content='subjects', content_rowid='id', tokenize='trigram')"
+            )
+            self._fts = True
+        except sqlite3.OperationalError as err:
+            logger.warning("欢乐汇聚离线归档不支持 FTS5 三元组索引，将使用全表匹配: %s", err)
+            self._fts = False
+        conn.commit()
+        return conn
+
+    @staticmethod
+    def _convert(record: Dict[str, Any]) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        将归档条目转换为 v0 API 条目结构
+
+        :param record (Dict): 归档条目
+
+        :return Tuple: 名称列表与条目详情
+        """
+        infobox = parse_infobox(record.get("infobox"))
+        names: List[str] = []
+        for name in [record.get("name"), record.get("name_cn")]:
+            if name and name not in names:
+                names.append(name)
+        for item in infobox:
+            if item["key"] not in {"中文名", "别名"}:
+                continue
+            values = item["value"] if isinstance(item["value"], list) else [{"v": item["value"]}]
+            for value in values:
+                alias = value.get("v")
+                if alias and alias not in names:
+                    names.append(alias)
+        score_details = record.get("score_details") or {}
+        subject = {
+            "id": record.get("id"),
+            "type": record.get("type"),
+            "name": record.get("name") or "",
+            "name_cn": record.get("name_cn") or "",
+            "summary": record.get("summary") or "",
+            "date": record.get("date") or None,
+            "platform": record.get("platform"),
+            "nsfw": bool(record.get("nsfw")),
+            "infobox": infobox,
+            "tags": record.get("tags") or [],
+            "rating": {
+                "rank": record.get("rank") or 0,
+                "score": record.get("score") or 0,
+                "total": sum(int(count or 0) for count in score_details.values()),
+                "count": score_details,
+            },
+            "images": None,
+        }
+        return names, subject
+
+    def _open_dump(self, dump_path: Path) -> Iterator[str]:
+        """
+        逐行读取归档文件，支持 zip 压缩包与 jsonlines 文件
+
+        :param dump_path (Path): 归档文件路径
+
+        :return Iterator: 文本行
+        """
+        if zipfile.is_zipfile(dump_path):
+            with zipfile.ZipFile(dump_path) as archive:
+                member = next(
+                    (name for name in archive.namelist() if name.endswith(self.DUMP_MEMBER)), None
+                )
+                if not member:
+                    raise ValueError(f"压缩包中缺少 {self.DUMP_MEMBER}")
+                with archive.open(member) as stream:
+                    for line in io.TextIOWrapper(stream, encoding="utf-8"):
+                        yield line
+        else:
+            with open(dump_path, encoding="utf-8") as stream:
+                yield from stream
+
+    def import_dump(self, dump_path: Path, types: Iterable[int] = DEFAULT_TYPES) -> int:
+        """
+        导入归档文件，替换已有数据
+
+        先写入同目录下的临时数据库，导入期间仍使用已有数据提供查询，
+        完成后仅在替换数据库文件的瞬间持有锁
+
+        :param dump_path (Path): 归档文件路径
+        :param types (Iterable): 导入的条目类型
+
+        :return int: 导入的条目数
+        """
+        staging_path = self._path.with_name(f"{self._path.name}.importing")
+        self._remove_database(staging_path)
+        staging = SubjectArchive(staging_path)
+        try:
+            imported = staging._fill(dump_path, set(types))
+        except Exception:
+            staging.close()
+            self._remove_database(staging_path)
+            raise
+        staging.close()
+        with self._lock:
+            self._conn.close()
+            try:
+                self._remove_database(self._path, keep_main=True)
+                staging_path.replace(self._path)
+            finally:
+                self._conn = self._connect()
+        return imported
+
+    @staticmethod
+    def _remove_database(path: Path, keep_main: bool = False) -> None:
+        """
+        删除数据库文件及其 WAL 附属文件
+
+        :param path (Path): 数据库文件路径
+        :param keep_main (bool): 是否保留数据库主文件
+        """
+        suffixes = ["-wal", "-shm"] if keep_main else ["", "-wal", "-shm"]
+        for suffix in suffixes:
+            path.with_name(f"{path.name}{suffix}").unlink(missing_ok=True)
+
+    def _fill(self, dump_path: Path, allowed: set) -> int:
+        """
+        逐批写入归档条目，每批单独提交，仅在写入时持有锁
+
+        :param dump_path (Path): 归档文件路径
+        :param allowed (set): 导入的条目类型，为空时不限制
+
+        :return int: 导入的条目数
+        """
+        imported = 0
+        batch: List[Tuple[int, str, str]] = []
+        for line in self._open_dump(dump_path):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict) or not str(record.get("id") or "").isdigit():
+                continue
+            if allowed and record.get("type") not in allowed:
+                continue
+            names, subject = self._convert(record)
+            batch.append((int(record["id"]), "\n".join(names), json.dumps(subject, ensure_ascii=False)))
+            if len(batch) >= self.IMPORT_BATCH:
+                imported += self._write_batch(batch)
+                batch = []
+        imported += self._write_batch(batch)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('imported_at', ?), ('source', ?)",
+                (str(int(time.time())), str(dump_path)),
+            )
+            self._conn.commit()
+        return imported
+
+    def _write_batch(self, batch: List[Tuple[int, str, str]]) -> int:
+        """
+        写入并提交一批条目与名称索引
+
+        :param batch (List): 条目 ID、名称与详情
+
+        :return int: 写入的条目数
+        """
+        if not batch:
+            return 0
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO subjects (id, names, data) VALUES (?, ?, ?)", batch
+                )
+                if self._fts:
+                    self._conn.executemany(
+                        "INSERT INTO subject_names (rowid, names) VALUES (?, ?)",
+                        [(subject_id, names) for subject_id, names, _ in batch],
+                    )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return len(batch)
+
+    def search(self, keyword: Optional[str], limit: int = 25) -> List[Dict[str, Any]]:
+        """
+        按名称、中文名与别名搜索条目
+
+        :param keyword (str): 搜索关键词
+        :param limit (int): 最大数量
+
+        :return List: 条目详情列表
+        """
+        keyword = str(keyword or "").strip()
+        if not keyword:
+            return []
+        with self._lock:
+            if self._fts and len(keyword) >= 3:
+                rows = self._conn.execute(
+                    "SELECT s.data FROM subject_names JOIN subjects s ON s.id = subject_names.rowid "
+                    "WHERE subject_names MATCH ? ORDER BY rank LIMIT ?",
+                    ('"' + keyword.replace('"', '""') + '"', limit),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT data FROM subjects WHERE instr(lower(names), lower(?)) > 0 LIMIT ?",
+                    (keyword, limit),
+                ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get(self, subject_id) -> Optional[Dict[str, Any]]:
+        """
+        读取条目详情
+
+        :param subject_id: 条目 ID
+
+        :return Dict: 条目详情
+        """
+        if not str(subject_id).isdigit():
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM subjects WHERE id = ?", (int(subject_id),)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self) -> int:
+        """
+        获取归档条目数
+
+        :return int: 条目数
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM subjects").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        关闭数据库连接
+        """
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception as err:
+                logger.warning("欢乐汇聚离线归档关闭失败: %s", err)
@@ -0,0 +1,214 @@
+"""
+Bangumi 条目标题本地索引
+
+记录已见过条目的名称、中文名与别名，按字符三元组做模糊匹配，
+识别时可在请求 api.bgm.tv 之前直接得到条目 ID。索引以 JSON 保存在插件数据目录。
+"""
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.log import logger
+
+INDEX_VERSION = 1
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    生成字符三元组，首尾补位使短标题也能参与匹配
+
+    :param text (str): 规范化后的标题
+
+    :return Set: 三元组集合
+    """
+    padded = f"\x02{text}\x03"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(left: str, right: str) -> float:
+    """
+    计算两个规范化标题的三元组 Jaccard 相似度
+
+    :param left (str): 标题
+    :param right (str): 标题
+
+    :return float: 相似度，0~1
+    """
+    if not left or not right:
+        return 0.0
+    if left == right:
+        return 1.0
+    left_grams, right_grams = trigrams(left), trigrams(right)
+    union = len(left_grams | right_grams)
+    return len(left_grams & right_grams) / union if union else 0.0
+
+
+class TitleIndex:
+    """
+    字符三元组标题索引
+    """
+
+    # 相似度（Jaccard）达到该值才视为命中
+    THRESHOLD = 0.6
+    # 距上次保存超过该时间（秒）且有变更时写盘
+    SAVE_INTERVAL = 60
+    # 最多记录的条目数，超出时淘汰最早记录的条目
+    MAX_SUBJECTS = 20000
+
+    def __init__(self, path: Path, normalize: Callable[[Optional[str]], str]):
+        """
+        :param path (Path): 索引文件路径
+        :param normalize (Callable): 标题规范化函数
+        """
+        self._path = path
+        self._normalize = normalize
+        self._lock = threading.RLock()
+        self._subjects: Dict[str, List[str]] = {}
+        self._grams: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
+        self._exact: Dict[str, str] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        self._load()
+
+    def _load(self) -> None:
+        """
+        从文件加载索引
+        """
+        if not self._path.exists():
+            return
+        try:
+            payload = json.loads(self._path.read_text(encoding="utf-8"))
+        except Exception as err:
+            logger.warning("欢乐汇聚标题索引读取失败，将重新建立: %s", err)
+            return
+        if not isinstance(payload, dict) or payload.get("version") != INDEX_VERSION:
+            return
+        subjects = payload.get("subjects") or {}
+        if not isinstance(subjects, dict):
+            return
+        with self._lock:
+            for subject_id, names in subjects.items():
+                if isinstance(names, list):
+                    self._add_names(str(subject_id), [name for name in names if isinstance(name, str)])
+            self._dirty = False
+            self._saved_at = time.time()
+
+    def _add_names(self, subject_id: str, names: Iterable[str]) -> bool:
+        """
+        写入条目名称，调用方需持有锁
+
+        :param subject_id (str): 条目 ID
+        :param names (Iterable): 名称列表（已规范化）
+
+        :return bool: 是否有新增名称
+        """
+        known = self._subjects.setdefault(subject_id, [])
+        changed = False
+        for name in names:
+            if not name or name in known:
+                continue
+            known.append(name)
+            self._exact.setdefault(name, subject_id)
+            for gram in trigrams(name):
+                self._grams[gram].add((subject_id, name))
+            changed = True
+        return changed
+
+    def _evict(self) -> None:
+        """
+        淘汰最早记录的条目，调用方需持有锁
+        """
+        while len(self._subjects) > self.MAX_SUBJECTS:
+            subject_id = next(iter(self._subjects))
+            for name in self._subjects.pop(subject_id):
+                if self._exact.get(name) == subject_id:
+                    self._exact.pop(name, None)
+                for gram in trigrams(name):
+                    postings = self._grams.get(gram)
+                    if postings is not None:
+                        postings.discard((subject_id, name))
+                        if not postings:
+                            self._grams.pop(gram, None)
+
+    def add(self, subject_id, names: Iterable[Optional[str]]) -> None:
+        """
+        记录条目名称，只更新内存，写盘由调用方通过 save 完成
+
+        :param subject_id: 条目 ID
+        :param names (Iterable): 名称、中文名与别名
+        """
+        if not subject_id:
+            return
+        normalized = [self._normalize(name) for name in names if name]
+        with self._lock:
+            if self._add_names(str(subject_id), normalized):
+                self._dirty = True
+                self._evict()
+
+    def exact(self, title: Optional[str]) -> Optional[str]:
+        """
+        查找规范化后与标题完全一致的条目
+
+        :param title (str): 查询标题
+
+        :return str: 条目 ID
+        """
+        query = self._normalize(title)
+        if not query:
+            return None
+        with self._lock:
+            return self._exact.get(query)
+
+    def lookup(self, title: Optional[str]) -> Optional[Tuple[str, float]]:
+        """
+        模糊匹配标题
+
+        :param title (str): 查询标题
+
+        :return Tuple: 条目 ID 与相似度，未达到阈值时返回 None
+        """
+        query = self._normalize(title)
+        if not query:
+            return None
+        with self._lock:
+            exact = self._exact.get(query)
+            if exact:
+                return exact, 1.0
+            query_grams = trigrams(query)
+            overlaps: Dict[Tuple[str, str], int] = defaultdict(int)
+            for gram in query_grams:
+                for posting in self._grams.get(gram, ()):
+                    overlaps[posting] += 1
+        best: Optional[Tuple[str, float]] = None
+        for (subject_id, name), overlap in overlaps.items():
+            union = len(query_grams) + len(trigrams(name)) - overlap
+            score = overlap / union if union else 0.0
+            if score >= self.THRESHOLD and (best is None or score > best[1]):
+                best = (subject_id, score)
+        return best
+
+    def save(self, force: bool = False) -> None:
+        """
+        保存索引，未强制时按间隔合并写盘
+
+        :param force (bool): 是否立即保存
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            if not force and time.time() - self._saved_at < self.SAVE_INTERVAL:
+                return
+            payload = {"version": INDEX_VERSION, "subjects": {key: list(names) for key, names in self._subjects.items()}}
+            self._dirty = False
+            self._saved_at = time.time()
+        try:
+            tmp_path = self._path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(self._path)
+        except Exception as err:
+            logger.warning("欢乐汇聚标题索引保存失败: %s", err)
+            with self._lock:
+                self._dirty = True
@@ -2,15 +2,18 @@ import asyncio
 import inspect
 import json
 import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from html import unescape
-from typing import Any, Callable, Coroutine, Dict, List, Optional, Set, Tuple
-from urllib.parse import quote, urljoin, urlparse
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Set, Tuple, Union
+from random import random
+from urllib.parse import quote, urlencode, urljoin, urlparse
 
 from fastapi import Response
 
 from app import schemas
 from app.chain import ChainBase
-from app.core.cache import cached
+from app.core.cache import TTLCache, cached
 from app.core.config import settings
 from app.core.context import MediaInfo
 from app.core.event import Event, eventmanager
@@ -21,6 +24,8 @@ from app.schemas import DiscoverSourceEventData
 from app.schemas.types import ChainEventType, MediaType
 from app.utils.http import RequestUtils
 
+from .cache_codec import CacheCodecStats, build_conditional_headers, decode_cache_body, encode_cache_body
+from .html_utils import clean_attr_value, extract_path_id, extract_year, strip_html
 from .ui_generator import javbus_filter_ui
 
 
@@ -40,6 +45,9 @@ HEADERS = {
     "Referer": f"{DEFAULT_BASE_URL}/",
 }
 IMAGE_PROXY_PREFIX = "/api/v1/plugin/JavbusDiscover/javbus_image?url="
+SOURCE_HTML_TTL = 1800
+SOURCE_VALIDATOR_TTL = 7 * 86400
+MAGNET_TIMEOUT = 15
 
 MOVIE_BOX_PATTERN = re.compile(
     r'<a(?=[^>]*class="[^"]*\bmovie-box\b[^"]*")'
@@ -63,8 +71,6 @@ TITLE_SPAN_PATTERN = re.compile(
     r"<span>(?P<title>.*?)(?:<br\s*/?>)",
     re.IGNORECASE | re.DOTALL,
 )
-TAG_PATTERN = re.compile(r"<[^>]+>")
-YEAR_PATTERN = re.compile(r"(?P<year>(19|20)\d{2})")
 JAV_CODE_PATTERN = re.compile(
     r"(?P<prefix>[A-Za-z]{2,10})[\s\-_]?(?P<number>\d{2,5})",
     re.IGNORECASE,
@@ -141,6 +147,25 @@ MAGNET_TAG_PATTERN = re.compile(
     r'<a[^>]*class="[^"]*\bbtn\b[^"]*"[^>]*>(?P<tag>.*?)</a>',
     re.IGNORECASE | re.DOTALL,
 )
+MAGNET_GID_PATTERN = re.compile(r"var\s+gid\s*=\s*(?P<gid>\d+)\s*;", re.IGNORECASE)
+MAGNET_UC_PATTERN = re.compile(r"var\s+uc\s*=\s*(?P<uc>\d+)\s*;", re.IGNORECASE)
+MAGNET_IMG_PATTERN = re.compile(r"var\s+img\s*=\s*['\"](?P<img>[^'\"]*)['\"]\s*;", re.IGNORECASE)
+RELATED_MARKER = 'id="related-waterfall"'
+DETAIL_SINGLE_PATTERNS = (
+    DETAIL_H3_PATTERN,
+    DETAIL_TITLE_PATTERN,
+    DETAIL_POSTER_PATTERN,
+    DETAIL_CODE_PATTERN,
+    DETAIL_RELEASE_PATTERN,
+    DETAIL_RUNTIME_PATTERN,
+    DETAIL_DIRECTOR_PATTERN,
+    DETAIL_STUDIO_PATTERN,
+    DETAIL_LABEL_PATTERN,
+)
+DETAIL_MULTI_PATTERNS = (
+    DETAIL_GENRE_PATTERN,
+    DETAIL_ACTOR_PATTERN,
+)
 
 
 class JavbusDiscover(_PluginBase):
@@ -151,7 +176,7 @@ class JavbusDiscover(_PluginBase):
     plugin_name = "JAVBUS探索"
     plugin_desc = "让探索支持 JavBus 的数据浏览"
     plugin_icon = "https://www.javbus.com/favicon.ico"
-    plugin_version = "2.0.0"
+    plugin_version = "2.5.6"
     plugin_author = "TRAE"
     author_url = "https://trae.ai"
     plugin_config_prefix = "javbusdiscover_"
@@ -166,8 +191,13 @@ class JavbusDiscover(_PluginBase):
     _uncensored_site = False
     _site_url: Optional[str] = None
     _recognition_mode = "auxiliary"
+    _compress_cache = False
+    _debug_full_page = False
+    _cache_stats: Optional[CacheCodecStats] = None
     _original_method: Optional[Callable] = None
     _original_async_method: Optional[Callable[..., Coroutine[Any, Any, Optional[MediaInfo]]]] = None
+    _source_html_cache: Optional[TTLCache] = None
+    _magnet_executor: Optional[ThreadPoolExecutor] = None
 
     @staticmethod
     def _extract_method_kwargs(method: Optional[Callable], chain_self, args: tuple, kwargs: dict) -> dict:
@@ -323,6 +353,11 @@ class JavbusDiscover(_PluginBase):
             self._uncensored_site = config.get("uncensored_site", False)
             self._site_url = (config.get("site_url") or "").strip() or None
             self._recognition_mode = str(config.get("recognition_mode") or "auxiliary").strip() or "auxiliary"
+            self._compress_cache = bool(config.get("compress_cache", False))
+            self._debug_full_page = bool(config.get("debug_full_page", False))
+
+        if self._cache_stats is None:
+            self._cache_stats = CacheCodecStats()
 
         if self._enabled and self._recognize_media and self._recognition_mode == "auxiliary":
             if getattr(ChainBase.recognize_media, "_patched_by", object()) != id(self):
@@ -406,7 +441,15 @@ class JavbusDiscover(_PluginBase):
                 "allow_anonymous": True,
                 "summary": "JavBus 图片代理",
                 "description": "通过插件代理获取 JavBus 图片",
-            }
+            },
+            {
+                "path": "/cache_stats",
+                "endpoint": self.cache_stats,
+                "methods": ["GET"],
+                "auth": "bear",
+                "summary": "页面缓存压缩统计",
+                "description": "获取页面缓存的写入与读取次数、压缩前后字节数及压缩比",
+            },
         ]
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
@@ -474,6 +517,32 @@ class JavbusDiscover(_PluginBase):
                                     }
                                 ],
                             },
+                            {
+                                "component": "VCol",
+                                "props": {"cols": 12, "md": 3},
+                                "content": [
+                                    {
+                                        "component": "VSwitch",
+                                        "props": {
+                                            "model": "compress_cache",
+                                            "label": "缓存压缩",
+                                        },
+                                    }
+                                ],
+                            },
+                            {
+                                "component": "VCol",
+                                "props": {"cols": 12, "md": 3},
+                                "content": [
+                                    {
+                                        "component": "VSwitch",
+                                        "props": {
+                                            "model": "debug_full_page",
+                                            "label": "调试：缓存完整详情页",
+                                        },
+                                    }
+                                ],
+                            },
                         ],
                     },
                     {
@@ -571,6 +640,8 @@ class JavbusDiscover(_PluginBase):
             "site_url": "",
             "proxy": "",
             "cookie": "",
+            "compress_cache": False,
+            "debug_full_page": False,
         }
 
     def _build_proxies(self) -> Optional[Dict[str, str]]:
@@ -635,27 +706,36 @@ class JavbusDiscover(_PluginBase):
         """
         pass
 
-    @staticmethod
-    def _strip_html(text: str) -> str:
+    _strip_html = staticmethod(strip_html)
+    _clean_attr_value = staticmethod(clean_attr_value)
+
+    def _encode_cache_body(self, text: Optional[str]) -> Union[str, bytes, None]:
         """
-        清理 HTML 文本
+        按配置压缩待缓存的页面源码，小于阈值的内容保持原样
 
-        :param text (str): 原始 HTML 文本
+        :param text (str): 页面源码
 
-        :return str: 清理后的纯文本
+        :return Union[str, bytes]: 原文或带编码标记的压缩数据
         """
-        return re.sub(r"\s+", " ", unescape(TAG_PATTERN.sub("", text))).strip()
+        return encode_cache_body(text, self._compress_cache, self._cache_stats)
 
-    @staticmethod
-    def _clean_attr_value(value: str) -> str:
+    def _decode_cache_body(self, value: Union[str, bytes, None]) -> Optional[str]:
+        """
+        还原缓存中的页面源码，兼容未压缩的历史条目
+
+        :param value (Union[str, bytes]): 缓存值
+
+        :return str: 页面源码
         """
-        清理 HTML 属性值中的包裹符号
+        return decode_cache_body(value, self._cache_stats)
 
-        :param value (str): 原始属性值
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        获取页面缓存编解码计数
 
-        :return str: 清理后的属性值
+        :return Dict: 写入与读取次数、压缩前后字节数及压缩比
         """
-        return unescape(value).strip().strip("`").strip()
+        return self._cache_stats.snapshot() if self._cache_stats else {}
 
     @staticmethod
     def _preview_text(text: Any, limit: int = 300) -> str:
@@ -673,35 +753,8 @@ class JavbusDiscover(_PluginBase):
             return f"{preview[:limit]}...(len={len(preview)})"
         return preview
 
-    @staticmethod
-    def _extract_media_id(detail_url: str) -> str:
-        """
-        从详情链接提取媒体 ID
-
-        :param detail_url (str): 详情页链接
-
-        :return str: 媒体 ID
-        """
-        path = urlparse(detail_url).path.strip("/").strip()
-        if not path:
-            return detail_url
-        return path.split("/")[-1]
-
-    @staticmethod
-    def _extract_year(release_date: Optional[str]) -> Optional[str]:
-        """
-        从发布日期提取年份
-
-        :param release_date (str): 发布日期
-
-        :return str: 年份
-        """
-        if not release_date:
-            return None
-        match = YEAR_PATTERN.search(release_date)
-        if not match:
-            return None
-        return match.group("year")
+    _extract_media_id = staticmethod(extract_path_id)
+    _extract_year = staticmethod(extract_year)
 
     @staticmethod
     def _extract_runtime_minutes(runtime_text: Optional[str]) -> Optional[int]:
@@ -903,31 +956,37 @@ class JavbusDiscover(_PluginBase):
     def _append_media_info(
         self,
         href: str,
-        body: str,
+        html: str,
+        start: int,
+        end: int,
         seen_ids: Set[str],
         results: List[schemas.MediaInfo],
     ) -> None:
         """
         追加一条媒体信息
 
+        卡片字段直接在整页 HTML 的卡片区间内查找，不再复制卡片内容
+
         :param href (str): 详情页链接
-        :param body (str): 卡片内容 HTML
+        :param html (str): 列表页 HTML
+        :param start (int): 卡片内容起始位置
+        :param end (int): 卡片内容结束位置
         :param seen_ids (Set): 已解析媒体 ID 集合
         :param results (List): 媒体信息列表
         """
         detail_url = urljoin(self._base_url(), self._clean_attr_value(href))
-        img_src_match = IMG_SRC_PATTERN.search(body or "")
+        img_src_match = IMG_SRC_PATTERN.search(html, start, end)
         if not img_src_match:
             return
 
-        img_title_match = IMG_TITLE_PATTERN.search(body or "")
+        img_title_match = IMG_TITLE_PATTERN.search(html, start, end)
         if img_title_match:
             title_text = self._strip_html(img_title_match.group("title"))
         else:
-            span_match = TITLE_SPAN_PATTERN.search(body or "")
+            span_match = TITLE_SPAN_PATTERN.search(html, start, end)
             title_text = self._strip_html(span_match.group("title")) if span_match else None
 
-        code_match = CODE_DATE_PATTERN.search(body or "")
+        code_match = CODE_DATE_PATTERN.search(html, start, end)
         code = self._strip_html(code_match.group("code")) if code_match else None
         release_date = (
             self._strip_html(code_match.group("release")) if code_match else None
@@ -969,10 +1028,14 @@ class JavbusDiscover(_PluginBase):
         """
         results: List[schemas.MediaInfo] = []
         seen_ids: Set[str] = set()
-        for match in MOVIE_BOX_PATTERN.finditer(html or ""):
+        html = html or ""
+        for match in MOVIE_BOX_PATTERN.finditer(html):
+            start, end = match.span("body")
             self._append_media_info(
                 href=match.group("href"),
-                body=match.group("body"),
+                html=html,
+                start=start,
+                end=end,
                 seen_ids=seen_ids,
                 results=results,
             )
@@ -1015,14 +1078,14 @@ class JavbusDiscover(_PluginBase):
         return f"{base_url}/page/{page_number}"
 
     @cached(region="javbus_discover", ttl=1800, skip_none=True)
-    def __request(self, category: str = "有码", page: int = 1) -> str:
+    def __request(self, category: str = "有码", page: int = 1) -> Union[str, bytes]:
         """
         请求 JavBus 列表页
 
         :param category (str): 类别
         :param page (int): 页码
 
-        :return str: 列表页 HTML
+        :return Union[str, bytes]: 列表页 HTML，开启缓存压缩时为压缩数据
         """
         request_url = self._build_list_url(category=category, page=page)
 
@@ -1038,7 +1101,7 @@ class JavbusDiscover(_PluginBase):
                     "请求 JavBus 失败：403，可能触发安全验证，请尝试配置代理或 Cookie"
                 )
             raise ValueError(f"请求 JavBus 失败：{res.status_code}")
-        return res.text
+        return self._encode_cache_body(res.text)
 
     def javbus_discover(
         self,
@@ -1056,7 +1119,7 @@ class JavbusDiscover(_PluginBase):
         :return List: 媒体信息列表
         """
         try:
-            html = self.__request(category=category, page=page)
+            html = self._decode_cache_body(self.__request(category=category, page=page))
             results = self._parse_movies(html=html)
             return results[:count]
         except Exception as err:
@@ -1150,23 +1213,112 @@ class JavbusDiscover(_PluginBase):
             return ["/uncensored", ""]
         return ["", "/uncensored"]
 
-    @cached(region="javbus_source_html", ttl=1800, skip_none=True)
-    def _request_html(self, url: str) -> str:
+    def _source_html_store(self) -> TTLCache:
         """
-        请求页面 HTML
+        获取页面源码缓存，条目同时保存响应的校验头，过期后用于条件请求
 
+        :return TTLCache: 页面源码缓存
+        """
+        if self._source_html_cache is None:
+            self._source_html_cache = TTLCache(
+                region="javbus_source_html", maxsize=512, ttl=SOURCE_VALIDATOR_TTL
+            )
+        return self._source_html_cache
+
+    _build_conditional_headers = staticmethod(build_conditional_headers)
+
+    def _read_source_entry(
+        self,
+        entry: Dict[str, Any],
+        extractor: Optional[Callable[[str], Dict[str, str]]] = None,
+    ) -> Union[str, Dict[str, str]]:
+        """
+        读取页面缓存条目
+
+        :param entry (Dict): 缓存条目
+        :param extractor (Callable): 详情片段提取函数，为空时返回完整页面
+
+        :return Union[str, Dict]: 完整页面或详情片段
+        """
+        if extractor is None:
+            return self._decode_cache_body(entry.get("body")) or ""
+        fragments = entry.get("fragments")
+        if fragments is None:
+            return extractor(self._decode_cache_body(entry.get("body")) or "")
+        return {key: self._decode_cache_body(value) or "" for key, value in fragments.items()}
+
+    def _read_source_parsed(
+        self,
+        store: TTLCache,
+        url: str,
+        entry: Dict[str, Any],
+        extractor: Optional[Callable[[str], Dict[str, str]]],
+        parser: Callable[[Union[str, Dict[str, str]]], Any],
+    ) -> Any:
+        """
+        读取缓存条目中的解析结果，尚未解析的条目解析一次后补写
+
+        :param store (TTLCache): 页面缓存
         :param url (str): 请求地址
+        :param entry (Dict): 缓存条目
+        :param extractor (Callable): 详情片段提取函数
+        :param parser (Callable): 页面或片段解析函数
 
-        :return str: HTML 内容
+        :return Any: 解析结果
         """
-        logger.info("JavBus详情请求URL: %s", url)
+        if "parsed" not in entry:
+            entry["parsed"] = parser(self._read_source_entry(entry, extractor))
+            store[url] = entry
+        return entry["parsed"]
+
+    def _request_source(
+        self,
+        url: str,
+        extractor: Optional[Callable[[str], Dict[str, str]]] = None,
+        parser: Optional[Callable[[Union[str, Dict[str, str]]], Any]] = None,
+    ) -> Any:
+        """
+        请求页面并写入缓存
+
+        缓存未过期时直接返回；过期后携带 ETag/Last-Modified 发起条件请求，
+        命中 304 时仅刷新缓存时间，不重新下载页面。
+        传入 extractor 时只缓存提取出的页面片段，完整页面仅在调试模式下保留；
+        传入 parser 时解析结果与校验信息一起缓存，命中缓存或 304 时不再重新解析
+
+        :param url (str): 请求地址
+        :param extractor (Callable): 详情片段提取函数
+        :param parser (Callable): 页面或片段解析函数
+
+        :return Any: 完整页面、详情片段或解析结果
+        """
+        store = self._source_html_store()
+        try:
+            entry = store[url] if url in store else None
+        except KeyError:
+            entry = None
+        now = time.time()
+        if entry and now - float(entry.get("checked_at") or 0) < SOURCE_HTML_TTL:
+            if parser is not None:
+                return self._read_source_parsed(store, url, entry, extractor, parser)
+            return self._read_source_entry(entry, extractor)
+
+        headers = self._build_headers()
+        headers.update(self._build_conditional_headers(entry))
+        logger.info("JavBus详情请求URL: %s, revalidate=%s", url, bool(entry))
         res = RequestUtils(
-            headers=self._build_headers(),
+            headers=headers,
             proxies=self._build_proxies(),
         ).get_res(url)
         if res is None:
             logger.warning("JavBus详情请求失败: url=%s, error=响应为空", url)
             raise ConnectionError("无法连接 JavBus，请检查网络连接")
+        if entry and res.status_code == 304:
+            logger.info("JavBus详情未变更(304)，沿用缓存: url=%s", url)
+            entry["checked_at"] = now
+            store[url] = entry
+            if parser is not None:
+                return self._read_source_parsed(store, url, entry, extractor, parser)
+            return self._read_source_entry(entry, extractor)
         if not res.ok:
             logger.warning(
                 "JavBus详情请求失败: url=%s, status=%s", url, res.status_code
@@ -1176,13 +1328,65 @@ class JavbusDiscover(_PluginBase):
                     "请求 JavBus 失败：403，可能触发安全验证，请尝试配置代理或 Cookie"
                 )
             raise ValueError(f"请求 JavBus 失败：{res.status_code}")
+        html = res.text
         logger.info(
             "JavBus详情响应: url=%s, status=%s, content_preview=%s",
             url,
             res.status_code,
-            self._preview_text(res.text, limit=500),
+            self._preview_text(html, limit=500),
+        )
+        entry = {
+            "etag": res.headers.get("ETag") or "",
+            "last_modified": res.headers.get("Last-Modified") or "",
+            "checked_at": now,
+        }
+        if extractor is None:
+            entry["body"] = self._encode_cache_body(html)
+            if parser is not None:
+                entry["parsed"] = parser(html)
+            store[url] = entry
+            return html if parser is None else entry["parsed"]
+        fragments = extractor(html)
+        entry["fragments"] = {
+            key: self._encode_cache_body(value) for key, value in fragments.items()
+        }
+        if self._debug_full_page:
+            entry["body"] = self._encode_cache_body(html)
+        logger.info(
+            "JavBus详情片段缓存: url=%s, page=%s, fragments=%s",
+            url,
+            len(html),
+            sum(len(value) for value in fragments.values()),
+        )
+        if parser is not None:
+            entry["parsed"] = parser(fragments)
+        store[url] = entry
+        return fragments if parser is None else entry["parsed"]
+
+    def _request_html(self, url: str) -> str:
+        """
+        请求页面 HTML
+
+        :param url (str): 请求地址
+
+        :return str: HTML 内容
+        """
+        return self._request_source(url)
+
+    def _request_detail(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        请求并解析详情页，缓存解析所需的页面片段与解析结果，磁力为页面内联磁力
+
+        :param url (str): 详情页地址
+
+        :return Dict: 解析结果副本
+        """
+        parsed = self._request_source(
+            url,
+            extractor=self._extract_detail_fragments,
+            parser=lambda fragments: self._parse_detail(fragments, detail_url=url),
         )
-        return res.text
+        return dict(parsed) if parsed else None
 
     def javbus_image(self, url: str) -> Response:
         """
@@ -1229,30 +1433,28 @@ class JavbusDiscover(_PluginBase):
         :return List: 推荐条目列表
         """
         related_items: List[Dict[str, str]] = []
-        marker = 'id="related-waterfall"'
-        start = (html or "").find(marker)
+        start = (html or "").find(RELATED_MARKER)
         if start < 0:
             return related_items
 
-        related_html = html[start:]
         seen_ids: Set[str] = set()
-        for match in MOVIE_BOX_PATTERN.finditer(related_html):
-            body = match.group("body")
+        for match in MOVIE_BOX_PATTERN.finditer(html, start):
+            body_start, body_end = match.span("body")
             href = urljoin(self._base_url(), self._clean_attr_value(match.group("href")))
             media_id = self._extract_media_id(href)
             if not media_id or media_id in seen_ids:
                 continue
 
             title_text = ""
-            img_title_match = IMG_TITLE_PATTERN.search(body or "")
+            img_title_match = IMG_TITLE_PATTERN.search(html, body_start, body_end)
             if img_title_match:
                 title_text = self._strip_html(img_title_match.group("title"))
             else:
-                span_match = TITLE_SPAN_PATTERN.search(body or "")
+                span_match = TITLE_SPAN_PATTERN.search(html, body_start, body_end)
                 if span_match:
                     title_text = self._strip_html(span_match.group("title"))
 
-            img_src_match = IMG_SRC_PATTERN.search(body or "")
+            img_src_match = IMG_SRC_PATTERN.search(html, body_start, body_end)
             poster = ""
             if img_src_match:
                 poster = self._build_cached_image_url(
@@ -1357,6 +1559,114 @@ class JavbusDiscover(_PluginBase):
             )
         return magnets
 
+    def _build_magnet_url(self, detail_url: str, gid: str, uc: str, img: str) -> str:
+        """
+        构造磁力异步加载地址
+
+        :param detail_url (str): 详情页地址
+        :param gid (str): 页面内联的 gid
+        :param uc (str): 页面内联的 uc
+        :param img (str): 页面内联的封面路径
+
+        :return str: 磁力异步加载地址
+        """
+        parsed = urlparse(detail_url)
+        base_url = f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else self._base_url()
+        params = {
+            "gid": gid,
+            "lang": "zh",
+            "img": img,
+            "uc": uc or "0",
+            "floor": int(random() * 1000) + 1,
+        }
+        return f"{base_url}/ajax/uncledatoolsbyajax.php?{urlencode(params)}"
+
+    @cached(region="javbus_magnets", ttl=SOURCE_HTML_TTL, skip_none=True)
+    def _request_magnets(self, detail_url: str, gid: str, uc: str = "0", img: str = "") -> Optional[str]:
+        """
+        通过异步接口请求磁力表，与详情页分开缓存
+
+        :param detail_url (str): 详情页地址
+        :param gid (str): 页面内联的 gid
+        :param uc (str): 页面内联的 uc
+        :param img (str): 页面内联的封面路径
+
+        :return str: 磁力表 HTML
+        """
+        request_url = self._build_magnet_url(detail_url, gid=gid, uc=uc, img=img)
+        headers = self._build_headers()
+        headers["Referer"] = detail_url
+        headers["X-Requested-With"] = "XMLHttpRequest"
+        res = RequestUtils(
+            headers=headers,
+            proxies=self._build_proxies(),
+        ).get_res(request_url)
+        if res is None or not res.ok:
+            logger.warning(
+                "JavBus磁力请求失败: url=%s, status=%s",
+                detail_url,
+                getattr(res, "status_code", None),
+            )
+            return None
+        return f'<table id="magnet-table">{res.text}</table>'
+
+    def _load_magnets(self, detail_url: str, fragments: Dict[str, str]) -> List[Dict[str, str]]:
+        """
+        加载磁力列表：优先使用页面内联磁力，缺失时走异步接口
+
+        :param detail_url (str): 详情页地址
+        :param fragments (Dict): 详情片段
+
+        :return List: 磁力列表
+        """
+        magnets = self._extract_magnets(fragments.get("magnets") or "")
+        if magnets:
+            return magnets
+        gid = str(fragments.get("gid") or "").strip()
+        if not gid:
+            return magnets
+        html = self._request_magnets(
+            detail_url,
+            gid,
+            str(fragments.get("uc") or "0"),
+            str(fragments.get("img") or ""),
+        )
+        return self._extract_magnets(html or "")
+
+    def _submit_magnets(self, detail_url: str, fragments: Dict[str, str]) -> Optional[Future]:
+        """
+        在后台线程中加载磁力列表
+
+        :param detail_url (str): 详情页地址
+        :param fragments (Dict): 详情片段
+
+        :return Future: 磁力加载任务
+        """
+        if not fragments or not (fragments.get("magnets") or fragments.get("gid")):
+            return None
+        if self._magnet_executor is None:
+            self._magnet_executor = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="javbus-magnet"
+            )
+        return self._magnet_executor.submit(self._load_magnets, detail_url, fragments)
+
+    def _peek_detail_fragments(self, url: str) -> Optional[Dict[str, str]]:
+        """
+        读取已缓存的详情片段（含已过期条目），不发起网络请求
+
+        :param url (str): 详情页地址
+
+        :return Dict: 详情片段
+        """
+        store = self._source_html_store()
+        try:
+            entry = store[url] if url in store else None
+        except KeyError:
+            entry = None
+        if not entry:
+            return None
+        return self._read_source_entry(entry, self._extract_detail_fragments)
+
     def _build_detail_overview(self, detail: Dict[str, Any]) -> str:
         """
         构造详情摘要
@@ -1418,17 +1728,73 @@ class JavbusDiscover(_PluginBase):
                     candidates.append(url)
         return candidates
 
-    def _parse_detail(self, html: str, detail_url: str = "") -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _extract_detail_fragments(html: str) -> Dict[str, str]:
+        """
+        从详情页切出解析所需的片段：信息区、磁力表与相关推荐
+
+        片段由各解析规则的命中原文拼接而成，对片段再次解析与解析整页结果一致
+
+        :param html (str): 详情页 HTML
+
+        :return Dict: 详情片段
+        """
+        html = html or ""
+        if not html:
+            return {}
+        info_parts: List[str] = []
+        for pattern in DETAIL_SINGLE_PATTERNS:
+            match = pattern.search(html)
+            if match:
+                info_parts.append(match.group(0))
+        for pattern in DETAIL_MULTI_PATTERNS:
+            info_parts.extend(match.group(0) for match in pattern.finditer(html))
+
+        magnet_table_match = MAGNET_TABLE_PATTERN.search(html)
+        if magnet_table_match:
+            magnets = magnet_table_match.group(0)
+        else:
+            magnets = "\n".join(match.group(0) for match in MAGNET_ROW_PATTERN.finditer(html))
+
+        gid_match = MAGNET_GID_PATTERN.search(html)
+        uc_match = MAGNET_UC_PATTERN.search(html)
+        img_match = MAGNET_IMG_PATTERN.search(html)
+
+        related = ""
+        start = html.find(RELATED_MARKER)
+        if start >= 0:
+            boxes = [match.group(0) for match in MOVIE_BOX_PATTERN.finditer(html, start)]
+            related = "\n".join([f"<div {RELATED_MARKER}>", *boxes])
+
+        return {
+            "info": "\n".join(info_parts),
+            "magnets": magnets,
+            "related": related,
+            "gid": gid_match.group("gid") if gid_match else "",
+            "uc": uc_match.group("uc") if uc_match else "0",
+            "img": img_match.group("img") if img_match else "",
+        }
+
+    def _parse_detail(
+        self,
+        fragments: Union[str, Dict[str, str]],
+        detail_url: str = "",
+        magnets: Optional[List[Dict[str, str]]] = None,
+    ) -> Optional[Dict[str, Any]]:
         """
-        解析详情页
+        解析详情页，结果由 _request_source 与校验信息一起缓存
 
-        :param html (str): HTML 内容
+        :param fragments (Union[str, Dict]): 详情片段，传入完整 HTML 时先切片
         :param detail_url (str): 详情页地址
+        :param magnets (List): 已加载的磁力列表，为空时仅解析页面内联磁力
 
         :return Dict: 解析结果
         """
-        if not html:
+        if isinstance(fragments, str):
+            fragments = self._extract_detail_fragments(fragments)
+        if not fragments:
             return None
+        html = fragments.get("info") or ""
         code_match = DETAIL_CODE_PATTERN.search(html)
         code = self._normalize_jav_code(code_match.group("code")) if code_match else None
 
@@ -1468,8 +1834,9 @@ class JavbusDiscover(_PluginBase):
             if actor and actor not in actors:
                 actors.append(actor)
 
-        magnets = self._extract_magnets(html)
-        related = self._extract_related_items(html)
+        if magnets is None:
+            magnets = self._extract_magnets(fragments.get("magnets") or "")
+        related = self._extract_related_items(fragments.get("related") or "")
 
         detail = {
             "code": code or "",
@@ -1527,23 +1894,12 @@ class JavbusDiscover(_PluginBase):
         poster = str(detail.get("poster") or "").strip()
         release = str(detail.get("release") or "").strip()
         runtime_text = str(detail.get("runtime") or "").strip()
-        director = str(detail.get("director") or "").strip()
-        studio = str(detail.get("studio") or "").strip()
-        label = str(detail.get("label") or "").strip()
-        overview = str(detail.get("overview") or "").strip()
         detail_url = str(detail.get("detail_url") or "").strip()
-        genres = [str(genre or "").strip() for genre in (detail.get("genres") or []) if str(genre or "").strip()]
-        actors = [str(actor or "").strip() for actor in (detail.get("actors") or []) if str(actor or "").strip()]
-        magnets = self._normalize_magnets(detail.get("magnets") or [])
-        related_items = detail.get("related") or []
 
         title = title_text or self._build_title(code=code, title=original_title)
         backdrop = poster
         runtime = self._extract_runtime_minutes(runtime_text)
         names = list(dict.fromkeys([name for name in [title, original_title, code] if name]))
-        production_companies = self._build_named_entries(
-            [company for company in [studio, label] if company]
-        )
         if code:
             setattr(info, "mediaid_prefix", "javbus")
             setattr(info, "media_id", code)
@@ -1560,13 +1916,9 @@ class JavbusDiscover(_PluginBase):
             setattr(info, "poster_path", poster)
         if backdrop:
             setattr(info, "backdrop_path", backdrop)
-        if overview:
-            setattr(info, "overview", overview)
         setattr(info, "adult", True)
         setattr(info, "status", "Released")
         setattr(info, "vote_average", 0.0)
-        setattr(info, "vote_count", len(actors))
-        setattr(info, "popularity", float(len(actors) + len(genres)))
         if release:
             setattr(info, "release_date", release)
             setattr(info, "first_air_date", release)
@@ -1575,15 +1927,6 @@ class JavbusDiscover(_PluginBase):
         if runtime is not None:
             setattr(info, "runtime", runtime)
             setattr(info, "episode_run_time", [runtime])
-        if genres:
-            setattr(info, "genres", self._build_named_entries(genres))
-            setattr(info, "genre_ids", genres)
-        if actors:
-            setattr(info, "actors", self._build_named_entries(actors))
-        if director:
-            setattr(info, "directors", self._build_named_entries([director], job="导演"))
-        if production_companies:
-            setattr(info, "production_companies", production_companies)
         setattr(info, "production_countries", [{"name": "日本", "iso_3166_1": "JP"}])
         setattr(info, "origin_country", ["JP"])
         setattr(info, "spoken_languages", [{"english_name": "Japanese", "iso_639_1": "ja", "name": "日语"}])
@@ -1598,10 +1941,6 @@ class JavbusDiscover(_PluginBase):
             setattr(info, "tagline", code)
         if names:
             setattr(info, "names", names)
-        setattr(info, "magnets", magnets)
-        setattr(info, "magnet_count", len(magnets))
-        setattr(info, "magnet_links", [item.get("url") for item in magnets if item.get("url")])
-        setattr(info, "related_items", related_items)
         year = self._extract_year(release)
         if year:
             setattr(info, "year", year)
@@ -1609,17 +1948,52 @@ class JavbusDiscover(_PluginBase):
         elif title:
             setattr(info, "title_year", title)
         setattr(info, "type", MediaType.MOVIE)
+
+        director = str(detail.get("director") or "").strip()
+        studio = str(detail.get("studio") or "").strip()
+        label = str(detail.get("label") or "").strip()
+        overview = str(detail.get("overview") or "").strip()
+        genres = [str(genre or "").strip() for genre in (detail.get("genres") or []) if str(genre or "").strip()]
+        actors = [str(actor or "").strip() for actor in (detail.get("actors") or []) if str(actor or "").strip()]
+        magnets = self._normalize_magnets(detail.get("magnets") or [])
+        related_items = detail.get("related") or []
+        production_companies = self._build_named_entries(
+            [company for company in [studio, label] if company]
+        )
+        if overview:
+            setattr(info, "overview", overview)
+        setattr(info, "vote_count", len(actors))
+        setattr(info, "popularity", float(len(actors) + len(genres)))
+        if genres:
+            setattr(info, "genres", self._build_named_entries(genres))
+            setattr(info, "genre_ids", genres)
+        if actors:
+            setattr(info, "actors", self._build_named_entries(actors))
+        if director:
+            setattr(info, "directors", self._build_named_entries([director], job="导演"))
+        if production_companies:
+            setattr(info, "production_companies", production_companies)
+        setattr(info, "magnets", magnets)
+        setattr(info, "magnet_count", len(magnets))
+        setattr(info, "magnet_links", [item.get("url") for item in magnets if item.get("url")])
+        setattr(info, "related_items", related_items)
         logger.info(
             "JavBus默认内容(补全后MediaInfo): %s",
             self._dump_log_payload(info.to_dict()),
         )
         return info
 
-    def _fetch_detail(self, code: str = None) -> Optional[MediaInfo]:
+    def _fetch_detail(
+        self, code: str = None, with_magnets: bool = True
+    ) -> Optional[MediaInfo]:
         """
         获取番号详情
 
+        磁力作为独立阶段加载：仅在 with_magnets 时请求，并与详情页读取并行。
+        已缓存过该详情页时，磁力请求会与详情页的重新校验同时发出
+
         :param code (str): 番号
+        :param with_magnets (bool): 是否请求磁力接口，否则仅使用详情页内联磁力
 
         :return MediaInfo: 媒体信息
         """
@@ -1632,8 +2006,20 @@ class JavbusDiscover(_PluginBase):
 
         for url in candidates:
             try:
-                html = self._request_html(url)
-                parsed = self._parse_detail(html, detail_url=url)
+                magnet_future = (
+                    self._submit_magnets(url, self._peek_detail_fragments(url) or {})
+                    if with_magnets
+                    else None
+                )
+                parsed = self._request_detail(url)
+                if with_magnets and magnet_future is None:
+                    magnet_future = self._submit_magnets(url, self._peek_detail_fragments(url) or {})
+                if parsed and magnet_future is not None:
+                    try:
+                        parsed["magnets"] = magnet_future.result(timeout=MAGNET_TIMEOUT)
+                    except Exception as err:
+                        logger.warning("JavBus磁力加载失败: url=%s, error=%s", url, err)
+                    parsed["overview"] = self._build_detail_overview(parsed)
                 info = self._detail_to_mediainfo(parsed or {})
                 if info and getattr(info, "title", None):
                     logger.info(
@@ -1814,7 +2200,7 @@ class JavbusDiscover(_PluginBase):
             )
             if not code:
                 continue
-            info = self._fetch_detail(code=code)
+            info = self._fetch_detail(code=code, with_magnets=False)
             logger.info(
                 "JavBus识别最终返回: code=%s, success=%s, title=%s, year=%s",
                 code,
@@ -1869,6 +2255,9 @@ class JavbusDiscover(_PluginBase):
         """
         退出插件
         """
+        if self._magnet_executor is not None:
+            self._magnet_executor.shutdown(wait=False)
+            self._magnet_executor = None
         if getattr(ChainBase.recognize_media, "_patched_by", object()) == id(self) and self._original_method:
             ChainBase.recognize_media = self._original_method
         if (
@@ -0,0 +1,107 @@
+"""
+HTML 文本清理工具
+
+各发现插件与欢乐汇聚共用的卡片字段清理函数。插件目录各自独立安装，本文件以
+plugins.v2/javbusdiscover/html_utils.py 为源文件，其余插件目录中的副本由 scripts/sync_shared.py 生成，
+只修改源文件后执行该脚本同步。清理实现的耗时对比见 bench/bench_html_utils.py。
+"""
+import re
+from html import unescape
+from typing import Optional
+from urllib.parse import parse_qs, urljoin, urlparse
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+YEAR_PATTERN = re.compile(r"(?P<year>(19|20)\d{2})")
+
+
+def strip_html(text: str) -> str:
+    """
+    清理 HTML 文本：去标签、反转义实体并合并空白
+
+    不含标签或实体时跳过对应处理，空白合并使用 str.split，与按 \\s+ 替换后 strip 的结果一致
+
+    :param text (str): 原始 HTML 文本
+
+    :return str: 清理后的纯文本
+    """
+    if "<" in text:
+        text = TAG_PATTERN.sub("", text)
+    if "&" in text:
+        text = unescape(text)
+    return " ".join(text.split())
+
+
+def clean_attr_value(value: str) -> str:
+    """
+    清理 HTML 属性值中的实体与包裹符号
+
+    :param value (str): 原始属性值
+
+    :return str: 清理后的属性值
+    """
+    if "&" in value:
+        value = unescape(value)
+    return value.strip().strip("`").strip()
+
+
+def normalize_poster_url(src: str, base_url: str) -> str:
+    """
+    规范化图片地址，补全协议与站点
+
+    :param src (str): 原始图片地址
+    :param base_url (str): 站点地址
+
+    :return str: 完整图片地址
+    """
+    if "&" in src:
+        src = unescape(src)
+    src = src.strip()
+    if src.startswith("//"):
+        return f"https:{src}"
+    if src.startswith("/"):
+        return urljoin(base_url, src)
+    return src
+
+
+def extract_year(text: Optional[str]) -> Optional[str]:
+    """
+    从文本中提取年份
+
+    :param text (str): 日期或条目信息文本
+
+    :return str: 年份
+    """
+    if not text:
+        return None
+    match = YEAR_PATTERN.search(text)
+    if not match:
+        return None
+    return match.group("year")
+
+
+def extract_query_id(url: str, key: str = "v") -> str:
+    """
+    从链接查询参数提取媒体 ID
+
+    :param url (str): 详情页链接
+    :param key (str): 参数名
+
+    :return str: 媒体 ID，缺少参数时返回原链接
+    """
+    values = parse_qs(urlparse(url).query).get(key, [])
+    return values[0] if values else url
+
+
+def extract_path_id(url: str) -> str:
+    """
+    从链接路径末段提取媒体 ID
+
+    :param url (str): 详情页链接
+
+    :return str: 媒体 ID，路径为空时返回原链接
+    """
+    path = urlparse(url).path.strip("/").strip()
+    if not path:
+        return url
+    return path.split("/")[-1]
+
@@ -0,0 +1,73 @@
+"""
+同步插件间共享的模块
+
+插件目录各自独立安装，无法跨目录导入，共享模块因此在各插件目录中各保留一份副本。
+SHARED_MODULES 中的第一个路径为源文件，只修改源文件，再执行本脚本覆盖其余副本：
+    python scripts/sync_shared.py          # 同步副本
+    python scripts/sync_shared.py --check  # 仅检查副本是否一致，不一致时返回 1
+"""
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SHARED_MODULES: Dict[str, List[str]] = {
+    "plugins.v2/bangumiauthorization/bangumi_client.py": [
+        "plugins.v2/huanlehuiju/bangumi_client.py",
+    ],
+    "plugins.v2/javbusdiscover/cache_codec.py": [
+        "plugins.v2/bgmtvdiscover/cache_codec.py",
+        "plugins.v2/hanimediscover/cache_codec.py",
+        "plugins.v2/huanlehuiju/cache_codec.py",
+    ],
+    "plugins.v2/javbusdiscover/html_utils.py": [
+        "hanime/html_utils.py",
+        "plugins.v2/bgmtvdiscover/html_utils.py",
+        "plugins.v2/hanimediscover/html_utils.py",
+        "plugins.v2/huanlehuiju/html_utils.py",
+    ],
+}
+
+
+def stale_copies() -> List[Path]:
+    """
+    查找与源文件不一致的副本
+
+    :return List: 不一致的副本路径
+    """
+    stale = []
+    for source, copies in SHARED_MODULES.items():
+        content = (ROOT / source).read_bytes()
+        for copy in copies:
+            path = ROOT / copy
+            if not path.exists() or path.read_bytes() != content:
+                stale.append(path)
+    return stale
+
+
+def sync() -> List[Path]:
+    """
+    用源文件覆盖不一致的副本
+
+    :return List: 已更新的副本路径
+    """
+    updated = []
+    for source, copies in SHARED_MODULES.items():
+        content = (ROOT / source).read_bytes()
+        for copy in copies:
+            path = ROOT / copy
+            if not path.exists() or path.read_bytes() != content:
+                path.write_bytes(content)
+                updated.append(path)
+    return updated
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        paths = stale_copies()
+        for path in paths:
+            print(f"out of sync: {path.relative_to(ROOT)}")
+        sys.exit(1 if paths else 0)
+    for path in sync():
+        print(f"updated: {path.relative_to(ROOT)}")
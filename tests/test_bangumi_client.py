@@ -0,0 +1,228 @@
+"""
+bangumi_client 并发名额回收测试
+
+MoviePilot 运行环境（app 包）或 requests 不可用时，仅为被测模块注入最小替身，
+测试只覆盖限流器与请求流程，不发出真实网络请求。
+"""
+import asyncio
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+CLIENT_COPIES = [
+    ROOT / "plugins.v2" / "bangumiauthorization" / "bangumi_client.py",
+    ROOT / "plugins.v2" / "huanlehuiju" / "bangumi_client.py",
+]
+
+
+class _SlowAsyncRequestUtils:
+    """
+    永不返回的异步请求，模拟超时被取消的 api.bgm.tv 请求
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def get_res(self, url):
+        await asyncio.sleep(3600)
+
+
+class _SlowRequestUtils:
+    """
+    抛出 BaseException 的同步请求，模拟线程中断
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get_res(self, url):
+        raise KeyboardInterrupt
+
+
+def _install_fallbacks(monkeypatch):
+    """
+    为缺失的运行依赖注入最小替身
+    """
+    try:
+        import app.core.cache  # noqa: F401
+        import app.core.config  # noqa: F401
+        import app.utils.http  # noqa: F401
+    except ImportError:
+        cache = types.ModuleType("app.core.cache")
+        cache.TTLCache = type("TTLCache", (dict,), {"__init__": lambda self, *a, **k: dict.__init__(self)})
+        config = types.ModuleType("app.core.config")
+        config.settings = types.SimpleNamespace(NORMAL_USER_AGENT="pytest")
+        http = types.ModuleType("app.utils.http")
+        http.RequestUtils = _SlowRequestUtils
+        http.AsyncRequestUtils = _SlowAsyncRequestUtils
+        for name, module in {
+            "app": types.ModuleType("app"),
+            "app.core": types.ModuleType("app.core"),
+            "app.core.cache": cache,
+            "app.core.config": config,
+            "app.utils": types.ModuleType("app.utils"),
+            "app.utils.http": http,
+        }.items():
+            monkeypatch.setitem(sys.modules, name, module)
+    try:
+        import requests.adapters  # noqa: F401
+    except ImportError:
+        fake_requests = types.ModuleType("requests")
+        fake_requests.Session = object
+        adapters = types.ModuleType("requests.adapters")
+        adapters.HTTPAdapter = object
+        fake_requests.adapters = adapters
+        monkeypatch.setitem(sys.modules, "requests", fake_requests)
+        monkeypatch.setitem(sys.modules, "requests.adapters", adapters)
+
+
+def _load(path: Path, monkeypatch):
+    """
+    按文件加载 bangumi_client 副本
+    """
+    _install_fallbacks(monkeypatch)
+    spec = importlib.util.spec_from_file_location(f"_bangumi_client_{path.parent.name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # 每个测试使用新的进程内登记表，同一测试中加载的各副本共用它
+    if module.SHARED_REGISTRY not in sys.modules:
+        monkeypatch.setitem(sys.modules, module.SHARED_REGISTRY, types.ModuleType(module.SHARED_REGISTRY))
+    monkeypatch.setattr(module, "AsyncRequestUtils", _SlowAsyncRequestUtils)
+    monkeypatch.setattr(module, "RequestUtils", _SlowRequestUtils)
+    monkeypatch.setattr(module.BangumiClient, "_get_async_client", lambda self: None)
+    monkeypatch.setattr(module.BangumiClient, "_get_session", lambda self: None)
+    return module
+
+
+@pytest.mark.parametrize("path", CLIENT_COPIES, ids=lambda path: path.parent.name)
+def test_cancelled_requests_release_inflight(path, monkeypatch):
+    module = _load(path, monkeypatch)
+    client = module.BangumiClient()
+    limiter = module.get_limiter(f"{module.API_BASE}/")
+
+    async def _run():
+        for index in range(6):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.async_search(f"keyword{index}", ttl=0), timeout=0.05)
+        return limiter.inflight
+
+    assert asyncio.run(_run()) == 0
+
+
+@pytest.mark.parametrize("path", CLIENT_COPIES, ids=lambda path: path.parent.name)
+def test_interrupted_sync_request_releases_inflight(path, monkeypatch):
+    module = _load(path, monkeypatch)
+    client = module.BangumiClient()
+    limiter = module.get_limiter(f"{module.API_BASE}/")
+    with pytest.raises(KeyboardInterrupt):
+        client.request_json("/v0/subjects/1")
+    assert limiter.inflight == 0
+
+
+def test_sync_acquire_times_out(monkeypatch):
+    module = _load(CLIENT_COPIES[0], monkeypatch)
+    limiter = module.AdaptiveLimiter()
+    for _ in range(int(limiter.limit)):
+        assert limiter.acquire(timeout=0.01)
+    assert limiter.acquire(timeout=0.05) is False
+    assert limiter.inflight == int(limiter.limit)
+
+
+class _FakeAsyncClient:
+    """
+    记录关闭情况的异步客户端
+    """
+
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_async_state_is_per_loop_and_close_inside_loop(monkeypatch):
+    module = _load(CLIENT_COPIES[0], monkeypatch)
+    client = module.BangumiClient()
+
+    async def _state():
+        state = client._loop_state()
+        state.client = _FakeAsyncClient()
+        return state
+
+    first_loop, second_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+    try:
+        first = first_loop.run_until_complete(_state())
+        second = second_loop.run_until_complete(_state())
+        assert first is not second
+
+        async def _close():
+            client.close()
+            await asyncio.sleep(0)
+
+        first_loop.run_until_complete(_close())
+        assert first.client.closed
+        second_loop.run_until_complete(asyncio.sleep(0))
+        assert second.client.closed
+
+        third = second_loop.run_until_complete(_state())
+        client.close()
+        assert third.client.closed
+    finally:
+        first_loop.close()
+        second_loop.close()
+
+
+def test_copies_share_client_state(monkeypatch):
+    first, second = (_load(path, monkeypatch) for path in CLIENT_COPIES)
+    assert first is not second
+    client, other = first.get_client(), second.get_client()
+    assert client is not other
+    assert client._inflight is other._inflight
+    assert client._search_cache is other._search_cache
+    assert client._subject_cache is other._subject_cache
+    client.acquire("BangumiAuthorization")
+    other.acquire("HuanLeHuiju")
+    client.release("BangumiAuthorization")
+    assert client._owners == {"HuanLeHuiju"}
+
+
+def test_copies_share_host_limiter(monkeypatch):
+    first, second = (_load(path, monkeypatch) for path in CLIENT_COPIES)
+    limiter = first.get_limiter(f"{first.API_BASE}/v0/subjects/1")
+    assert second.get_limiter(f"{second.API_BASE}/search/subject/x") is limiter
+    assert first.get_limiter("https://example.com/") is not limiter
+    # 一个副本收到 429 后，另一个副本同样暂停发出请求
+    assert limiter.acquire(timeout=0)
+    limiter.release(0.1, 429, retry_after=5)
+    assert second.get_limiter(f"{second.API_BASE}/").acquire(timeout=0.01) is False
+
+
+def test_strip_season_text_reverses_apply_season(monkeypatch):
+    module = _load(CLIENT_COPIES[1], monkeypatch)
+    media = types.SimpleNamespace(type=types.SimpleNamespace(value="电视剧"), title="葬送的芙莉莲", season=None)
+    module.apply_season([media], 2)
+    assert media.title == "葬送的芙莉莲 第2季"
+    assert module.strip_season_text(media.title, 2) == "葬送的芙莉莲"
+    assert module.strip_season_text("葬送的芙莉莲 第2季", 3) == "葬送的芙莉莲 第2季"
+    assert module.strip_season_text("葬送的芙莉莲", None) == "葬送的芙莉莲"
+
+
+def test_apply_season_all_types(monkeypatch):
+    module = _load(CLIENT_COPIES[1], monkeypatch)
+
+    def _media(kind):
+        return types.SimpleNamespace(type=types.SimpleNamespace(value=kind), title="标题", season=None)
+
+    tv, movie = _media("电视剧"), _media("电影")
+    module.apply_season([tv, movie], 2)
+    assert (tv.season, tv.title) == (2, "标题 第2季")
+    assert (movie.season, movie.title) == (None, "标题")
+    # 欢乐汇聚为所有结果设置季号，标题中的季文本仍只加在电视剧上
+    tv, movie = _media("电视剧"), _media("电影")
+    module.apply_season([tv, movie], 2, all_types=True)
+    assert (tv.season, tv.title) == (2, "标题 第2季")
+    assert (movie.season, movie.title) == (2, "标题")
@@ -0,0 +1,65 @@
+"""
+页面源码缓存编解码测试
+"""
+import importlib.util
+import logging
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load(monkeypatch):
+    """
+    加载 cache_codec 源文件，MoviePilot 运行环境不可用时注入日志替身
+    """
+    try:
+        import app.log  # noqa: F401
+    except ImportError:
+        log = types.ModuleType("app.log")
+        log.logger = logging.getLogger("cache_codec")
+        monkeypatch.setitem(sys.modules, "app", types.ModuleType("app"))
+        monkeypatch.setitem(sys.modules, "app.log", log)
+    path = ROOT / "plugins.v2" / "javbusdiscover" / "cache_codec.py"
+    spec = importlib.util.spec_from_file_location("_cache_codec", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_round_trip_and_counters(monkeypatch):
+    module = _load(monkeypatch)
+    stats = module.CacheCodecStats()
+    page = "<div>页面</div>" * 2000
+    stored = module.encode_cache_body(page, True, stats)
+    assert isinstance(stored, bytes) and len(stored) < len(page.encode("utf-8"))
+    assert module.decode_cache_body(stored, stats) == page
+    assert module.encode_cache_body("short", True, stats) == "short"
+    assert module.encode_cache_body(page, False, stats) == page
+    assert module.decode_cache_body(page, stats) == page
+    assert module.decode_cache_body(None, stats) is None
+    snapshot = stats.snapshot()
+    assert snapshot["stores"] == 3
+    assert snapshot["compressed_stores"] == 1
+    assert snapshot["reads"] == 2
+    assert snapshot["compressed_reads"] == 1
+    assert snapshot["raw_bytes"] == len(page.encode("utf-8"))
+    assert snapshot["stored_bytes"] == len(stored)
+    assert snapshot["ratio"] > 1
+
+
+def test_corrupt_entry_counts_decode_error(monkeypatch):
+    module = _load(monkeypatch)
+    stats = module.CacheCodecStats()
+    assert module.decode_cache_body(module.CACHE_CODEC_ZLIB + b"broken", stats) == ""
+    assert stats.snapshot()["decode_errors"] == 1
+    assert stats.snapshot()["ratio"] is None
+
+
+def test_conditional_headers(monkeypatch):
+    module = _load(monkeypatch)
+    assert module.build_conditional_headers(None) == {}
+    assert module.build_conditional_headers({"etag": '"e"', "last_modified": "", "parsed": []}) == {
+        "If-None-Match": '"e"'
+    }
@@ -0,0 +1,165 @@
+"""
+欢乐汇聚离线归档查询顺序测试
+
+MoviePilot 运行环境（app 包）或 fastapi 不可用时，仅为被测插件注入最小替身，
+不发出真实网络请求。
+"""
+import asyncio
+import importlib.util
+import logging
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PLUGIN_DIR = ROOT / "plugins.v2" / "huanlehuiju"
+
+
+class _PluginBase:
+    """
+    插件基类替身
+    """
+
+    data_path: Path = ROOT
+
+    def get_data_path(self) -> Path:
+        return self.data_path
+
+
+def _install_fallbacks(monkeypatch):
+    """
+    为缺失的运行依赖注入最小替身
+    """
+    try:
+        import app.core.context  # noqa: F401
+        import app.plugins  # noqa: F401
+        import fastapi  # noqa: F401
+    except ImportError:
+        modules = {name: types.ModuleType(name) for name in (
+            "fastapi", "fastapi.responses", "app", "app.core", "app.core.cache", "app.core.config",
+            "app.core.context", "app.core.meta", "app.log", "app.plugins", "app.utils", "app.utils.http",
+        )}
+        modules["fastapi"].Body = lambda default=None, **kwargs: default
+        modules["fastapi.responses"].StreamingResponse = object
+        modules["app.core.cache"].TTLCache = type(
+            "TTLCache", (dict,), {"__init__": lambda self, *a, **k: dict.__init__(self)}
+        )
+        modules["app.core.config"].settings = types.SimpleNamespace(
+            NORMAL_USER_AGENT="pytest", SECURITY_IMAGE_DOMAINS=[]
+        )
+        modules["app.core.context"].MediaInfo = object
+        modules["app.core.meta"].MetaBase = object
+        modules["app.log"].logger = logging.getLogger("huanlehuiju")
+        modules["app.plugins"]._PluginBase = _PluginBase
+        modules["app.utils.http"].RequestUtils = object
+        modules["app.utils.http"].AsyncRequestUtils = object
+        for name, module in modules.items():
+            monkeypatch.setitem(sys.modules, name, module)
+    try:
+        import requests.adapters  # noqa: F401
+    except ImportError:
+        fake_requests = types.ModuleType("requests")
+        fake_requests.Session = object
+        adapters = types.ModuleType("requests.adapters")
+        adapters.HTTPAdapter = object
+        fake_requests.adapters = adapters
+        monkeypatch.setitem(sys.modules, "requests", fake_requests)
+        monkeypatch.setitem(sys.modules, "requests.adapters", adapters)
+
+
+class _Archive:
+    """
+    离线归档替身
+    """
+
+    def __init__(self, subjects):
+        self.subjects = {str(subject["id"]): subject for subject in subjects}
+
+    def search(self, title):
+        return [subject for subject in self.subjects.values() if subject["name"] == title]
+
+    def get(self, bangumi_id):
+        return self.subjects.get(str(bangumi_id))
+
+    def close(self):
+        pass
+
+
+class _Client:
+    """
+    记录调用的 Bangumi 客户端替身
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def search(self, title, **kwargs):
+        self.calls.append(("search", title))
+        return [{"id": 2, "name": title}]
+
+    async def async_search(self, title, **kwargs):
+        return self.search(title, **kwargs)
+
+    def subject(self, bangumi_id, **kwargs):
+        self.calls.append(("subject", bangumi_id))
+        return {"id": int(bangumi_id), "name": "online"}
+
+    async def async_subject(self, bangumi_id, **kwargs):
+        return self.subject(bangumi_id, **kwargs)
+
+    def load_subjects(self, bangumi_ids, **kwargs):
+        return [self.subject(bangumi_id) for bangumi_id in bangumi_ids]
+
+    async def async_load_subjects(self, bangumi_ids, **kwargs):
+        return self.load_subjects(bangumi_ids, **kwargs)
+
+    def acquire(self, owner):
+        pass
+
+    def release(self, owner):
+        pass
+
+
+@pytest.fixture
+def plugin(monkeypatch, tmp_path):
+    _install_fallbacks(monkeypatch)
+    package = "_huanlehuiju_test"
+    spec = importlib.util.spec_from_file_location(
+        package, PLUGIN_DIR / "__init__.py", submodule_search_locations=[str(PLUGIN_DIR)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, package, module)
+    spec.loader.exec_module(module)
+    client = _Client()
+    monkeypatch.setattr(module, "get_client", lambda: client)
+    instance = module.HuanLeHuiju()
+    monkeypatch.setattr(instance, "get_data_path", lambda: tmp_path, raising=False)
+    instance.init_plugin({"enabled": True, "prefer_archive": True})
+    instance._subject_archive = _Archive([{"id": 1, "name": "归档条目"}])
+    instance.client = client
+    yield instance
+    instance._subject_archive = None
+    instance._title_index = None
+
+
+def test_archive_hit_skips_api(plugin):
+    assert [item["id"] for item in plugin._search_subjects("归档条目")] == [1]
+    assert plugin._fetch_subject_detail("1")["name"] == "归档条目"
+    assert plugin._fetch_subject_details(["1"])[0]["name"] == "归档条目"
+    assert asyncio.run(plugin._async_fetch_subject_detail("1"))["name"] == "归档条目"
+    assert [item["id"] for item in asyncio.run(plugin._async_search_subjects("归档条目"))] == [1]
+    assert plugin.client.calls == []
+
+
+def test_archive_miss_falls_back_to_api(plugin):
+    assert [item["id"] for item in plugin._search_subjects("其他")] == [2]
+    assert plugin._fetch_subject_details(["1", "3"])[1]["name"] == "online"
+    assert plugin.client.calls == [("search", "其他"), ("subject", "3")]
+
+
+def test_online_first_by_default(plugin):
+    plugin._prefer_archive = False
+    assert plugin._fetch_subject_detail("1")["name"] == "online"
+    assert plugin.client.calls == [("subject", "1")]
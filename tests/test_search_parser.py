@@ -0,0 +1,53 @@
+"""
+欢乐汇聚 Hanime 搜索卡片单次扫描解析测试
+
+以 bench/bench_search_parser.py 中逐字段多次搜索的原实现为基准校验结果一致。
+"""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BASE_URL = "https://hanime1.me"
+
+
+def _load_bench():
+    """
+    加载基准脚本
+    """
+    spec = importlib.util.spec_from_file_location("bench_search_parser", ROOT / "bench" / "bench_search_parser.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+BENCH = _load_bench()
+PARSER = BENCH.load_search_parser()
+
+CARDS = [
+    # 播放量出现多次、相对链接
+    '<a href="/watch?v=1" class="video-link"><div class="card-title">A &amp; B</div>'
+    '<div class="stat-item">1次</div><div class="stat-item">2.5万次</div></a>',
+    # 链接被反引号包裹、缩略图在标题之后、好评率
+    '<a href=" `https://hanime1.me/watch?v=2` " class="x video-link">'
+    '<div class="card-title"><b>粗体</b>\n 标题</div>'
+    '<img class="main-thumb" src="//img/2.jpg"><i class="material-icons">thumb_up</i> 88%</a>',
+    # 缺少全部字段
+    '<a href="/watch?v=3" class="video-link"><span>empty</span></a>',
+]
+
+
+@pytest.mark.parametrize("html", CARDS + [BENCH.sample_page(5), "".join(CARDS)])
+def test_single_scan_matches_multipass(html):
+    assert PARSER.parse_search_cards(html, "q", BASE_URL) == BENCH.parse_search_cards_multipass(html, "q", BASE_URL)
+
+
+def test_empty_page():
+    assert PARSER.parse_search_cards("", "q", BASE_URL) == []
+
+
+def test_title_and_duration_class_counts_once():
+    html = '<a href="/watch?v=1" class="video-link"><div class="title duration">A &amp; B</div></a>'
+    item = PARSER.parse_search_cards(html, "q", BASE_URL)[0]
+    assert (item["title"], item["duration"]) == ("A & B", "")
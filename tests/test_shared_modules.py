@@ -0,0 +1,15 @@
+"""
+共享模块副本一致性测试
+"""
+import importlib.util
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_shared_copies_in_sync():
+    spec = importlib.util.spec_from_file_location("sync_shared", ROOT / "scripts" / "sync_shared.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    stale = [str(path.relative_to(ROOT)) for path in module.stale_copies()]
+    assert not stale, f"运行 python scripts/sync_shared.py 同步: {stale}"